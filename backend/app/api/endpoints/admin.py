@@ -0,0 +1,85 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import datetime, timezone
+
+from ...core.config import get_settings, verkada_api_client
+from ...core.dependencies import get_current_admin_user, require_event_store
+from ...db import models as db_models
+from ...db.session import AsyncSessionLocal
+from ...models import verkada_event as verkada_event_schemas
+from ...services import backfill_service
+
+router = APIRouter()
+
+def _backfill_status(backfill: backfill_service.Backfill) -> verkada_event_schemas.BackfillStatus:
+    return verkada_event_schemas.BackfillStatus(
+        status=backfill.status,
+        start_time=datetime.fromtimestamp(backfill.start_time, tz=timezone.utc),
+        end_time=datetime.fromtimestamp(backfill.end_time, tz=timezone.utc),
+        windows_total=len(backfill.windows),
+        windows_completed=backfill.windows_completed,
+        windows_skipped=backfill.windows_skipped,
+        events_fetched=backfill.events_fetched,
+        events_stored=backfill.events_stored,
+        elapsed_seconds=backfill.elapsed_seconds,
+        events_per_second=backfill.events_per_second,
+        error=backfill.error,
+    )
+
+@router.post(
+    "/backfill",
+    response_model=verkada_event_schemas.BackfillStatus,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Start a Historical Backfill into the Local Event Store",
+    dependencies=[Depends(require_event_store)]
+)
+async def start_backfill(
+    start_time: int = Query(..., description="Unix timestamp in seconds."),
+    end_time: int = Query(..., description="Unix timestamp in seconds (exclusive). Clamped to now."),
+    current_user: db_models.User = Depends(get_current_admin_user)
+):
+    """
+    Starts importing all access events of a time range from Verkada, in the background.
+    - Requires an administrator (ADMIN_USERNAMES), since a backfill can use up
+      much of the shared Verkada rate limit budget.
+    - The range is fetched in windows of BACKFILL_WINDOW_SECONDS, BACKFILL_CONCURRENCY
+      at a time, at a lower priority than dashboard requests.
+    - Windows imported by an earlier (e.g. interrupted) backfill are skipped.
+    - Returns 409 while another backfill is running; poll GET /backfill for progress.
+    Backfilled events are archived but not published to the live feed.
+    For large ranges prefer the CLI (`python -m app.cli backfill`), which does not
+    compete with the API server for its event loop.
+    """
+    if not verkada_api_client:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Verkada API client is not configured. Check server logs."
+        )
+    settings = get_settings()
+    try:
+        backfill = backfill_service.Backfill(
+            verkada_api_client, AsyncSessionLocal, start_time, end_time,
+            window_seconds=settings.BACKFILL_WINDOW_SECONDS,
+            concurrency=settings.BACKFILL_CONCURRENCY,
+        )
+        backfill_service.start_backfill(backfill)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except backfill_service.BackfillRunningError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=e.message)
+    return _backfill_status(backfill)
+
+@router.get(
+    "/backfill",
+    response_model=verkada_event_schemas.BackfillStatus,
+    summary="Progress of the Latest Historical Backfill"
+)
+async def get_backfill_status(current_user: db_models.User = Depends(get_current_admin_user)):
+    """
+    Reports the progress and fetch rate (events/sec) of the backfill last
+    started through this API. Requires an administrator.
+    404 if none was started since the server started.
+    """
+    backfill = backfill_service.get_current_backfill()
+    if backfill is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No backfill has been started.")
+    return _backfill_status(backfill)
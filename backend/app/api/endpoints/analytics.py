@@ -0,0 +1,190 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from ...core.config import get_settings
+from ...core.dependencies import get_current_active_user, require_event_store
+from ...db import models as db_models
+from ...db.session import get_async_db
+from ...models import verkada_event as verkada_event_schemas
+from ...services import event_store_service
+from ...services.aggregation import HyperLogLog
+
+router = APIRouter()
+
+def _resolve_timezone(tz_name: str) -> ZoneInfo:
+    """Returns the ZoneInfo for an IANA time zone name, or raises a 400."""
+    try:
+        return ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown time zone: {tz_name}")
+
+def _resolve_range(start_time: Optional[int], end_time: Optional[int], default_days: int) -> tuple:
+    """Fills in a missing range end with now and a missing start with default_days before the end."""
+    if end_time is None:
+        end_time = int(datetime.now(timezone.utc).timestamp())
+    if start_time is None:
+        start_time = end_time - int(timedelta(days=default_days).total_seconds())
+    if start_time >= end_time:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="start_time must be before end_time.")
+    return start_time, end_time
+
+@router.get(
+    "/event-counts",
+    response_model=verkada_event_schemas.EventAggregationResponse,
+    summary="Event Counts Grouped by Time, Door, User and Event Type",
+    dependencies=[Depends(require_event_store)]
+)
+async def get_event_counts(
+    group_by: str = Query(
+        default="weekday,hour",
+        description="Comma-separated dimensions to group by: hour, weekday, day, door, user, event_type. "
+                    "E.g. 'weekday,hour' for a heatmap or 'door' for a per-door breakdown."
+    ),
+    tz_name: str = Query(default="UTC", alias="timezone", description="IANA time zone of hour, weekday and day, e.g. Europe/Berlin."),
+    start_time: Optional[int] = Query(None, description="Unix timestamp in seconds. Defaults to 7 days before end_time."),
+    end_time: Optional[int] = Query(None, description="Unix timestamp in seconds. Defaults to now."),
+    door_name: Optional[str] = Query(None, description="Comma-separated list of door names to count."),
+    user_id: Optional[str] = Query(None, description="Comma-separated list of user IDs to count."),
+    event_type: Optional[str] = Query(None, description="Comma-separated list of event types to count."),
+    current_user: db_models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Counts access events over an arbitrary range, grouped by any combination of
+    hour, weekday, day, door, user and event type.
+    - Requires user authentication and EVENT_STORE_ENABLED.
+    - Computed from the pre-aggregated hourly rollups, so the cost depends on the
+      number of hours and groups in range rather than the number of events.
+      The range is widened to whole hours.
+    - Groups without events are omitted; at most ANALYTICS_MAX_GROUPS groups are returned.
+    """
+    tz = _resolve_timezone(tz_name)
+    start_time, end_time = _resolve_range(start_time, end_time, default_days=7)
+
+    dimensions = event_store_service.split_csv(group_by)
+    try:
+        groups = await db.run_sync(
+            event_store_service.aggregate_event_counts,
+            start_time,
+            end_time,
+            dimensions,
+            tz,
+            event_store_service.split_csv(door_name),
+            event_store_service.split_csv(user_id),
+            event_store_service.split_csv(event_type),
+            get_settings().ANALYTICS_MAX_GROUPS,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return verkada_event_schemas.EventAggregationResponse(
+        group_by=dimensions,
+        timezone=tz_name,
+        data=[verkada_event_schemas.EventCountGroup(**key, event_count=count) for key, count in groups],
+        time_range_start=datetime.fromtimestamp(start_time, tz=timezone.utc),
+        time_range_end=datetime.fromtimestamp(end_time, tz=timezone.utc)
+    )
+
+@router.get(
+    "/top",
+    response_model=verkada_event_schemas.TopKResponse,
+    summary="Busiest Doors or Users over a Range, with Error Bounds",
+    dependencies=[Depends(require_event_store)]
+)
+async def get_top_k(
+    dimension: str = Query(..., pattern="^(door|user)$", description="'door' or 'user'."),
+    k: int = Query(default=20, ge=1, le=100, description="Number of doors or users to return (1-100)."),
+    start_time: Optional[int] = Query(None, description="Unix timestamp in seconds. Defaults to 90 days before end_time."),
+    end_time: Optional[int] = Query(None, description="Unix timestamp in seconds. Defaults to now."),
+    current_user: db_models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Returns the k doors or users with the most access events in a range.
+    - Requires user authentication and EVENT_STORE_ENABLED.
+    - Merges the bounded per-day Space-Saving summaries maintained on ingest,
+      so long ranges (e.g. a quarter) cost one small summary per day. The
+      range is widened to whole UTC days.
+    - Counts are estimates: each item's true count lies between lower_bound
+      and event_count, and any door or user not listed has at most
+      max_unlisted_count events. Items marked guaranteed are certainly in the top k.
+    """
+    start_time, end_time = _resolve_range(start_time, end_time, default_days=90)
+
+    sketch = await db.run_sync(event_store_service.merge_top_k_sketches, dimension, start_time, end_time)
+    ranked = sketch.top(k + 1)
+    # Reason: An item is certainly in the top k if even its lower bound beats
+    # the upper bound of everything ranked below it.
+    max_unlisted_count = max(ranked[k][1] if len(ranked) > k else 0, sketch.floor)
+    return verkada_event_schemas.TopKResponse(
+        dimension=dimension,
+        data=[
+            verkada_event_schemas.TopKItem(
+                value=value,
+                event_count=count,
+                lower_bound=count - error,
+                guaranteed=count - error >= max_unlisted_count,
+            )
+            for value, count, error in ranked[:k]
+        ],
+        total_events=sketch.total,
+        max_unlisted_count=max_unlisted_count,
+        time_range_start=datetime.fromtimestamp(start_time, tz=timezone.utc),
+        time_range_end=datetime.fromtimestamp(end_time, tz=timezone.utc)
+    )
+
+@router.get(
+    "/distinct-users",
+    response_model=verkada_event_schemas.DistinctUsersResponse,
+    summary="Approximate Distinct Users Grouped by Time and Door",
+    dependencies=[Depends(require_event_store)]
+)
+async def get_distinct_users(
+    group_by: str = Query(
+        default="day",
+        description="Comma-separated dimensions to group by: hour, weekday, day, door. "
+                    "E.g. 'day' for unique people per day or 'day,hour' for unique people per hour."
+    ),
+    tz_name: str = Query(default="UTC", alias="timezone", description="IANA time zone of hour, weekday and day, e.g. Europe/Berlin."),
+    start_time: Optional[int] = Query(None, description="Unix timestamp in seconds. Defaults to 7 days before end_time."),
+    end_time: Optional[int] = Query(None, description="Unix timestamp in seconds. Defaults to now."),
+    door_name: Optional[str] = Query(None, description="Comma-separated list of door names to count."),
+    current_user: db_models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Estimates how many distinct people (by user ID, else user name) had access
+    events, grouped by any combination of hour, weekday, day and door.
+    - Requires user authentication and EVENT_STORE_ENABLED.
+    - Merges the HyperLogLog sketch kept per hour and door (at most a few KB
+      each), so a quarter costs one small sketch per hour and door rather than
+      a scan of raw events. The range is widened to whole hours.
+    - Estimates have a relative standard error of relative_error (about 1.6%).
+    """
+    tz = _resolve_timezone(tz_name)
+    start_time, end_time = _resolve_range(start_time, end_time, default_days=7)
+    dimensions = event_store_service.split_csv(group_by)
+    try:
+        groups = await db.run_sync(
+            event_store_service.count_distinct_users,
+            start_time,
+            end_time,
+            dimensions,
+            tz,
+            event_store_service.split_csv(door_name),
+            get_settings().ANALYTICS_MAX_GROUPS,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return verkada_event_schemas.DistinctUsersResponse(
+        group_by=dimensions,
+        timezone=tz_name,
+        relative_error=HyperLogLog(event_store_service.USER_SKETCH_PRECISION).relative_error,
+        data=[verkada_event_schemas.DistinctUsersGroup(**key, distinct_users=count) for key, count in groups],
+        time_range_start=datetime.fromtimestamp(start_time, tz=timezone.utc),
+        time_range_end=datetime.fromtimestamp(end_time, tz=timezone.utc)
+    )
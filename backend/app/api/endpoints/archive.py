@@ -0,0 +1,91 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from datetime import datetime, timezone
+from typing import Optional
+
+from ...core.dependencies import get_current_active_user
+from ...db import models as db_models
+from ...models import verkada_event as verkada_event_schemas
+from ...services import event_archive_service
+
+router = APIRouter()
+
+# Reason: The report handlers are plain functions so FastAPI runs their pyarrow
+# scans in its thread pool instead of on the event loop.
+
+def _get_archive() -> event_archive_service.EventArchive:
+    """
+    Dependency returning the event archive, or a 503 if it is disabled or unavailable.
+    """
+    try:
+        archive = event_archive_service.get_event_archive()
+    except event_archive_service.ArchiveUnavailableError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=e.message)
+    if archive is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="The event archive is disabled. Set EVENT_ARCHIVE_ENABLED to enable it."
+        )
+    return archive
+
+def _resolve_range(start_time: Optional[int], end_time: Optional[int]) -> tuple:
+    """Fills in a missing range with the last two years."""
+    default_start, default_end = event_archive_service.default_report_range()
+    return start_time if start_time is not None else default_start, end_time if end_time is not None else default_end
+
+@router.get(
+    "/peak-times",
+    response_model=verkada_event_schemas.ArchivePeakTimesResponse,
+    summary="Year-over-Year Peak Access Times from the Event Archive"
+)
+def get_archive_peak_times(
+    start_time: Optional[int] = Query(None, description="Unix timestamp in seconds. Defaults to two years ago."),
+    end_time: Optional[int] = Query(None, description="Unix timestamp in seconds. Defaults to now."),
+    archive: event_archive_service.EventArchive = Depends(_get_archive),
+    current_user: db_models.User = Depends(get_current_active_user)
+):
+    """
+    Counts archived events per UTC hour of day for each calendar year in the range.
+    Reads only the timestamp column of the day partitions in range; no Verkada API calls.
+    """
+    start_time, end_time = _resolve_range(start_time, end_time)
+    counts_by_year = archive.hour_of_day_counts_by_year(start_time, end_time)
+    return verkada_event_schemas.ArchivePeakTimesResponse(
+        years=[
+            verkada_event_schemas.YearPeakTimes(
+                year=year,
+                data=[
+                    verkada_event_schemas.PeakTimeDataPoint(hour=hour, event_count=count)
+                    for hour, count in enumerate(hourly_counts)
+                ]
+            )
+            for year, hourly_counts in sorted(counts_by_year.items())
+        ],
+        time_range_start=datetime.fromtimestamp(start_time, tz=timezone.utc),
+        time_range_end=datetime.fromtimestamp(end_time, tz=timezone.utc)
+    )
+
+@router.get(
+    "/door-counts",
+    response_model=verkada_event_schemas.DoorCountsResponse,
+    summary="Per-Door Event Counts from the Event Archive"
+)
+def get_archive_door_counts(
+    start_time: Optional[int] = Query(None, description="Unix timestamp in seconds. Defaults to two years ago."),
+    end_time: Optional[int] = Query(None, description="Unix timestamp in seconds. Defaults to now."),
+    archive: event_archive_service.EventArchive = Depends(_get_archive),
+    current_user: db_models.User = Depends(get_current_active_user)
+):
+    """
+    Counts archived events per door, busiest first.
+    Reads only the door_name and timestamp columns of the day partitions in range.
+    """
+    start_time, end_time = _resolve_range(start_time, end_time)
+    counts = archive.door_counts(start_time, end_time)
+    return verkada_event_schemas.DoorCountsResponse(
+        data=[
+            verkada_event_schemas.DoorCount(door_name=door_name, event_count=count)
+            for door_name, count in sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        ],
+        time_range_start=datetime.fromtimestamp(start_time, tz=timezone.utc),
+        time_range_end=datetime.fromtimestamp(end_time, tz=timezone.utc)
+    )
@@ -1,13 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 from typing import Optional # Import Optional
 
 # Corrected relative imports
 from ...models import user as user_schemas
 from ...services import user_service
-from ...db.session import get_db
+from ...db.session import get_async_db
 from ...core import security
 from ...db import models as db_models # Import db_models for explicit type hinting and querying
 from ...core.dependencies import get_current_active_user # Import the dependency
@@ -16,25 +16,39 @@ router = APIRouter()
 
 ACCESS_TOKEN_EXPIRE_MINUTES = security.ACCESS_TOKEN_EXPIRE_MINUTES
 
+def _overloaded_exception(e: security.PasswordHashingOverloadedError) -> HTTPException:
+    """503 returned when the password hashing pool is saturated; clients should retry shortly."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=f"Authentication is temporarily overloaded: {e.message} Please retry.",
+        headers={"Retry-After": "1"},
+    )
+
 @router.post("/register", response_model=user_schemas.User, status_code=status.HTTP_201_CREATED)
-async def register_user(user: user_schemas.UserCreate, db: Session = Depends(get_db)):
+async def register_user(user: user_schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Registers a new user.
     - Checks if a user with the given username already exists.
     - Creates the user if not.
     """
-    db_user = user_service.get_user_by_username(db, username=user.username) # Corrected service call
+    db_user = await user_service.get_user_by_username(db, username=user.username) # Corrected service call
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered",
         )
-    created_user = user_service.create_user(db=db, user=user) # Corrected service call
+    # Reason: End the read transaction so no pooled DB connection is held while bcrypt runs.
+    await db.commit()
+    try:
+        hashed_password = await security.get_password_hash_async(user.password)
+    except security.PasswordHashingOverloadedError as e:
+        raise _overloaded_exception(e)
+    created_user = await user_service.create_user(db=db, user=user, hashed_password=hashed_password) # Corrected service call
     return created_user
 
 @router.post("/login/token", response_model=user_schemas.Token)
 async def login_for_access_token(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     form_data: OAuth2PasswordRequestForm = Depends()
 ):
     """
@@ -43,7 +57,7 @@ async def login_for_access_token(
     - Creates and returns a JWT access token.
     """
     # Explicitly type hint 'user' to help Pylance
-    user: Optional[db_models.User] = user_service.get_user_by_username(db, username=form_data.username)
+    user: Optional[db_models.User] = await user_service.get_user_by_username(db, username=form_data.username)
     
     if not user: # Check for user existence first
         raise HTTPException(
@@ -54,15 +68,26 @@ async def login_for_access_token(
     # Now 'user' is definitely a db_models.User instance
     # Add an assertion to help Pylance with type inference
     assert isinstance(user, db_models.User), "User should be an instance of db_models.User at this point"
-    if not security.verify_password(form_data.password, str(user.hashed_password)): # Explicitly cast to str
+    username, hashed_password = user.username, str(user.hashed_password) # Explicitly cast to str
+    # Reason: End the read transaction so no pooled DB connection is held while bcrypt runs.
+    await db.commit()
+    try:
+        # bcrypt runs in the bounded hashing pool, not on the event loop.
+        verified, new_hash = await security.verify_password_async(form_data.password, hashed_password)
+    except security.PasswordHashingOverloadedError as e:
+        raise _overloaded_exception(e)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Reason: The stored hash uses outdated bcrypt settings; upgrade it while the password is known.
+        await user_service.update_password_hash(db, user, new_hash)
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = security.create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": username}, expires_delta=access_token_expires
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
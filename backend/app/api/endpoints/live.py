@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+
+from ...core.config import get_settings
+from ...core.dependencies import get_current_active_user
+from ...db import models as db_models
+from ...services import live_feed_service
+
+router = APIRouter()
+
+@router.get(
+    "/events",
+    summary="Live Feed of Access Events (Server-Sent Events)",
+    response_class=StreamingResponse
+)
+async def stream_live_events(
+    event_type: Optional[str] = Query(None, description="Comma-separated list of event types to receive."),
+    user_id: Optional[str] = Query(None, description="Comma-separated list of user IDs to receive."),
+    user_name: Optional[str] = Query(None, description="Comma-separated list of user names to receive."),
+    door_name: Optional[str] = Query(None, description="Comma-separated list of door names to receive."),
+    device_id: Optional[str] = Query(None, description="Comma-separated list of device IDs to receive."),
+    site_id: Optional[str] = Query(None, description="Comma-separated list of site IDs to receive."),
+    current_user: db_models.User = Depends(get_current_active_user)
+):
+    """
+    Streams new access events as they arrive, as text/event-stream.
+    - Requires user authentication.
+    - Each event is an 'access_event' message whose data is the event as JSON
+      (ISO 8601 UTC timestamp); the message id is the event_id.
+    - Only events matching all given filters are sent.
+    - All clients share one upstream feed (the event sync, or a single poller),
+      so Verkada is not called more often as viewers are added.
+    - A client that falls too far behind receives a 'dropped' event and the
+      stream ends; it should reconnect and reload the timeline.
+    """
+    filters = live_feed_service.parse_filters(
+        event_type=event_type, user_id=user_id, user_name=user_name,
+        door_name=door_name, device_id=device_id, site_id=site_id,
+    )
+    broker = live_feed_service.live_event_broker
+    try:
+        broker.check_capacity()
+    except live_feed_service.LiveFeedFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=e.message,
+            headers={"Retry-After": "30"},
+        )
+    return StreamingResponse(
+        live_feed_service.stream_subscription(broker, filters, get_settings().LIVE_FEED_HEARTBEAT_SECONDS),
+        media_type="text/event-stream",
+        # Reason: Stop proxies (e.g. nginx in front of the frontend) from buffering the stream.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
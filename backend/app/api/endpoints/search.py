@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
+from typing import Optional
+
+from ...core.dependencies import get_current_active_user, require_event_store
+from ...db import models as db_models
+from ...db.session import get_async_db
+from ...models import verkada_event as verkada_event_schemas
+from ...services import event_store_service, name_search_service
+
+router = APIRouter()
+
+@router.get(
+    "/names",
+    response_model=verkada_event_schemas.NameSearchResponse,
+    summary="Autocomplete User and Door Names",
+    dependencies=[Depends(require_event_store)]
+)
+async def search_names(
+    q: str = Query(..., min_length=1, max_length=100, description="Text typed so far."),
+    kind: Optional[str] = Query(None, pattern="^(user|door)$", description="'user' or 'door'; both if omitted."),
+    limit: int = Query(default=10, ge=1, le=50, description="Maximum number of names (1-50)."),
+    current_user: db_models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Suggests user and door names seen in access events, for filter autocomplete.
+    - Requires user authentication and EVENT_STORE_ENABLED.
+    - Case-insensitive: names starting with q come first, then (for q of three
+      or more characters) names containing it, each by descending event count.
+    - Answered from the name index maintained on ingest (a B-tree for prefixes,
+      an FTS5 trigram index for substrings), never by scanning events.
+    - Each match carries the id to filter /events by (user_id for users).
+    """
+    matches = await db.run_sync(name_search_service.search_names, q, kind, limit)
+    return verkada_event_schemas.NameSearchResponse(
+        query=q,
+        data=[
+            verkada_event_schemas.NameMatch(
+                kind=match.kind,
+                name=match.name,
+                id=match.entity_id or None,
+                event_count=match.event_count,
+                last_seen=datetime.fromtimestamp(match.last_seen, tz=timezone.utc),
+            )
+            for match in matches
+        ]
+    )
+
+@router.get(
+    "/resolve",
+    response_model=verkada_event_schemas.NameResolutionResponse,
+    summary="Resolve User or Door Names to IDs",
+    dependencies=[Depends(require_event_store)]
+)
+async def resolve_names(
+    names: str = Query(..., description="Comma-separated list of names, matched case-insensitively."),
+    kind: str = Query(default="user", pattern="^(user|door)$", description="'user' (to user IDs) or 'door' (to device IDs)."),
+    current_user: db_models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Resolves names to the ids they appear with in access events, e.g. to turn
+    a typed user name into a user_id filter for /events (which the Verkada API
+    also accepts). Answered from the name index without scanning events.
+    """
+    resolved = await db.run_sync(name_search_service.resolve_names, kind, event_store_service.split_csv(names))
+    return verkada_event_schemas.NameResolutionResponse(
+        kind=kind,
+        data=[verkada_event_schemas.NameResolution(name=name, ids=ids) for name, ids in resolved.items()]
+    )
@@ -1,27 +1,63 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query # Added Query
-from sqlalchemy.orm import Session
-import requests
-from typing import Any, List, Dict, Optional # Added Optional
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+import httpx
+from typing import Any, AsyncIterator, List, Dict, Optional # Added Optional
 from datetime import datetime, timedelta, timezone # Added datetime, timedelta, timezone
-import pandas as pd # Import pandas
 
-from app.core.config import verkada_auth_client, get_settings
+from app.core import metrics
+from app.core.cache import TTLLRUCache
+from app.core.config import verkada_api_client, get_settings
+from app.core.event_batch import EventBatch
 from app.core.verkada_client.exceptions import TokenGenerationError, ApiKeyNotFoundError
-from app.db.session import get_db # For consistency, though not used here yet
+from app.db.session import get_async_db
 from app.core.dependencies import get_current_active_user # To protect this endpoint
 from app.db import models as db_models # For type hinting current_user
 from app.models import verkada_event as verkada_event_schemas # Import Verkada event Pydantic models
+from app.services import event_export_service, event_store_service
+from app.services.aggregation import HourOfDayAggregator
 
 
 router = APIRouter()
 
+# /events query params served by the local event store but not by the Verkada API.
+LOCAL_ONLY_QUERY_PARAMS = {"user_name", "door_name", "order"}
+
+# Cache of upstream /events responses, keyed on the normalized query params.
+events_response_cache = TTLLRUCache(maxsize=get_settings().EVENTS_CACHE_MAX_ENTRIES)
+metrics.register_cache("events_response", events_response_cache)
+
+def _events_cache_key(params: verkada_event_schemas.VerkadaEventQueryParams) -> tuple:
+    """
+    Builds a cache key from the query params. Comma-separated filters are
+    normalized so that e.g. "a,b" and "b, a" share an entry.
+    """
+    normalized = {}
+    for name, value in params.model_dump(exclude_none=True, exclude=LOCAL_ONLY_QUERY_PARAMS).items():
+        if name in ("event_type", "site_id", "device_id", "user_id"):
+            value = ",".join(sorted(item.strip() for item in value.split(",") if item.strip()))
+        normalized[name] = value
+    return tuple(sorted(normalized.items()))
+
+def _events_cache_ttl(params: verkada_event_schemas.VerkadaEventQueryParams) -> float:
+    """
+    Returns how long an /events response may be cached. Windows that ended well
+    in the past cannot receive new events and are cached much longer than
+    windows touching "now".
+    """
+    settings = get_settings()
+    immutable_before = datetime.now(timezone.utc).timestamp() - settings.EVENTS_CACHE_IMMUTABLE_AFTER_SECONDS
+    if params.end_time is not None and params.end_time < immutable_before:
+        return settings.EVENTS_CACHE_IMMUTABLE_TTL_SECONDS
+    return settings.EVENTS_CACHE_TTL_SECONDS
+
 @router.get("/test-token", summary="Test Verkada API Token Retrieval")
 async def test_verkada_token(current_user: db_models.User = Depends(get_current_active_user)):
     """
     Tests the retrieval of a Verkada API token using the VerkadaAuthenticator.
     This is a protected endpoint and requires user authentication.
     """
-    if not verkada_auth_client:
+    if not verkada_api_client:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Verkada authenticator is not initialized. Check API key configuration."
@@ -29,7 +65,7 @@ async def test_verkada_token(current_user: db_models.User = Depends(get_current_
     try:
         # Attempt to get the authentication headers
         # This will trigger a token fetch if one is not cached or is expired.
-        auth_headers = verkada_auth_client.get_auth_headers()
+        auth_headers = await verkada_api_client.get_auth_headers()
         
         # For testing, we can just return a success message and part of the token
         # or the headers. Avoid returning the full token in a real non-debug endpoint.
@@ -62,95 +98,72 @@ async def test_verkada_token(current_user: db_models.User = Depends(get_current_
 )
 async def get_verkada_access_events(
     params: verkada_event_schemas.VerkadaEventQueryParams = Depends(),
+    db: AsyncSession = Depends(get_async_db),
     current_user: db_models.User = Depends(get_current_active_user) # Protect the endpoint
 ):
     """
-    Fetches access control events from the Verkada API.
+    Fetches access control events.
     - Requires user authentication.
     - Uses query parameters for filtering and pagination.
+    - Answered from the local event store when EVENT_STORE_ENABLED is set,
+      otherwise passed through to the Verkada API.
+    - From the local store, pages are keyset-paginated: page_token is an opaque
+      cursor from next_page_token/prev_page_token, order=asc|desc sorts by time,
+      and user_name/door_name filters are available.
     """
-    if not verkada_auth_client:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Verkada authenticator is not initialized. Check API key configuration."
+    if get_settings().EVENT_STORE_ENABLED:
+        try:
+            events, next_page_token, prev_page_token = await db.run_sync(event_store_service.query_events, params)
+        except ValueError as cursor_err:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid page_token: {cursor_err}"
+            )
+        return verkada_event_schemas.VerkadaEventListResponse(
+            events=events,
+            next_page_token=next_page_token,
+            prev_page_token=prev_page_token
         )
 
-    try:
-        auth_headers = verkada_auth_client.get_auth_headers()
-    except (ApiKeyNotFoundError, TokenGenerationError) as e:
-        # Handle auth issues gracefully, similar to test-token endpoint
-        detail_message = f"Verkada API Authentication error: {e}"
-        if isinstance(e, TokenGenerationError):
-            detail_message = f"Failed to generate Verkada API token: {e.message} (Status: {e.status_code}, Details: {e.details})"
+    if not verkada_api_client:
         raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, # Or 500 depending on error type
-            detail=detail_message
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Verkada authenticator is not initialized. Check API key configuration."
         )
 
-    # Construct the Verkada API URL
-    settings = get_settings()
-    # Ensure the base URL from settings does not end with a slash, and the path does not start with one.
-    base_url = settings.VERKADA_API_BASE_URL.rstrip('/')
-    api_path = "events/v1/access" # Path from Verkada documentation
-    verkada_events_url = f"{base_url}/{api_path}"
+    cache_key = _events_cache_key(params)
+    cached_response = events_response_cache.get(cache_key)
+    if cached_response is not None:
+        return cached_response
 
-    # Prepare query parameters, excluding None values
-    query_params = params.model_dump(exclude_none=True)
+    # Prepare query parameters, excluding None values and filters only the local store supports
+    query_params = params.model_dump(exclude_none=True, exclude=LOCAL_ONLY_QUERY_PARAMS)
 
     try:
-        response = requests.get(
-            verkada_events_url,
-            headers=auth_headers,
-            params=query_params,
-            timeout=15 # Increased timeout for potentially larger data
-        )
-        response.raise_for_status() # Raise an exception for HTTP error codes
-        
-        # TODO: Parse the actual response and map to VerkadaEventListResponse
-        # For now, returning the raw JSON if successful
-        # This will likely fail response_model validation until models are accurate
-        response_data = response.json()
-        
-        # Placeholder mapping - this needs to be accurate based on actual API response
-        # and the defined Pydantic models.
-        # For now, returning a dummy response that matches the model structure
-        # and attempting to parse what we expect.
-        
-        # Assuming the API response structure is like:
-        # {
-        #   "events": [ {event_data_1}, {event_data_2} ],
-        #   "nextPageToken": "some_token_string_or_null"
-        # }
-        # We need to adjust VerkadaEvent model based on actual event_data structure.
-        
-        parsed_events = []
+        response_data = await verkada_api_client.get_access_events(query_params)
+
         raw_events = response_data.get("events", [])
-        if isinstance(raw_events, list):
-            for event_data_item in raw_events:
-                try:
-                    # This will fail if VerkadaEvent model doesn't match actual event_data_item
-                    parsed_events.append(verkada_event_schemas.VerkadaEvent.model_validate(event_data_item))
-                except Exception as parse_err:
-                    # Log or handle individual event parsing errors if necessary
-                    print(f"Error parsing event item: {event_data_item}, error: {parse_err}")
-                    # Continue to parse other events or raise a more generic error
-
-        # When instantiating the Pydantic model, use the actual field name.
-        # The value comes from the JSON response, where the key is 'nextPageToken' (the alias).
-        
-        # Construct arguments for the Pydantic model explicitly
+        parsed_events = verkada_event_schemas.parse_events(raw_events if isinstance(raw_events, list) else [])
         response_args = {
             "events": parsed_events,
             "next_page_token": response_data.get("nextPageToken") # Use field name as key for args dict
         }
-        return verkada_event_schemas.VerkadaEventListResponse(**response_args)
+        event_list_response = verkada_event_schemas.VerkadaEventListResponse(**response_args)
+        events_response_cache.set(cache_key, event_list_response, ttl=_events_cache_ttl(params))
+        return event_list_response
 
-    except requests.exceptions.HTTPError as http_err:
+    except (ApiKeyNotFoundError, TokenGenerationError) as e:
+        # Handle auth issues gracefully, similar to test-token endpoint
+        detail_message = f"Verkada API Authentication error: {e}"
+        if isinstance(e, TokenGenerationError):
+            detail_message = f"Failed to generate Verkada API token: {e.message} (Status: {e.status_code}, Details: {e.details})"
         raise HTTPException(
-            status_code=http_err.response.status_code,
-            detail=f"HTTP error from Verkada API: {http_err.response.text}"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, # Or 500 depending on error type
+            detail=detail_message
         )
-    except requests.exceptions.RequestException as req_err:
+    except httpx.HTTPStatusError as http_err:
+        raise _upstream_http_exception(http_err)
+    except httpx.RequestError as req_err:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Network error connecting to Verkada API: {req_err}"
@@ -158,7 +171,7 @@ async def get_verkada_access_events(
     except ValueError as json_err: # Includes JSONDecodeError
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to decode JSON response from Verkada events API: {response.text if 'response' in locals() else 'No response text'}"
+            detail=f"Failed to decode JSON response from Verkada events API: {json_err}"
         )
     except Exception as e:
         raise HTTPException(
@@ -166,75 +179,90 @@ async def get_verkada_access_events(
             detail=f"An unexpected error occurred while fetching Verkada events: {str(e)}"
         )
 
-async def _fetch_all_verkada_events(
+async def _iter_verkada_event_pages(
     start_time_dt: datetime,
     end_time_dt: datetime,
-    auth_headers: Dict[str, str],
-    initial_params: Optional[Dict[str, Any]] = None
-) -> List[verkada_event_schemas.VerkadaEvent]:
+    initial_params: Optional[Dict[str, Any]] = None,
+    fetch_mode: Optional[str] = None,
+    apply_page_cap: bool = True
+) -> AsyncIterator[List[Dict[str, Any]]]:
     """
-    Helper function to fetch all Verkada events within a time range, handling pagination.
+    Yields pages of raw Verkada events within a time range, handling pagination.
+
+    fetch_mode (defaults to the VERKADA_FETCH_MODE setting):
+    - "sequential": walks nextPageToken one page at a time.
+    - "sharded": splits the range into sub-windows fetched concurrently;
+      pages arrive in no particular order.
+
+    apply_page_cap limits the fetch to VERKADA_FETCH_MAX_PAGES pages; streaming
+    callers that do not hold the events in memory may lift it.
+
+    Upstream HTTP, network, decoding and auth errors are raised to the caller
+    (429 responses are first retried by the client's rate limiter), so a
+    throttled or failing fetch never yields a silently truncated dataset.
     """
-    all_events: List[verkada_event_schemas.VerkadaEvent] = []
-    
+    if not verkada_api_client:
+        return
+
     settings = get_settings()
-    base_url = settings.VERKADA_API_BASE_URL.rstrip('/')
-    api_path = "events/v1/access"
-    current_verkada_events_url = f"{base_url}/{api_path}"
-
-    # Prepare initial query parameters
-    current_query_params = {
-        "start_time": int(start_time_dt.timestamp()),
-        "end_time": int(end_time_dt.timestamp()),
-        "page_size": 200 # Max page size
-    }
-    if initial_params:
-        current_query_params.update(initial_params)
-
-    page_count = 0 # Safety break for pagination
-    max_pages = 20 # Fetch a maximum of 20 pages (20 * 200 = 4000 events) to prevent accidental long runs
-
-    while current_verkada_events_url and page_count < max_pages:
-        page_count += 1
-        try:
-            response = requests.get(
-                current_verkada_events_url, # For subsequent calls, this might be just the base + path
-                headers=auth_headers,
-                params=current_query_params, # Pass current_query_params here
-                timeout=15
-            )
-            response.raise_for_status()
-            response_data = response.json()
-
-            raw_events = response_data.get("events", [])
-            if isinstance(raw_events, list):
-                for event_data_item in raw_events:
-                    try:
-                        all_events.append(verkada_event_schemas.VerkadaEvent.model_validate(event_data_item))
-                    except Exception as parse_err:
-                        print(f"Error parsing event item during all_events fetch: {event_data_item}, error: {parse_err}")
-            
-            next_page_token = response_data.get("nextPageToken")
-            if next_page_token:
-                current_query_params["page_token"] = next_page_token
-                # The URL itself doesn't change for subsequent paginated requests, only the page_token param
-            else:
-                break # No more pages
-
-        except requests.exceptions.HTTPError as http_err:
-            print(f"HTTP error fetching all events page {page_count}: {http_err.response.text}")
-            break # Stop pagination on error
-        except requests.exceptions.RequestException as req_err:
-            print(f"Network error fetching all events page {page_count}: {req_err}")
-            break # Stop pagination on error
-        except ValueError as json_err:
-            print(f"JSON decode error fetching all events page {page_count}: {response.text if 'response' in locals() else 'No response text'}")
-            break
-        except Exception as e:
-            print(f"Unexpected error fetching all events page {page_count}: {str(e)}")
-            break
-            
-    return all_events
+    fetch_mode = fetch_mode or settings.VERKADA_FETCH_MODE
+    max_pages = settings.VERKADA_FETCH_MAX_PAGES if apply_page_cap else None # Safety cap to prevent accidental long runs
+
+    if fetch_mode == "sharded":
+        pages = verkada_api_client.iter_access_event_pages_sharded(
+            start_time_dt,
+            end_time_dt,
+            params=initial_params,
+            concurrency=settings.VERKADA_FETCH_CONCURRENCY,
+            min_window_seconds=settings.VERKADA_FETCH_MIN_WINDOW_SECONDS,
+            max_pages=max_pages,
+        )
+    else:
+        pages = verkada_api_client.iter_access_event_pages(
+            start_time_dt, end_time_dt, params=initial_params, max_pages=max_pages
+        )
+
+    try:
+        async for raw_events in pages:
+            yield raw_events
+    finally:
+        await pages.aclose()
+
+def _upstream_http_exception(err: Exception) -> HTTPException:
+    """
+    Maps an error raised while calling the Verkada API to an HTTPException.
+    Rate-limit responses keep their status and Retry-After header so clients can back off.
+    """
+    if isinstance(err, ApiKeyNotFoundError):
+        return HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Verkada Auth error: {err}")
+    if isinstance(err, TokenGenerationError):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Failed to generate Verkada API token: {err.message} (Status: {err.status_code}, Details: {err.details})"
+        )
+    if isinstance(err, httpx.HTTPStatusError):
+        headers = None
+        if err.response.status_code == status.HTTP_429_TOO_MANY_REQUESTS and "Retry-After" in err.response.headers:
+            headers = {"Retry-After": err.response.headers["Retry-After"]}
+        return HTTPException(
+            status_code=err.response.status_code,
+            detail=f"HTTP error from Verkada API: {err.response.text}",
+            headers=headers
+        )
+    if isinstance(err, httpx.RequestError):
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Network error connecting to Verkada API: {err}"
+        )
+    if isinstance(err, ValueError): # Includes JSONDecodeError
+        return HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to decode JSON response from Verkada events API: {err}"
+        )
+    return HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=f"An unexpected error occurred while fetching Verkada events: {str(err)}"
+    )
 
 @router.get(
     "/peak-times",
@@ -243,72 +271,131 @@ async def _fetch_all_verkada_events(
 )
 async def get_verkada_peak_times(
     current_user: db_models.User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_async_db),
     # Add query params for time range if needed, e.g., last_n_days
     days_history: int = Query(default=7, ge=1, le=30, description="Number of past days to analyze for peak times (1-30).")
 ):
     """
     Analyzes Verkada access events to determine peak access times.
-    - Fetches events for the specified number of past days.
-    - Aggregates event counts by hour of the day.
+    - Streams events for the specified number of past days page by page and
+      counts them per UTC hour of the day with a vectorized histogram.
+    - When EVENT_STORE_ENABLED is set, sums the pre-aggregated hourly rollups
+      instead (at most 30 * 24 hour buckets), independent of event volume.
     """
-    if not verkada_auth_client:
+    end_time_dt = datetime.now(timezone.utc)
+    start_time_dt = end_time_dt - timedelta(days=days_history)
+
+    if get_settings().EVENT_STORE_ENABLED:
+        counts_by_hour = await db.run_sync(
+            event_store_service.count_events_by_hour, int(start_time_dt.timestamp()), int(end_time_dt.timestamp())
+        )
+        return verkada_event_schemas.PeakTimesResponse(
+            data=[
+                verkada_event_schemas.PeakTimeDataPoint(hour=hour, event_count=counts_by_hour.get(hour, 0))
+                for hour in range(24)
+            ],
+            time_range_start=start_time_dt,
+            time_range_end=end_time_dt
+        )
+
+    if not verkada_api_client:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Verkada authenticator not initialized."
         )
 
+    # Aggregate events for the period page by page; only the counters and seen event_ids are kept.
+    # We might want to pass specific event_types if only certain events contribute to "peak times"
+    # Reason: Windows and pages may deliver an event more than once; count each event_id once.
+    aggregator = HourOfDayAggregator(deduplicate=True)
+    pages_fetched = 0
     try:
-        auth_headers = verkada_auth_client.get_auth_headers()
-    except (ApiKeyNotFoundError, TokenGenerationError) as e:
-        # Simplified error handling for brevity
-        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=f"Verkada Auth error: {e}")
+        async for raw_events in _iter_verkada_event_pages(start_time_dt, end_time_dt):
+            pages_fetched += 1
+            aggregator.add_batch(EventBatch.from_raw_events(raw_events))
+    except (ApiKeyNotFoundError, TokenGenerationError, httpx.HTTPError, ValueError) as e:
+        raise _upstream_http_exception(e)
+    finally:
+        metrics.PEAK_TIMES_PAGES.observe(pages_fetched)
 
-    end_time_dt = datetime.now(timezone.utc)
-    start_time_dt = end_time_dt - timedelta(days=days_history)
+    return verkada_event_schemas.PeakTimesResponse(
+        data=aggregator.to_data_points() if aggregator.total else [],
+        time_range_start=start_time_dt,
+        time_range_end=end_time_dt
+    )
 
-    # Fetch all events for the period
-    # We might want to pass specific event_types if only certain events contribute to "peak times"
-    all_events = await _fetch_all_verkada_events(start_time_dt, end_time_dt, auth_headers)
+@router.get(
+    "/events/export",
+    summary="Export Access Control Events as NDJSON or CSV",
+    response_class=StreamingResponse
+)
+async def export_verkada_access_events(
+    params: verkada_event_schemas.VerkadaEventQueryParams = Depends(),
+    export_format: str = Query(default="ndjson", alias="format", pattern="^(ndjson|csv)$", description="Export format: ndjson or csv."),
+    current_user: db_models.User = Depends(get_current_active_user)
+):
+    """
+    Streams access events for a time range as NDJSON or CSV.
+    - Requires user authentication.
+    - Defaults to the last 24 hours when start_time/end_time are not given.
+    - Reads the local event store when EVENT_STORE_ENABLED is set, otherwise
+      pages through the Verkada API while streaming. page_token and page_size
+      are ignored.
+    - Events are fetched one batch at a time as the client consumes the
+      response, so memory use is bounded whatever the range.
+    - If fetching fails after streaming has started, the export ends with an
+      error record: an NDJSON line {"error": ..., "status_code": ..., "complete": false}
+      or a CSV line starting with "# export incomplete:".
+    """
+    end_time = params.end_time or int(datetime.now(timezone.utc).timestamp())
+    start_time = params.start_time or end_time - 24 * 3600
+    params = params.model_copy(update={"start_time": start_time, "end_time": end_time, "page_token": None})
 
-    if not all_events:
-        return verkada_event_schemas.PeakTimesResponse(
-            data=[],
-            time_range_start=start_time_dt,
-            time_range_end=end_time_dt
+    if get_settings().EVENT_STORE_ENABLED:
+        rows_batches = event_export_service.iter_stored_export_rows(params)
+    elif verkada_api_client:
+        filters = params.model_dump(
+            exclude_none=True, exclude={"start_time", "end_time", "page_token", "page_size", *LOCAL_ONLY_QUERY_PARAMS}
         )
 
-    # Process with Pandas
-    try:
-        df = pd.DataFrame([event.model_dump() for event in all_events])
-        if 'timestamp' not in df.columns or df.empty:
-             return verkada_event_schemas.PeakTimesResponse(data=[], time_range_start=start_time_dt, time_range_end=end_time_dt)
+        async def upstream_rows_batches():
+            try:
+                async for raw_events in _iter_verkada_event_pages(
+                    datetime.fromtimestamp(start_time, tz=timezone.utc),
+                    datetime.fromtimestamp(end_time, tz=timezone.utc),
+                    initial_params=filters,
+                    fetch_mode="sequential", # Keeps upstream order and one request in flight
+                    apply_page_cap=False
+                ):
+                    yield [event_export_service.event_to_export_row(event) for event in verkada_event_schemas.parse_events(raw_events)]
+            except (ApiKeyNotFoundError, TokenGenerationError, httpx.HTTPError, ValueError) as e:
+                # Reason: Headers are already sent; report the upstream error in-band.
+                http_exception = _upstream_http_exception(e)
+                raise event_export_service.ExportFailedError(http_exception.detail, http_exception.status_code) from e
 
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df['hour'] = df['timestamp'].dt.hour
-        
-        peak_times_counts = df.groupby('hour').size().reset_index(name='event_count')
-        
-        # Ensure all hours from 0-23 are present, filling missing with 0
-        all_hours_df = pd.DataFrame({'hour': range(24)})
-        peak_times_counts = pd.merge(all_hours_df, peak_times_counts, on='hour', how='left').fillna(0)
-        peak_times_counts['event_count'] = peak_times_counts['event_count'].astype(int)
-
-        peak_time_data_points = [
-            verkada_event_schemas.PeakTimeDataPoint(hour=row['hour'], event_count=row['event_count'])
-            for index, row in peak_times_counts.iterrows()
-        ]
-        
-        return verkada_event_schemas.PeakTimesResponse(
-            data=peak_time_data_points,
-            time_range_start=start_time_dt,
-            time_range_end=end_time_dt
-        )
-    except Exception as e:
-        # Log the error for debugging
-        print(f"Error processing events with Pandas: {e}")
+        rows_batches = upstream_rows_batches()
+    else:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error processing event data: {str(e)}"
+            detail="Verkada authenticator is not initialized. Check API key configuration."
         )
 
+    filename = f"access-events-{start_time}-{end_time}.{'csv' if export_format == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        event_export_service.stream_export(rows_batches, export_format),
+        media_type=event_export_service.EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get(
+    "/events/cache-stats",
+    response_model=verkada_event_schemas.CacheStats,
+    summary="Get /events Response Cache Statistics"
+)
+async def get_events_cache_stats(current_user: db_models.User = Depends(get_current_active_user)):
+    """
+    Returns hit/miss/eviction counters of the /events response cache, for sizing it.
+    """
+    return verkada_event_schemas.CacheStats(**events_response_cache.stats())
+
 # Add other Verkada related endpoints here, e.g., for fetching events.
\ No newline at end of file
@@ -0,0 +1,56 @@
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+
+from ...core.config import get_settings
+from ...core.dependencies import require_event_store
+from ...services import webhook_service
+
+router = APIRouter()
+
+@router.post(
+    "/verkada",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Receive Verkada Access Event Notifications",
+    dependencies=[Depends(require_event_store)]
+)
+async def receive_verkada_webhook(request: Request):
+    """
+    Webhook receiver for Verkada access event notifications.
+    - Authenticated by the HMAC-SHA256 signature in the Verkada-Signature
+      header (shared secret WEBHOOK_SECRET), not by a user token; 401 if it
+      does not verify.
+    - Events are queued and acknowledged immediately with 202; a background
+      writer stores them in batches, so the response never waits on the database.
+    - 503 with Retry-After if the queue is full, so Verkada redelivers later.
+    """
+    settings = get_settings()
+    if not settings.WEBHOOK_SECRET:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Webhook ingestion is disabled. Set WEBHOOK_SECRET to enable it."
+        )
+    body = await request.body()
+    try:
+        webhook_service.verify_signature(
+            settings.WEBHOOK_SECRET,
+            request.headers.get(webhook_service.SIGNATURE_HEADER),
+            body,
+            settings.WEBHOOK_SIGNATURE_TOLERANCE_SECONDS,
+        )
+    except webhook_service.InvalidSignatureError as e:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=e.message)
+    try:
+        events = webhook_service.parse_notification(json.loads(body))
+    except ValueError as e: # Includes json.JSONDecodeError
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    try:
+        webhook_service.webhook_event_queue.put(events)
+    except webhook_service.WebhookQueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=e.message,
+            headers={"Retry-After": "5"},
+        )
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content={"queued": len(events)})
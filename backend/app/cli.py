@@ -0,0 +1,93 @@
+"""
+Command-line maintenance tasks for the dashboard backend.
+
+Usage (from the backend directory, or /app in the container):
+    python -m app.cli backfill --start 2025-01-01 --end 2025-04-01
+
+backfill imports all access events of a date range from Verkada into the
+local event store. It can be interrupted and re-run with the same (or an
+overlapping) range: windows imported completely are skipped.
+"""
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from .core.config import get_settings, verkada_api_client
+from .db import models
+from .db.session import AsyncSessionLocal, engine
+from .services import backfill_service, event_store_service
+
+logger = logging.getLogger("app.cli")
+
+def parse_time(value: str) -> int:
+    """Parses an ISO 8601 date or datetime (UTC unless it has an offset) into a Unix timestamp."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Not an ISO 8601 date or datetime: {value}")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+def log_progress(backfill: backfill_service.Backfill) -> None:
+    logger.info(
+        "%d/%d windows, %d events fetched (%d new), %.0f events/sec",
+        backfill.windows_completed, len(backfill.windows), backfill.events_fetched,
+        backfill.events_stored, backfill.events_per_second,
+    )
+
+async def run_backfill(args: argparse.Namespace) -> int:
+    """Runs a backfill, logging progress every --progress-seconds. Returns the exit code."""
+    if not verkada_api_client:
+        logger.error("Verkada API client is not configured (is VERKADA_API_KEY set?).")
+        return 1
+    backfill = backfill_service.Backfill(
+        verkada_api_client, AsyncSessionLocal, args.start, args.end,
+        window_seconds=args.window_seconds, concurrency=args.concurrency,
+    )
+    settings = get_settings()
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(
+            event_store_service.enable_event_id_index,
+            settings.EVENT_DEDUPE_FILTER_CAPACITY,
+            settings.EVENT_DEDUPE_FILTER_ERROR_RATE,
+            settings.EVENT_DEDUPE_RECENT_IDS,
+        )
+    task = asyncio.create_task(backfill.run())
+    try:
+        while not task.done():
+            await asyncio.wait({task}, timeout=args.progress_seconds)
+            log_progress(backfill)
+        await task
+    except Exception:
+        logger.exception("Backfill failed; re-run the same command to resume it")
+        return 1
+    finally:
+        await verkada_api_client.aclose()
+    return 0
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    backfill_parser = commands.add_parser("backfill", help="Import a historical date range into the local event store.")
+    backfill_parser.add_argument("--start", type=parse_time, required=True, help="ISO 8601 date or datetime (UTC by default).")
+    backfill_parser.add_argument("--end", type=parse_time, default=None, help="Exclusive end; defaults to now.")
+    backfill_parser.add_argument("--window-seconds", type=int, default=settings.BACKFILL_WINDOW_SECONDS)
+    backfill_parser.add_argument("--concurrency", type=int, default=settings.BACKFILL_CONCURRENCY)
+    backfill_parser.add_argument("--progress-seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    if args.end is None:
+        args.end = int(datetime.now(timezone.utc).timestamp())
+    models.Base.metadata.create_all(bind=engine)
+    try:
+        raise SystemExit(asyncio.run(run_backfill(args)))
+    except ValueError as e:
+        parser.error(str(e))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Small in-process caches used on hot request paths.
+Provides TTLLRUCache, a bounded mapping with per-entry expiry and LRU eviction.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLLRUCache:
+    """
+    A thread-safe, size-bounded cache with per-entry time-to-live.
+
+    When the cache is full, the least recently used entry is evicted. Expired
+    entries are dropped lazily when they are looked up. Hit, miss, eviction and
+    expiration counters are kept so the cache can be sized from real traffic.
+    """
+
+    def __init__(self, maxsize: int = 256, default_ttl: float = 60.0):
+        """
+        Initializes the cache.
+
+        Args:
+            maxsize (int): Maximum number of entries kept.
+            default_ttl (float): Time-to-live in seconds used when set() is not given one.
+        """
+        self._maxsize = maxsize
+        self._default_ttl = default_ttl
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Returns the cached value for key, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """
+        Stores value under key for ttl seconds (default_ttl if not given).
+        """
+        expires_at = time.monotonic() + (self._default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        """Removes key from the cache if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes all entries. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the cache counters and current size.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self._maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
@@ -3,6 +3,8 @@ from functools import lru_cache
 from pydantic_settings import BaseSettings # For potential future typed settings
 
 from .verkada_client.authenticator import VerkadaAuthenticator
+from .verkada_client.client import VerkadaApiClient
+from .verkada_client.rate_limiter import RateLimitScheduler
 from .verkada_client.exceptions import ApiKeyNotFoundError
 
 class Settings(BaseSettings):
@@ -13,6 +15,76 @@ class Settings(BaseSettings):
     VERKADA_API_KEY: str = os.getenv("VERKADA_API_KEY", "not_set")
     VERKADA_ORG_ID: str = os.getenv("VERKADA_ORG_ID", "not_set") # If needed by authenticator or other services
     VERKADA_API_BASE_URL: str = os.getenv("VERKADA_API_BASE_URL", "https://api.verkada.com") # Default, override in .env
+    # Connection pool and timeouts for the shared async Verkada HTTP client
+    VERKADA_HTTP_MAX_CONNECTIONS: int = 20
+    VERKADA_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    VERKADA_HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    VERKADA_HTTP_TIMEOUT_SECONDS: float = 15.0
+    VERKADA_HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    # Bulk event fetching: "sharded" splits the time range into concurrently fetched
+    # sub-windows, "sequential" walks nextPageToken one page at a time.
+    VERKADA_FETCH_MODE: str = "sharded"
+    VERKADA_FETCH_CONCURRENCY: int = 4
+    VERKADA_FETCH_MIN_WINDOW_SECONDS: int = 900
+    VERKADA_FETCH_MAX_PAGES: int = 20 # 20 * 200 = 4000 events per bulk fetch
+    # Client-side rate limit shared by all Verkada API calls (token bucket).
+    # The rate backs off on 429 responses and recovers towards this target.
+    VERKADA_RATE_LIMIT_PER_SECOND: float = 10.0
+    VERKADA_RATE_LIMIT_BURST: int = 20
+    VERKADA_RATE_LIMIT_MAX_RETRIES: int = 3
+    # In-process /events response cache. Windows ending more than
+    # EVENTS_CACHE_IMMUTABLE_AFTER_SECONDS ago no longer change and are kept longer.
+    EVENTS_CACHE_MAX_ENTRIES: int = 256
+    EVENTS_CACHE_TTL_SECONDS: float = 30.0
+    EVENTS_CACHE_IMMUTABLE_TTL_SECONDS: float = 3600.0
+    EVENTS_CACHE_IMMUTABLE_AFTER_SECONDS: int = 300
+    # Password hashing (bcrypt) runs in a bounded thread pool off the event loop.
+    # Requests beyond PASSWORD_HASH_MAX_PENDING running/queued hashes get a 503.
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    # Cache of authenticated users (keyed by token subject) used by get_current_user.
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 1024
+    PRINCIPAL_CACHE_TTL_SECONDS: float = 60.0
+    # Local event store: when enabled, a background task syncs events from Verkada
+    # and dashboard queries are answered from the access_events table.
+    EVENT_STORE_ENABLED: bool = False
+    EVENT_SYNC_INTERVAL_SECONDS: float = 60.0
+    EVENT_SYNC_INITIAL_LOOKBACK_DAYS: int = 30 # Matches the maximum /peak-times history
+    EVENT_SYNC_OVERLAP_SECONDS: int = 60
+    # In-memory event_id filter of the local store, rebuilt at startup (see event_store_service.EventIdIndex).
+    EVENT_DEDUPE_FILTER_CAPACITY: int = 10000000 # Bloom filter sized for this many ids (or twice the stored ones)
+    EVENT_DEDUPE_FILTER_ERROR_RATE: float = 0.01
+    EVENT_DEDUPE_RECENT_IDS: int = 200000 # Newest event ids remembered exactly, to reject duplicates without a query
+    # Day-partitioned Parquet archive of ingested events for long-range reports.
+    # Requires pyarrow and EVENT_STORE_ENABLED (events are archived as they are stored).
+    EVENT_ARCHIVE_ENABLED: bool = False
+    EVENT_ARCHIVE_DIR: str = "/app/data/archive"
+    EVENT_ARCHIVE_FLUSH_ROWS: int = 50000
+    EVENT_ARCHIVE_FLUSH_SECONDS: float = 3600.0
+    # Live event feed (SSE). Fed by the event sync when EVENT_STORE_ENABLED is set,
+    # otherwise by one shared poller that only calls Verkada while someone listens.
+    LIVE_FEED_POLL_INTERVAL_SECONDS: float = 5.0
+    LIVE_FEED_OVERLAP_SECONDS: int = 30
+    LIVE_FEED_QUEUE_SIZE: int = 1000 # Events buffered per subscriber before it is dropped
+    LIVE_FEED_MAX_SUBSCRIBERS: int = 500
+    LIVE_FEED_HEARTBEAT_SECONDS: float = 15.0
+    # Aggregations over the local event store's hourly rollups (/api/v1/analytics).
+    ANALYTICS_MAX_GROUPS: int = 50000
+    # Comma-separated usernames allowed to use the /api/v1/admin endpoints. Empty: nobody
+    # (anyone can register an account, so being logged in is not enough).
+    ADMIN_USERNAMES: str = ""
+    # Historical backfill into the local event store (app.cli backfill, /api/v1/admin/backfill).
+    BACKFILL_WINDOW_SECONDS: int = 86400 # Checkpoint granularity
+    BACKFILL_CONCURRENCY: int = 4 # Windows fetched at once; requests still go through the shared rate limiter
+    # Verkada access event webhooks (/api/v1/webhooks/verkada). Requires EVENT_STORE_ENABLED;
+    # disabled while WEBHOOK_SECRET is empty. The periodic sync keeps running as a safety net,
+    # so EVENT_SYNC_INTERVAL_SECONDS can be raised to save API quota.
+    WEBHOOK_SECRET: str = ""
+    WEBHOOK_SIGNATURE_TOLERANCE_SECONDS: float = 300.0
+    WEBHOOK_QUEUE_SIZE: int = 50000 # Events buffered before the endpoint answers 503
+    WEBHOOK_FLUSH_ROWS: int = 500 # Events stored per transaction at most
+    WEBHOOK_FLUSH_SECONDS: float = 1.0 # Longest an event waits in the queue before being stored
     # Add other settings here as needed
 
     class Config:
@@ -40,7 +112,10 @@ try:
     
     # We can pass the API key directly, or let VerkadaAuthenticator pick it up from os.getenv
     # Passing it directly makes the dependency clearer.
-    verkada_auth_client = VerkadaAuthenticator(api_key=settings.VERKADA_API_KEY)
+    verkada_auth_client = VerkadaAuthenticator(
+        api_key=settings.VERKADA_API_KEY,
+        token_url=f"{settings.VERKADA_API_BASE_URL.rstrip('/')}/token",
+    )
 
 except ApiKeyNotFoundError as e:
     print(f"CRITICAL ERROR: Could not initialize VerkadaAuthenticator: {e}")
@@ -49,9 +124,32 @@ except ApiKeyNotFoundError as e:
     verkada_auth_client = None # type: ignore 
     # Set to None to indicate failure, or re-raise to stop app
 
+# Global async Verkada API client sharing one keep-alive connection pool.
+# Closed on application shutdown (see app.main).
+verkada_api_client: VerkadaApiClient | None = None
+if verkada_auth_client:
+    verkada_api_client = VerkadaApiClient(
+        authenticator=verkada_auth_client,
+        base_url=settings.VERKADA_API_BASE_URL,
+        max_connections=settings.VERKADA_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.VERKADA_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.VERKADA_HTTP_KEEPALIVE_EXPIRY_SECONDS,
+        timeout=settings.VERKADA_HTTP_TIMEOUT_SECONDS,
+        connect_timeout=settings.VERKADA_HTTP_CONNECT_TIMEOUT_SECONDS,
+        rate_limiter=RateLimitScheduler(
+            rate=settings.VERKADA_RATE_LIMIT_PER_SECOND,
+            burst=settings.VERKADA_RATE_LIMIT_BURST,
+        ),
+        max_rate_limit_retries=settings.VERKADA_RATE_LIMIT_MAX_RETRIES,
+    )
+
 # To use the authenticator in other modules:
 # from ..core.config import verkada_auth_client
 # if verkada_auth_client:
 #     headers = verkada_auth_client.get_auth_headers()
 # else:
-#     # Handle case where authenticator failed to initialize
\ No newline at end of file
+#     # Handle case where authenticator failed to initialize
+#
+# Async code (endpoints, services) should go through the shared client instead:
+# from ..core.config import verkada_api_client
+# page = await verkada_api_client.get_access_events(params)
\ No newline at end of file
@@ -1,23 +1,25 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import JWTError
 
-from ..db.session import get_db
+from ..db.session import get_async_db
 from ..models import user as user_schemas
 from ..services import user_service
 from ..core import security
+from ..core.config import get_settings
 from ..db import models as db_models # Import db_models
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login/token") # Adjusted tokenUrl
 
 async def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+    db: AsyncSession = Depends(get_async_db), token: str = Depends(oauth2_scheme)
 ) -> db_models.User:
     """
     Dependency to get the current user from a JWT token.
     - Decodes the token.
-    - Retrieves the user from the database based on the username in the token.
+    - Retrieves the user based on the username in the token, from the principal
+      cache when possible (the session from get_async_db only connects on a cache miss).
     - Raises HTTPException if the token is invalid or the user is not found.
     """
     credentials_exception = HTTPException(
@@ -47,7 +49,7 @@ async def get_current_user(
     if token_data.username is None: # This should ideally not happen given the logic above
         raise credentials_exception
 
-    user = user_service.get_user_by_username(db, username=token_data.username)
+    user = await user_service.get_principal(db, username=token_data.username)
     if user is None:
         raise credentials_exception
     return user
@@ -62,4 +64,30 @@ async def get_current_active_user(
     """
     # if not current_user.is_active: # Example for future active check
     #     raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
\ No newline at end of file
+    return current_user
+
+async def get_current_admin_user(
+    current_user: db_models.User = Depends(get_current_active_user)
+) -> db_models.User:
+    """
+    Dependency to get the current user if it is an administrator (listed in
+    ADMIN_USERNAMES). Raises a 403 otherwise, since accounts are self-registered.
+    """
+    admin_usernames = {name.strip() for name in get_settings().ADMIN_USERNAMES.split(",") if name.strip()}
+    if current_user.username not in admin_usernames:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This endpoint requires an administrator (see ADMIN_USERNAMES)."
+        )
+    return current_user
+
+def require_event_store() -> None:
+    """
+    Dependency raising a 503 for endpoints that are answered from the local
+    event store (and its rollups and indexes) when EVENT_STORE_ENABLED is not set.
+    """
+    if not get_settings().EVENT_STORE_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="This endpoint is answered from the local event store. Set EVENT_STORE_ENABLED to enable it."
+        )
@@ -0,0 +1,256 @@
+"""
+Compact columnar representation of access event batches.
+Provides EventBatch, which stores events as NumPy columns with dictionary-encoded
+strings, and EventRow, a lightweight view of a single event in a batch.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+# Code used for missing (None) values in dictionary-encoded columns.
+NULL_CODE = -1
+
+
+def to_epoch_seconds(value: Any) -> int:
+    """
+    Converts a raw Verkada timestamp (Unix seconds, ISO 8601 string or datetime)
+    to Unix seconds. Naive values are assumed to be in UTC. Shared by the batch
+    builder and the event store.
+
+    Raises:
+        TypeError, ValueError: If the value is not a recognised timestamp.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    parsed = value if isinstance(value, datetime) else datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+class StringDictionary:
+    """
+    Interns strings to small integer codes so repeated values (door names,
+    user names, event types) are stored once per batch instead of once per event.
+    """
+    __slots__ = ("_codes", "values")
+
+    def __init__(self):
+        self._codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def encode(self, value: Optional[str]) -> int:
+        """Returns the code for value, adding it to the dictionary if needed."""
+        if value is None:
+            return NULL_CODE
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def code_of(self, value: Optional[str]) -> Optional[int]:
+        """Returns the code for value without adding it, or None if it is unknown."""
+        if value is None:
+            return NULL_CODE
+        return self._codes.get(value)
+
+    def decode(self, code: int) -> Optional[str]:
+        """Returns the string for a code (None for NULL_CODE)."""
+        return None if code == NULL_CODE else self.values[code]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class EventRow:
+    """
+    Read-only view of one event in an EventBatch. Holds only a reference to
+    the batch and an index, so iterating a batch does not copy its columns.
+    """
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: "EventBatch", index: int):
+        self._batch = batch
+        self._index = index
+
+    @property
+    def event_id(self) -> str:
+        return self._batch.event_ids[self._index]
+
+    @property
+    def epoch_seconds(self) -> int:
+        return int(self._batch.timestamps[self._index])
+
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.epoch_seconds, tz=timezone.utc)
+
+    @property
+    def event_type(self) -> Optional[str]:
+        return self._batch.event_types.decode(int(self._batch.event_type_codes[self._index]))
+
+    @property
+    def user_id(self) -> Optional[str]:
+        return self._batch.user_ids.decode(int(self._batch.user_id_codes[self._index]))
+
+    @property
+    def user_name(self) -> Optional[str]:
+        return self._batch.user_names.decode(int(self._batch.user_name_codes[self._index]))
+
+    @property
+    def door_name(self) -> Optional[str]:
+        return self._batch.door_names.decode(int(self._batch.door_name_codes[self._index]))
+
+    @property
+    def device_id(self) -> Optional[str]:
+        return self._batch.device_ids.decode(int(self._batch.device_id_codes[self._index]))
+
+    @property
+    def site_id(self) -> Optional[str]:
+        return self._batch.site_ids.decode(int(self._batch.site_id_codes[self._index]))
+
+    def __repr__(self):
+        return f"<EventRow(event_id='{self.event_id}', event_type='{self.event_type}', timestamp={self.epoch_seconds})>"
+
+
+class EventBatch:
+    """
+    Columnar batch of access events.
+
+    Timestamps are an int64 array of Unix seconds; event type, user, door,
+    device and site columns are int32 code arrays into StringDictionary instances shared by
+    all batches derived from the same source. A 30-day pull of a busy site
+    therefore costs a few bytes per event plus one copy of each distinct
+    string, instead of a full Pydantic object per event.
+    """
+    __slots__ = (
+        "event_ids", "timestamps",
+        "event_type_codes", "user_id_codes", "user_name_codes", "door_name_codes",
+        "device_id_codes", "site_id_codes",
+        "event_types", "user_ids", "user_names", "door_names", "device_ids", "site_ids",
+    )
+
+    def __init__(
+        self,
+        event_ids: np.ndarray,
+        timestamps: np.ndarray,
+        event_type_codes: np.ndarray,
+        user_id_codes: np.ndarray,
+        user_name_codes: np.ndarray,
+        door_name_codes: np.ndarray,
+        device_id_codes: np.ndarray,
+        site_id_codes: np.ndarray,
+        event_types: StringDictionary,
+        user_ids: StringDictionary,
+        user_names: StringDictionary,
+        door_names: StringDictionary,
+        device_ids: StringDictionary,
+        site_ids: StringDictionary,
+    ):
+        self.event_ids = event_ids
+        self.timestamps = timestamps
+        self.event_type_codes = event_type_codes
+        self.user_id_codes = user_id_codes
+        self.user_name_codes = user_name_codes
+        self.door_name_codes = door_name_codes
+        self.device_id_codes = device_id_codes
+        self.site_id_codes = site_id_codes
+        self.event_types = event_types
+        self.user_ids = user_ids
+        self.user_names = user_names
+        self.door_names = door_names
+        self.device_ids = device_ids
+        self.site_ids = site_ids
+
+    @classmethod
+    def from_raw_events(cls, raw_events: Iterable[Dict[str, Any]]) -> "EventBatch":
+        """
+        Builds a batch directly from raw Verkada event dictionaries (as returned
+        by the events API), skipping events without an id, type or valid timestamp.
+        """
+        builder = EventBatchBuilder()
+        builder.add_raw_events(raw_events)
+        return builder.build()
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __getitem__(self, index: int) -> EventRow:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("EventBatch index out of range")
+        return EventRow(self, index)
+
+    def __iter__(self) -> Iterator[EventRow]:
+        return (EventRow(self, index) for index in range(len(self)))
+
+
+class EventBatchBuilder:
+    """
+    Accumulates raw Verkada events page by page and builds one EventBatch
+    whose string columns share a single set of dictionaries.
+    """
+
+    def __init__(self):
+        self._event_ids: List[str] = []
+        self._timestamps: List[int] = []
+        self._event_type_codes: List[int] = []
+        self._user_id_codes: List[int] = []
+        self._user_name_codes: List[int] = []
+        self._door_name_codes: List[int] = []
+        self._device_id_codes: List[int] = []
+        self._site_id_codes: List[int] = []
+        self._event_types = StringDictionary()
+        self._user_ids = StringDictionary()
+        self._user_names = StringDictionary()
+        self._door_names = StringDictionary()
+        self._device_ids = StringDictionary()
+        self._site_ids = StringDictionary()
+
+    def add_raw_events(self, raw_events: Iterable[Dict[str, Any]]) -> None:
+        """
+        Appends raw Verkada event dictionaries, skipping events without an id,
+        type or valid timestamp.
+        """
+        for event_data_item in raw_events:
+            event_id = event_data_item.get("eventId", event_data_item.get("event_id"))
+            event_type = event_data_item.get("eventType", event_data_item.get("event_type"))
+            raw_timestamp = event_data_item.get("timestamp")
+            if event_id is None or event_type is None or raw_timestamp is None:
+                continue
+            try:
+                timestamp = to_epoch_seconds(raw_timestamp)
+            except (TypeError, ValueError):
+                continue
+            self._event_ids.append(str(event_id))
+            self._timestamps.append(timestamp)
+            self._event_type_codes.append(self._event_types.encode(event_type))
+            self._user_id_codes.append(self._user_ids.encode(event_data_item.get("userId", event_data_item.get("user_id"))))
+            self._user_name_codes.append(self._user_names.encode(event_data_item.get("userName", event_data_item.get("user_name"))))
+            self._door_name_codes.append(self._door_names.encode(event_data_item.get("doorName", event_data_item.get("door_name"))))
+            self._device_id_codes.append(self._device_ids.encode(event_data_item.get("deviceId", event_data_item.get("device_id"))))
+            self._site_id_codes.append(self._site_ids.encode(event_data_item.get("siteId", event_data_item.get("site_id"))))
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    def build(self) -> EventBatch:
+        """Returns the accumulated events as an EventBatch."""
+        event_ids = np.empty(len(self._event_ids), dtype=object)
+        event_ids[:] = self._event_ids
+        return EventBatch(
+            event_ids,
+            np.array(self._timestamps, dtype=np.int64),
+            np.array(self._event_type_codes, dtype=np.int32),
+            np.array(self._user_id_codes, dtype=np.int32),
+            np.array(self._user_name_codes, dtype=np.int32),
+            np.array(self._door_name_codes, dtype=np.int32),
+            np.array(self._device_id_codes, dtype=np.int32),
+            np.array(self._site_id_codes, dtype=np.int32),
+            self._event_types, self._user_ids, self._user_names, self._door_names,
+            self._device_ids, self._site_ids,
+        )
@@ -0,0 +1,182 @@
+"""
+Prometheus metrics for the dashboard backend.
+Defines the application's metrics and exposes them in the Prometheus text
+format through render_metrics() (served on /metrics by app.main).
+"""
+import asyncio
+import time
+from typing import Dict, Iterator, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    GCCollector,
+    Histogram,
+    PlatformCollector,
+    ProcessCollector,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+from .cache import TTLLRUCache
+
+# Reason: A dedicated registry (instead of prometheus_client's global one) keeps
+# re-imports of this module, e.g. under both "app." and "backend.app." in tests,
+# from failing on duplicate metric names.
+registry = CollectorRegistry()
+ProcessCollector(registry=registry)
+PlatformCollector(registry=registry)
+GCCollector(registry=registry)
+
+# Buckets in seconds, from fast cache hits to multi-page upstream fetches.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "dashboard_http_request_duration_seconds",
+    "Latency of dashboard API requests, by route template.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+    registry=registry,
+)
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "verkada_api_request_duration_seconds",
+    "Latency of individual Verkada API calls (one attempt each).",
+    ["endpoint", "status"],
+    buckets=LATENCY_BUCKETS,
+    registry=registry,
+)
+PEAK_TIMES_PAGES = Histogram(
+    "peak_times_pages_fetched",
+    "Verkada event pages fetched per /peak-times request answered from the API.",
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200),
+    registry=registry,
+)
+FETCH_TRUNCATIONS = Counter(
+    "verkada_fetch_truncations",
+    "Bulk event fetches stopped by the max_pages cap while more events were available.",
+    ["mode"],
+    registry=registry,
+)
+TOKEN_REFRESHES = Counter(
+    "verkada_token_refreshes",
+    "Verkada API tokens fetched from the token endpoint.",
+    ["outcome"],
+    registry=registry,
+)
+PASSWORD_HASH_REJECTIONS = Counter(
+    "password_hash_rejections",
+    "Logins/registrations rejected with 503 because the password hashing pool was saturated.",
+    registry=registry,
+)
+LIVE_FEED_SUBSCRIBERS = Gauge(
+    "live_feed_subscribers",
+    "Clients currently connected to the live event feed.",
+    registry=registry,
+)
+LIVE_FEED_EVENTS = Counter(
+    "live_feed_events_published",
+    "Events published to the live event feed (before per-subscriber filtering).",
+    registry=registry,
+)
+LIVE_FEED_DROPPED_SUBSCRIBERS = Counter(
+    "live_feed_dropped_subscribers",
+    "Live feed clients disconnected because they fell too far behind.",
+    registry=registry,
+)
+BACKFILL_EVENTS = Counter(
+    "backfill_events_fetched",
+    "Events fetched from Verkada by historical backfills.",
+    registry=registry,
+)
+WEBHOOK_EVENTS = Counter(
+    "webhook_events",
+    "Access events received through the Verkada webhook, by outcome (queued, rejected, stored).",
+    ["outcome"],
+    registry=registry,
+)
+WEBHOOK_QUEUE_DEPTH = Gauge(
+    "webhook_queue_depth",
+    "Webhook events waiting to be stored in the local event store.",
+    registry=registry,
+)
+EVENT_INGEST = Counter(
+    "event_ingest_events",
+    "Events passed to the local event store, by outcome (new, duplicate_memory: rejected "
+    "by the in-memory event_id filter, duplicate_store: found already stored).",
+    ["outcome"],
+    registry=registry,
+)
+EVENT_ID_FILTER_FALSE_POSITIVES = Counter(
+    "event_id_filter_false_positives",
+    "New events the event_id Bloom filter reported as possibly stored, costing a lookup.",
+    registry=registry,
+)
+EVENT_LOOP_LAG = Gauge(
+    "event_loop_lag_seconds",
+    "How late the most recent event loop lag probe woke up.",
+    registry=registry,
+)
+EVENT_LOOP_LAG_HISTOGRAM = Histogram(
+    "event_loop_lag_probe_seconds",
+    "Distribution of event loop lag probe delays.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+    registry=registry,
+)
+
+
+class CacheCollector(Collector):
+    """
+    Reports the counters of registered TTLLRUCache instances at scrape time,
+    so the caches themselves stay free of metrics code.
+    """
+
+    def __init__(self):
+        self._caches: Dict[str, TTLLRUCache] = {}
+
+    def register(self, name: str, cache: TTLLRUCache) -> None:
+        self._caches[name] = cache
+
+    def collect(self) -> Iterator:
+        lookups = CounterMetricFamily("cache_lookups", "Cache lookups by result.", labels=["cache", "result"])
+        evictions = CounterMetricFamily("cache_evictions", "Entries evicted by the LRU bound.", labels=["cache"])
+        size = GaugeMetricFamily("cache_entries", "Entries currently cached.", labels=["cache"])
+        hit_ratio = GaugeMetricFamily("cache_hit_ratio", "Hits divided by lookups since startup.", labels=["cache"])
+        for name, cache in self._caches.items():
+            stats = cache.stats()
+            lookups.add_metric([name, "hit"], stats["hits"])
+            lookups.add_metric([name, "miss"], stats["misses"])
+            evictions.add_metric([name], stats["evictions"])
+            size.add_metric([name], stats["size"])
+            hit_ratio.add_metric([name], stats["hit_ratio"])
+        yield from (lookups, evictions, size, hit_ratio)
+
+
+cache_collector = CacheCollector()
+registry.register(cache_collector)
+
+
+def register_cache(name: str, cache: TTLLRUCache) -> None:
+    """Reports the given cache's hit/miss/eviction counters on /metrics."""
+    cache_collector.register(name, cache)
+
+
+async def monitor_event_loop_lag(interval_seconds: float = 0.5) -> None:
+    """
+    Measures event loop lag forever: sleeps for interval_seconds and records how
+    much later than requested it woke up. Lag means something is blocking the loop.
+    Intended to run as a background task started at application startup.
+    """
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval_seconds)
+        lag = max(0.0, time.perf_counter() - started - interval_seconds)
+        EVENT_LOOP_LAG.set(lag)
+        EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Returns the current metrics in the Prometheus text format and its content type."""
+    return generate_latest(registry), CONTENT_TYPE_LATEST
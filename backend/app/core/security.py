@@ -1,11 +1,22 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Any, Callable, Optional, Tuple
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
+from . import metrics
+from .config import get_settings
+
 # Password Hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes made with fewer rounds than PASSWORD_BCRYPT_ROUNDS are reported by
+# needs_update() and transparently re-hashed on the next successful login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=get_settings().PASSWORD_BCRYPT_ROUNDS,
+)
 
 # JWT Configuration
 # IMPORTANT: This is a placeholder secret key.
@@ -40,6 +51,91 @@ def get_password_hash(password: str) -> str:
     """
     return pwd_context.hash(password)
 
+class PasswordHashingOverloadedError(Exception):
+    """Raised when too many password hashing operations are already pending."""
+    def __init__(self, message="Too many concurrent password hashing requests."):
+        self.message = message
+        super().__init__(self.message)
+
+class PasswordHashingPool:
+    """
+    Runs bcrypt work in a small thread pool so it never blocks the event loop.
+
+    bcrypt releases the GIL, so hashes run in parallel on up to max_workers
+    cores. At most max_pending operations may be running or queued; beyond
+    that, run() fails fast with PasswordHashingOverloadedError instead of
+    letting a login burst build an unbounded backlog.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 32):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._max_pending = max_pending
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of operations running or queued."""
+        return self._pending
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Runs func(*args) in the pool and returns its result.
+
+        Raises:
+            PasswordHashingOverloadedError: If max_pending operations are already pending.
+        """
+        if self._pending >= self._max_pending:
+            metrics.PASSWORD_HASH_REJECTIONS.inc()
+            raise PasswordHashingOverloadedError()
+        self._pending += 1
+        future = asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        # Reason: Count the slot as busy until the thread finishes, even if the request is cancelled.
+        future.add_done_callback(self._release)
+        return await asyncio.shield(future)
+
+    def _release(self, _future: asyncio.Future) -> None:
+        self._pending -= 1
+
+password_hashing_pool = PasswordHashingPool(
+    max_workers=get_settings().PASSWORD_HASH_WORKERS,
+    max_pending=get_settings().PASSWORD_HASH_MAX_PENDING,
+)
+
+def _verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verifies a password and, if its hash uses outdated settings, re-hashes it."""
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False, None
+    if pwd_context.needs_update(hashed_password):
+        return True, pwd_context.hash(plain_password)
+    return True, None
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verifies a password in the password hashing pool.
+
+    Args:
+        plain_password: The plain text password.
+        hashed_password: The hashed password from the database.
+
+    Returns:
+        A tuple of (verified, new_hash). new_hash is set when the password is
+        correct but the stored hash should be replaced (e.g. fewer bcrypt rounds
+        than configured), otherwise None.
+
+    Raises:
+        PasswordHashingOverloadedError: If the pool is saturated.
+    """
+    return await password_hashing_pool.run(_verify_and_update, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    """
+    Hashes a plain password in the password hashing pool.
+
+    Raises:
+        PasswordHashingOverloadedError: If the pool is saturated.
+    """
+    return await password_hashing_pool.run(pwd_context.hash, password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Creates a new JWT access token.
@@ -2,13 +2,21 @@
 Core module for Verkada API authentication.
 Provides the VerkadaAuthenticator class to manage API keys and tokens.
 """
+import asyncio
+import logging
 import os
+import threading
+import time
+import httpx
 import requests
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from dotenv import load_dotenv
 
 from .exceptions import ApiKeyNotFoundError, TokenGenerationError
+from .. import metrics
+
+logger = logging.getLogger(__name__)
 
 # Load environment variables from .env file
 load_dotenv()
@@ -17,6 +25,11 @@ VERKADA_TOKEN_API_URL = "https://api.verkada.com/token"
 TOKEN_VALIDITY_MINUTES = 30
 # Using a slightly shorter duration for safety margin before actual expiry
 TOKEN_CACHE_DURATION_MINUTES = TOKEN_VALIDITY_MINUTES - 1
+# Tokens this close to the end of their cache duration are refreshed in the background
+# while the current token keeps being served.
+TOKEN_REFRESH_AHEAD_MINUTES = 5
+# After a background refresh fails, requests wait this long before starting another one.
+TOKEN_REFRESH_RETRY_SECONDS = 30
 
 class VerkadaAuthenticator:
     """
@@ -24,9 +37,20 @@ class VerkadaAuthenticator:
 
     Manages the Verkada API key and fetches short-lived API tokens,
     caching them for a predefined duration.
+
+    Token refresh is single-flight: concurrent callers that find the cache
+    empty or expired share one token request (a lock for threads, a shared
+    task for coroutines). The async path also refreshes proactively in the
+    background shortly before the cached token expires, so no request has
+    to wait for the token endpoint in the steady state. There is no timer:
+    the background refresh is started by the first request that finds the
+    token close to expiry, so an idle client refreshes on its next request.
+    A failed background refresh is retried no sooner than
+    TOKEN_REFRESH_RETRY_SECONDS later; until then requests keep using the
+    still-valid token instead of each starting a new refresh.
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, token_url: Optional[str] = None):
         """
         Initializes the VerkadaAuthenticator.
 
@@ -34,6 +58,9 @@ class VerkadaAuthenticator:
             api_key (str, optional): The Verkada API key. If not provided,
                                      it attempts to load 'VERKADA_API_KEY'
                                      from environment variables.
+            token_url (str, optional): The token endpoint. Defaults to the
+                                       public Verkada API; override it to point
+                                       at a regional or local stub API.
 
         Raises:
             ApiKeyNotFoundError: If the API key is not provided and cannot be
@@ -52,9 +79,12 @@ class VerkadaAuthenticator:
 
         self._api_token: str | None = None
         self._token_expiry_time: datetime | None = None
-        # Reason: Store the API URL as an instance variable for potential future flexibility,
-        # though it's currently a constant.
-        self._token_url: str = VERKADA_TOKEN_API_URL
+        self._token_url: str = token_url or VERKADA_TOKEN_API_URL
+        # Reason: Serializes sync refreshes and guards creation of the async refresh task.
+        self._lock = threading.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        # time.monotonic() before which no background refresh is started (set after a failure).
+        self._background_refresh_not_before: float = 0.0
 
     def _fetch_new_token(self) -> str:
         """
@@ -72,9 +102,12 @@ class VerkadaAuthenticator:
             "x-api-key": self._api_key
         }
 
+        started = time.perf_counter()
+        status_label = "error"
         try:
             # Reason: Making the actual API call to Verkada.
             response = requests.post(self._token_url, headers=headers, timeout=10) # 10 second timeout
+            status_label = str(response.status_code)
             response.raise_for_status()  # Raises HTTPError for bad responses (4XX or 5XX)
         except requests.exceptions.HTTPError as http_err:
             # Reason: Specific handling for HTTP errors from the API.
@@ -88,7 +121,24 @@ class VerkadaAuthenticator:
             raise TokenGenerationError(
                 message=f"Request exception occurred while fetching token: {req_err}"
             ) from req_err
+        finally:
+            self._record_token_request(started, status_label)
+
+        return self._store_token_response(response)
 
+    def _store_token_response(self, response) -> str:
+        """
+        Extracts the API token from a token endpoint response and caches it.
+
+        Args:
+            response: A successful response (requests or httpx) from the token endpoint.
+
+        Returns:
+            str: The newly fetched API token.
+
+        Raises:
+            TokenGenerationError: If the response does not contain a token.
+        """
         try:
             token_data = response.json()
             new_token = token_data.get("token") # Changed "apiToken" to "token" to match actual response
@@ -116,6 +166,83 @@ class VerkadaAuthenticator:
         assert self._api_token is not None, "API token should be a string after successful fetch."
         return self._api_token
 
+    async def _async_fetch_new_token(self, http_client: httpx.AsyncClient) -> str:
+        """
+        Fetches a new API token without blocking the event loop.
+
+        Args:
+            http_client (httpx.AsyncClient): Shared client whose connection pool is used.
+
+        Returns:
+            str: The newly fetched API token.
+
+        Raises:
+            TokenGenerationError: If the token generation fails due to network
+                                  issues or an error response from the API.
+        """
+        headers = {
+            "accept": "application/json",
+            "x-api-key": self._api_key
+        }
+
+        started = time.perf_counter()
+        status_label = "error"
+        try:
+            response = await http_client.post(self._token_url, headers=headers, timeout=10)
+            status_label = str(response.status_code)
+            response.raise_for_status()
+        except httpx.HTTPStatusError as http_err:
+            raise TokenGenerationError(
+                message=f"HTTP error occurred while fetching token: {http_err.response.status_code}",
+                status_code=http_err.response.status_code,
+                details=http_err.response.text
+            ) from http_err
+        except httpx.RequestError as req_err:
+            raise TokenGenerationError(
+                message=f"Request exception occurred while fetching token: {req_err}"
+            ) from req_err
+        finally:
+            self._record_token_request(started, status_label)
+
+        return self._store_token_response(response)
+
+    @staticmethod
+    def _record_token_request(started: float, status_label: str) -> None:
+        """Records the latency and outcome of a token endpoint call."""
+        metrics.UPSTREAM_REQUEST_DURATION.labels(endpoint="token", status=status_label).observe(
+            time.perf_counter() - started
+        )
+        outcome = "success" if status_label.startswith("2") else "failure"
+        metrics.TOKEN_REFRESHES.labels(outcome=outcome).inc()
+
+    def _get_cached_token(self) -> Optional[str]:
+        """Returns the cached API token if it has not expired, otherwise None."""
+        current_time = datetime.now(timezone.utc)
+        if self._api_token and self._token_expiry_time and self._token_expiry_time > current_time:
+            return self._api_token
+        return None
+
+    def _needs_proactive_refresh(self) -> bool:
+        """Returns True if the cached token is still valid but close to expiring."""
+        if not self._token_expiry_time:
+            return False
+        refresh_at = self._token_expiry_time - timedelta(minutes=TOKEN_REFRESH_AHEAD_MINUTES)
+        return datetime.now(timezone.utc) >= refresh_at
+
+    def invalidate_token(self, api_token: Optional[str] = None) -> None:
+        """
+        Drops the cached token so the next call fetches a new one.
+
+        Args:
+            api_token (str, optional): Only invalidate if this is still the cached token.
+                                       Prevents a stale 401 from discarding a token
+                                       that another request already refreshed.
+        """
+        with self._lock:
+            if api_token is None or api_token == self._api_token:
+                self._api_token = None
+                self._token_expiry_time = None
+
     def get_api_token(self) -> str:
         """
         Retrieves a valid Verkada API token.
@@ -134,13 +261,76 @@ class VerkadaAuthenticator:
         if not self._api_key:
             raise ApiKeyNotFoundError("Authenticator not properly initialized with an API key.")
 
-        current_time = datetime.now(timezone.utc)
         # Reason: Check if cached token is still valid to avoid unnecessary API calls.
-        if self._api_token and self._token_expiry_time and self._token_expiry_time > current_time:
-            return self._api_token
+        cached_token = self._get_cached_token()
+        if cached_token:
+            return cached_token
 
         # Reason: Cached token is invalid or expired, fetch a new one.
-        return self._fetch_new_token()
+        with self._lock:
+            # Reason: Another thread may have refreshed the token while we waited for the lock.
+            cached_token = self._get_cached_token()
+            if cached_token:
+                return cached_token
+            return self._fetch_new_token()
+
+    async def async_get_api_token(self, http_client: httpx.AsyncClient) -> str:
+        """
+        Async counterpart of get_api_token.
+
+        Args:
+            http_client (httpx.AsyncClient): Shared client used if a new token is needed.
+
+        Returns:
+            str: A valid Verkada API token.
+
+        Raises:
+            TokenGenerationError: If fetching a new token fails.
+            ApiKeyNotFoundError: If the API key was not properly initialized.
+        """
+        if not self._api_key:
+            raise ApiKeyNotFoundError("Authenticator not properly initialized with an API key.")
+
+        cached_token = self._get_cached_token()
+        if cached_token:
+            if self._needs_proactive_refresh() and time.monotonic() >= self._background_refresh_not_before:
+                # Reason: Serve the still-valid token now and refresh it off the request path.
+                self._get_refresh_task(http_client)
+            return cached_token
+
+        # Reason: shield() keeps the shared refresh alive if this particular caller is cancelled.
+        return await asyncio.shield(self._get_refresh_task(http_client))
+
+    def _get_refresh_task(self, http_client: httpx.AsyncClient) -> asyncio.Task:
+        """
+        Returns the in-flight token refresh task for the running loop, starting one if needed.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            task = self._refresh_task
+            if task is None or task.done() or task.get_loop() is not loop:
+                task = loop.create_task(self._refresh_token(http_client))
+                task.add_done_callback(self._on_refresh_done)
+                self._refresh_task = task
+            return task
+
+    async def _refresh_token(self, http_client: httpx.AsyncClient) -> str:
+        """
+        Body of the shared refresh task. A failure holds off background
+        refreshes for TOKEN_REFRESH_RETRY_SECONDS.
+        """
+        try:
+            return await self._async_fetch_new_token(http_client)
+        except Exception:
+            # Reason: Set before the task completes, so no request sees it failed without the backoff.
+            self._background_refresh_not_before = time.monotonic() + TOKEN_REFRESH_RETRY_SECONDS
+            raise
+
+    @staticmethod
+    def _on_refresh_done(task: asyncio.Task) -> None:
+        """Logs failures of refreshes nobody awaited (background refreshes)."""
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Verkada API token refresh failed: %s", task.exception())
 
     def get_auth_headers(self) -> dict:
         """
@@ -152,4 +342,17 @@ class VerkadaAuthenticator:
             dict: A dictionary containing the 'x-verkada-auth' header.
         """
         api_token = self.get_api_token()
+        return {"x-verkada-auth": api_token}
+
+    async def async_get_auth_headers(self, http_client: httpx.AsyncClient) -> dict:
+        """
+        Async counterpart of get_auth_headers.
+
+        Args:
+            http_client (httpx.AsyncClient): Shared client used if a new token is needed.
+
+        Returns:
+            dict: A dictionary containing the 'x-verkada-auth' header.
+        """
+        api_token = await self.async_get_api_token(http_client)
         return {"x-verkada-auth": api_token}
\ No newline at end of file
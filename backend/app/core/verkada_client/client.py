@@ -0,0 +1,390 @@
+"""
+Async HTTP client for the Verkada API.
+Provides the VerkadaApiClient class, which owns a shared keep-alive
+connection pool used for both token generation and API calls.
+"""
+import asyncio
+import contextlib
+import logging
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from .. import metrics
+from .authenticator import VerkadaAuthenticator
+from .rate_limiter import RateLimitScheduler, RequestPriority, parse_retry_after
+
+logger = logging.getLogger(__name__)
+
+ACCESS_EVENTS_API_PATH = "events/v1/access"
+MAX_ACCESS_EVENTS_PAGE_SIZE = 200
+
+
+def _first_error(error: BaseException) -> BaseException:
+    """Unwraps the (possibly nested) ExceptionGroup raised by a TaskGroup to the first underlying error."""
+    while isinstance(error, BaseExceptionGroup):
+        error = error.exceptions[0]
+    return error
+
+
+class VerkadaApiClient:
+    """
+    Non-blocking client for the Verkada API.
+
+    A single httpx.AsyncClient (and therefore a single connection pool) is
+    shared by every request made through this client, so TLS sessions and
+    TCP connections to api.verkada.com are reused across dashboard requests
+    instead of being re-established on every call.
+    """
+
+    def __init__(
+        self,
+        authenticator: VerkadaAuthenticator,
+        base_url: str = "https://api.verkada.com",
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 15.0,
+        connect_timeout: float = 5.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate_limiter: Optional[RateLimitScheduler] = None,
+        max_rate_limit_retries: int = 3,
+    ):
+        """
+        Initializes the VerkadaApiClient.
+
+        Args:
+            authenticator (VerkadaAuthenticator): Provides API tokens for requests.
+            base_url (str): Base URL of the Verkada API.
+            max_connections (int): Maximum number of concurrent connections in the pool.
+            max_keepalive_connections (int): Maximum number of idle connections kept alive.
+            keepalive_expiry (float): Seconds an idle connection is kept before being closed.
+            timeout (float): Read/write/pool timeout in seconds for each request.
+            connect_timeout (float): Timeout in seconds for establishing a connection.
+            transport (httpx.AsyncBaseTransport, optional): Custom transport, mainly
+                                                           useful for tests and local stubs.
+            rate_limiter (RateLimitScheduler, optional): Scheduler shared by all API calls.
+                                                         None disables client-side rate limiting.
+            max_rate_limit_retries (int): How often a 429 response is retried before it is raised.
+        """
+        self._authenticator = authenticator
+        self._base_url = base_url.rstrip('/')
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self._transport = transport
+        self._rate_limiter = rate_limiter
+        self._max_rate_limit_retries = max_rate_limit_retries
+        # Reason: The AsyncClient is created lazily so it is bound to the running event loop.
+        self._http: Optional[httpx.AsyncClient] = None
+
+    @property
+    def authenticator(self) -> VerkadaAuthenticator:
+        """The authenticator used to sign requests made by this client."""
+        return self._authenticator
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimitScheduler]:
+        """The scheduler pacing requests made by this client, if any."""
+        return self._rate_limiter
+
+    def _get_http(self) -> httpx.AsyncClient:
+        """Returns the shared httpx.AsyncClient, creating it on first use."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                limits=self._limits,
+                timeout=self._timeout,
+                transport=self._transport,
+            )
+        return self._http
+
+    def url_for(self, api_path: str) -> str:
+        """Builds an absolute Verkada API URL from a path such as 'events/v1/access'."""
+        return f"{self._base_url}/{api_path.lstrip('/')}"
+
+    async def get_auth_headers(self) -> Dict[str, str]:
+        """
+        Returns the Verkada authorization headers, fetching a token over the
+        shared connection pool if necessary.
+
+        Raises:
+            TokenGenerationError: If fetching a new token fails.
+        """
+        return await self._authenticator.async_get_auth_headers(self._get_http())
+
+    async def request(
+        self,
+        method: str,
+        api_path: str,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Sends an authenticated request to the Verkada API.
+        A 401 response is retried once with a freshly fetched token. A 429
+        response is retried up to max_rate_limit_retries times, after the
+        pause requested by its Retry-After header.
+
+        Args:
+            method (str): HTTP method.
+            api_path (str): API path relative to the base URL.
+            priority (RequestPriority): Scheduling class of the request.
+            **kwargs: Extra arguments passed to httpx.AsyncClient.request.
+
+        Returns:
+            httpx.Response: The response, after raise_for_status().
+
+        Raises:
+            TokenGenerationError: If an API token cannot be obtained.
+            httpx.HTTPStatusError: If the API returns a 4XX/5XX response, including
+                                   a 429 that is still returned after all retries.
+            httpx.RequestError: On network errors and timeouts.
+        """
+        extra_headers = dict(kwargs.pop("headers", None) or {})
+        url = self.url_for(api_path)
+        auth_retried = False
+        rate_limit_retries = 0
+        while True:
+            if self._rate_limiter:
+                await self._rate_limiter.acquire(priority)
+            auth_headers = await self.get_auth_headers()
+            started = time.perf_counter()
+            try:
+                response = await self._get_http().request(
+                    method, url, headers={**extra_headers, **auth_headers}, **kwargs
+                )
+            except httpx.RequestError:
+                metrics.UPSTREAM_REQUEST_DURATION.labels(endpoint=api_path, status="error").observe(
+                    time.perf_counter() - started
+                )
+                raise
+            metrics.UPSTREAM_REQUEST_DURATION.labels(endpoint=api_path, status=str(response.status_code)).observe(
+                time.perf_counter() - started
+            )
+            if response.status_code == 401 and not auth_retried:
+                # Reason: The token was revoked or expired early; retry once with a fresh one.
+                logger.info("Verkada API returned 401, retrying with a fresh token")
+                self._authenticator.invalidate_token(auth_headers.get("x-verkada-auth"))
+                auth_retried = True
+                continue
+            if response.status_code == 429:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if self._rate_limiter:
+                    self._rate_limiter.on_rate_limited(retry_after)
+                if rate_limit_retries < self._max_rate_limit_retries:
+                    rate_limit_retries += 1
+                    if not self._rate_limiter:
+                        await asyncio.sleep(retry_after if retry_after is not None else 2 ** rate_limit_retries)
+                    continue
+            elif self._rate_limiter and response.status_code < 500:
+                self._rate_limiter.on_success()
+            break
+        response.raise_for_status()
+        return response
+
+    async def get_access_events(
+        self,
+        params: Dict[str, Any],
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+    ) -> Dict[str, Any]:
+        """
+        Fetches a single page of access events.
+
+        Args:
+            params (dict): Query parameters for the events API (start_time, end_time,
+                           page_token, page_size, filters).
+            priority (RequestPriority): Scheduling class of the request.
+
+        Returns:
+            dict: The decoded JSON response, e.g. {"events": [...], "nextPageToken": ...}.
+
+        Raises:
+            ValueError: If the response body is not valid JSON.
+        """
+        response = await self.request("GET", ACCESS_EVENTS_API_PATH, priority=priority, params=params)
+        return response.json()
+
+    async def iter_access_event_pages(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        params: Optional[Dict[str, Any]] = None,
+        page_size: int = MAX_ACCESS_EVENTS_PAGE_SIZE,
+        max_pages: Optional[int] = None,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Iterates over pages of raw access events in a time range, following nextPageToken.
+
+        Args:
+            start_time (datetime): Start of the time range.
+            end_time (datetime): End of the time range.
+            params (dict, optional): Extra query parameters (filters).
+            page_size (int): Number of events requested per page.
+            max_pages (int, optional): Stop after this many pages. None means no limit.
+            priority (RequestPriority): Scheduling class of the requests.
+
+        Yields:
+            list: The raw event dictionaries of each page.
+        """
+        query_params: Dict[str, Any] = {
+            "start_time": int(start_time.timestamp()),
+            "end_time": int(end_time.timestamp()),
+            "page_size": page_size,
+        }
+        if params:
+            query_params.update(params)
+
+        page_count = 0
+        while max_pages is None or page_count < max_pages:
+            page_count += 1
+            response_data = await self.get_access_events(query_params, priority)
+            raw_events = response_data.get("events", [])
+            yield raw_events if isinstance(raw_events, list) else []
+
+            next_page_token = response_data.get("nextPageToken")
+            if not next_page_token:
+                break
+            query_params["page_token"] = next_page_token
+        else:
+            # Reason: The loop ran out of pages while the API still had more to return.
+            logger.warning("Access event fetch truncated at max_pages=%s", max_pages)
+            metrics.FETCH_TRUNCATIONS.labels(mode="sequential").inc()
+
+    async def iter_access_event_pages_sharded(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        params: Optional[Dict[str, Any]] = None,
+        concurrency: int = 4,
+        min_window_seconds: int = 900,
+        page_size: int = MAX_ACCESS_EVENTS_PAGE_SIZE,
+        max_pages: Optional[int] = None,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Iterates over pages of raw access events in [start_time, end_time),
+        fetching sub-windows of the range concurrently.
+
+        The range starts as `concurrency` equal windows. A window whose first page
+        is not its last (i.e. a dense window) is bisected and both halves are
+        fetched concurrently, so busy periods end up split finer than quiet ones.
+        The first page of a bisected window is not yielded, since its halves cover
+        the same events. Windows no larger than min_window_seconds are paged
+        sequentially instead.
+
+        Pages are yielded as they arrive, in no particular order. At most
+        2 * concurrency fetched pages are buffered, so a slow consumer slows the
+        fetching down instead of growing memory.
+
+        Args:
+            start_time (datetime): Start of the time range.
+            end_time (datetime): End of the time range (exclusive).
+            params (dict, optional): Extra query parameters (filters).
+            concurrency (int): Maximum number of requests in flight at once.
+            min_window_seconds (int): Windows this small are paged instead of split.
+            page_size (int): Number of events requested per page.
+            max_pages (int, optional): Total request budget. None means no limit.
+            priority (RequestPriority): Scheduling class of the requests.
+
+        Yields:
+            list: The raw event dictionaries of each page.
+        """
+        concurrency = max(1, concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        pages: asyncio.Queue = asyncio.Queue(maxsize=2 * concurrency)
+        done = object()
+        budget = {"remaining": max_pages, "truncated": False}
+
+        def budget_allows(requests: int) -> bool:
+            return budget["remaining"] is None or budget["remaining"] >= requests
+
+        def take_budget() -> bool:
+            # Reason: The budget is shared by all windows; asyncio is single-threaded so no lock is needed.
+            if not budget_allows(1):
+                return False
+            if budget["remaining"] is not None:
+                budget["remaining"] -= 1
+            return True
+
+        async def fetch_page(window_start: int, window_end: int, page_token: Optional[str]) -> Dict[str, Any]:
+            query_params: Dict[str, Any] = {
+                "start_time": window_start,
+                "end_time": window_end,
+                "page_size": page_size,
+            }
+            if params:
+                query_params.update(params)
+            if page_token:
+                query_params["page_token"] = page_token
+            async with semaphore:
+                return await self.get_access_events(query_params, priority)
+
+        async def fetch_window(window_start: int, window_end: int) -> None:
+            if not take_budget():
+                budget["truncated"] = True
+                return
+            response_data = await fetch_page(window_start, window_end, None)
+            next_page_token = response_data.get("nextPageToken")
+
+            if next_page_token and window_end - window_start > min_window_seconds and budget_allows(2):
+                middle = window_start + (window_end - window_start) // 2
+                # Reason: A TaskGroup cancels the other half if one half fails.
+                async with asyncio.TaskGroup() as group:
+                    group.create_task(fetch_window(window_start, middle))
+                    group.create_task(fetch_window(middle, window_end))
+                return
+
+            await pages.put(list(response_data.get("events") or []))
+            while next_page_token and take_budget():
+                response_data = await fetch_page(window_start, window_end, next_page_token)
+                await pages.put(list(response_data.get("events") or []))
+                next_page_token = response_data.get("nextPageToken")
+            if next_page_token:
+                budget["truncated"] = True
+
+        async def fetch_all_windows() -> None:
+            range_start = int(start_time.timestamp())
+            range_end = int(end_time.timestamp())
+            shard_count = max(1, min(concurrency, (range_end - range_start) // max(1, min_window_seconds)))
+            step = (range_end - range_start) / shard_count
+            boundaries = [range_start + int(step * i) for i in range(shard_count)] + [range_end]
+            try:
+                # Reason: Unlike gather(), a TaskGroup cancels the sibling windows when
+                # one fails, so they stop calling Verkada (and never block on a full queue).
+                async with asyncio.TaskGroup() as group:
+                    for i in range(shard_count):
+                        group.create_task(fetch_window(boundaries[i], boundaries[i + 1]))
+            except Exception as fetch_err:
+                await pages.put(_first_error(fetch_err))
+            if budget["truncated"]:
+                logger.warning("Sharded access event fetch truncated at max_pages=%s", max_pages)
+                metrics.FETCH_TRUNCATIONS.labels(mode="sharded").inc()
+            await pages.put(done)
+
+        fetcher = asyncio.create_task(fetch_all_windows())
+        try:
+            while True:
+                page = await pages.get()
+                if page is done:
+                    break
+                if isinstance(page, Exception):
+                    raise page
+                yield page
+        finally:
+            # Reason: Stop outstanding requests if the consumer stops early or fails,
+            # and wait until every window task has actually finished.
+            fetcher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await fetcher
+
+    async def aclose(self) -> None:
+        """Closes the shared connection pool."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
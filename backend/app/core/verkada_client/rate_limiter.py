@@ -0,0 +1,204 @@
+"""
+Client-side rate limiting for the Verkada API.
+Provides RateLimitScheduler, a token bucket shared by every request made
+through a VerkadaApiClient, which serves waiting requests in priority order
+and slows down when the API answers 429 Too Many Requests.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from enum import IntEnum
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class RequestPriority(IntEnum):
+    """
+    Priority classes for Verkada API requests. Lower values are served first.
+    """
+    INTERACTIVE = 0 # A user is waiting on the response (dashboard endpoints)
+    BACKGROUND = 1 # Periodic sync of the local event store
+    BACKFILL = 2 # Bulk historical imports
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses a Retry-After header (delta-seconds or an HTTP date) into seconds from now.
+
+    Returns:
+        The delay in seconds (never negative), or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimitScheduler:
+    """
+    Token bucket with priority-ordered waiters and adaptive backoff.
+
+    Every request takes one token. Tokens refill at `rate` per second up to
+    `burst`. Requests that have to wait are queued by (priority, arrival), so
+    interactive requests overtake queued background and backfill requests.
+
+    On a 429 the scheduler stops handing out tokens until Retry-After has
+    passed (or for `backoff_seconds` when the header is missing) and halves its
+    rate. Each successful response then adds back a small step, up to the
+    configured rate (additive increase, multiplicative decrease), so the client
+    settles just under the quota actually enforced by the API.
+
+    Intended for use from a single event loop; no locking is done.
+    """
+
+    def __init__(
+        self,
+        rate: float = 10.0,
+        burst: int = 20,
+        min_rate: float = 0.5,
+        decrease_factor: float = 0.5,
+        increase_step: Optional[float] = None,
+        backoff_seconds: float = 1.0,
+    ):
+        """
+        Initializes the scheduler.
+
+        Args:
+            rate (float): Target requests per second when the API is not throttling.
+            burst (int): Maximum number of tokens that can accumulate while idle.
+            min_rate (float): Lower bound for the adaptive rate.
+            decrease_factor (float): Multiplier applied to the rate on each 429.
+            increase_step (float, optional): Rate added back per successful response.
+                                             Defaults to 5% of `rate`.
+            backoff_seconds (float): Pause after a 429 without a Retry-After header.
+        """
+        self._max_rate = rate
+        self._rate = rate
+        self._burst = max(1, burst)
+        self._min_rate = min(min_rate, rate)
+        self._decrease_factor = decrease_factor
+        self._increase_step = increase_step if increase_step is not None else rate * 0.05
+        self._backoff_seconds = backoff_seconds
+        self._tokens = float(self._burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        # Heap of [priority, sequence, wake event] entries; the head is the next request served.
+        self._waiters: List[List[Any]] = []
+        self._sequence = itertools.count()
+        self.rate_limited_responses = 0
+        self.granted_by_priority: Dict[RequestPriority, int] = {priority: 0 for priority in RequestPriority}
+
+    @property
+    def rate(self) -> float:
+        """The current (adaptive) request rate in requests per second."""
+        return self._rate
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._burst, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    def _delay_until_token(self) -> float:
+        """Returns how long the head waiter must wait for a token (0 if one is available)."""
+        now = time.monotonic()
+        if self._paused_until > now:
+            return self._paused_until - now
+        self._refill(now)
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self._rate
+
+    def _wake_head(self) -> None:
+        if self._waiters:
+            self._waiters[0][2].set()
+
+    async def acquire(self, priority: RequestPriority = RequestPriority.INTERACTIVE) -> None:
+        """
+        Waits until a request of the given priority may be sent.
+        """
+        entry = [priority, next(self._sequence), asyncio.Event()]
+        heapq.heappush(self._waiters, entry)
+        # Reason: A new head (e.g. an interactive request) must re-evaluate instead of waiting behind a sleeper.
+        self._wake_head()
+        try:
+            while True:
+                wake = entry[2]
+                if self._waiters[0] is entry:
+                    delay = self._delay_until_token()
+                    if delay <= 0:
+                        self._tokens -= 1
+                        heapq.heappop(self._waiters)
+                        self.granted_by_priority[priority] += 1
+                        return
+                    wake.clear()
+                    try:
+                        await asyncio.wait_for(wake.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    wake.clear()
+                    await wake.wait()
+        except BaseException:
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+            raise
+        finally:
+            self._wake_head()
+
+    def on_success(self) -> None:
+        """Records a non-throttled response and recovers the rate by one step."""
+        if self._rate < self._max_rate:
+            self._refill(time.monotonic())
+            self._rate = min(self._max_rate, self._rate + self._increase_step)
+
+    def on_rate_limited(self, retry_after: Optional[float] = None) -> float:
+        """
+        Records a 429 response: pauses all requests and lowers the rate.
+
+        Args:
+            retry_after (float, optional): Seconds to wait, from the Retry-After header.
+
+        Returns:
+            The pause applied, in seconds.
+        """
+        self.rate_limited_responses += 1
+        pause = retry_after if retry_after is not None else self._backoff_seconds
+        now = time.monotonic()
+        self._refill(now)
+        self._paused_until = max(self._paused_until, now + pause)
+        self._rate = max(self._min_rate, self._rate * self._decrease_factor)
+        # Reason: Drop saved-up tokens so the queue does not burst into the limit again after the pause.
+        self._tokens = min(self._tokens, 1.0)
+        logger.warning(
+            "Verkada API rate limited; pausing %.1fs, rate lowered to %.2f req/s", pause, self._rate
+        )
+        self._wake_head()
+        return pause
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Returns the scheduler state and counters.
+        """
+        return {
+            "rate": self._rate,
+            "max_rate": self._max_rate,
+            "queued": len(self._waiters),
+            "paused_for_seconds": max(0.0, self._paused_until - time.monotonic()),
+            "rate_limited_responses": self.rate_limited_responses,
+            "granted_by_priority": {priority.name.lower(): count for priority, count in self.granted_by_priority.items()},
+        }
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import DDL, Column, Index, Integer, LargeBinary, String, Text, UniqueConstraint, event
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -16,4 +16,174 @@ class User(Base):
     def __repr__(self):
         return f"<User(id={self.id}, username='{self.username}')>"
 
+class AccessEvent(Base):
+    """
+    Database model for a Verkada access event stored locally.
+    Populated by the event sync service so dashboard queries do not have to
+    page through the Verkada API.
+    """
+    __tablename__ = "access_events"
+
+    id = Column(Integer, primary_key=True, index=True)
+    event_id = Column(String, unique=True, index=True, nullable=False)
+    event_type = Column(String, index=True, nullable=False)
+    timestamp = Column(Integer, index=True, nullable=False) # Unix timestamp in seconds (UTC)
+    user_id = Column(String, index=True, nullable=True)
+    user_name = Column(String, index=True, nullable=True)
+    door_name = Column(String, index=True, nullable=True)
+    device_id = Column(String, nullable=True)
+    site_id = Column(String, nullable=True)
+
+    __table_args__ = (
+        # Keyset pagination index: pages are ordered and resumed on (timestamp, event_id).
+        Index("ix_access_events_timestamp_event_id", "timestamp", "event_id"),
+    )
+
+    def __repr__(self):
+        return f"<AccessEvent(event_id='{self.event_id}', event_type='{self.event_type}', timestamp={self.timestamp})>"
+
+class AccessEventHourlyRollup(Base):
+    """
+    Database model for pre-aggregated access event counts.
+    One row per (UTC hour bucket, door, event type), incremented as events are ingested.
+    """
+    __tablename__ = "access_event_hourly_rollups"
+
+    bucket_start = Column(Integer, primary_key=True) # Unix timestamp of the start of the UTC hour
+    door_name = Column(String, primary_key=True, default="") # "" when the event has no door
+    event_type = Column(String, primary_key=True)
+    event_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<AccessEventHourlyRollup(bucket_start={self.bucket_start}, door_name='{self.door_name}', event_type='{self.event_type}', event_count={self.event_count})>"
+
+class AccessEventUserHourlyRollup(Base):
+    """
+    Database model for pre-aggregated access event counts per user.
+    One row per (UTC hour bucket, door, user, event type); finer than
+    AccessEventHourlyRollup and only read when a query involves users.
+    """
+    __tablename__ = "access_event_user_hourly_rollups"
+
+    bucket_start = Column(Integer, primary_key=True) # Unix timestamp of the start of the UTC hour
+    door_name = Column(String, primary_key=True, default="") # "" when the event has no door
+    user_id = Column(String, primary_key=True, default="") # "" when the event has no user
+    event_type = Column(String, primary_key=True)
+    event_count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<AccessEventUserHourlyRollup(bucket_start={self.bucket_start}, door_name='{self.door_name}', user_id='{self.user_id}', event_type='{self.event_type}', event_count={self.event_count})>"
+
+class AccessEventHourlyUserSketch(Base):
+    """
+    Database model for the distinct users of an hour (all doors), stored as a
+    serialized HyperLogLog and updated as events are ingested. Sketches merge
+    across hours, so distinct counts over any range can be estimated without
+    scanning raw events.
+    """
+    __tablename__ = "access_event_hourly_user_sketches"
+
+    bucket_start = Column(Integer, primary_key=True) # Unix timestamp of the start of the UTC hour
+    sketch = Column(LargeBinary, nullable=False) # HyperLogLog.to_bytes()
+
+    def __repr__(self):
+        return f"<AccessEventHourlyUserSketch(bucket_start={self.bucket_start})>"
+
+class AccessEventDoorHourlyUserSketch(Base):
+    """
+    Database model for the distinct users of an hour at one door; finer than
+    AccessEventHourlyUserSketch and only read when a query involves doors.
+    """
+    __tablename__ = "access_event_door_hourly_user_sketches"
+
+    bucket_start = Column(Integer, primary_key=True) # Unix timestamp of the start of the UTC hour
+    door_name = Column(String, primary_key=True, default="") # "" when the event has no door
+    sketch = Column(LargeBinary, nullable=False) # HyperLogLog.to_bytes()
+
+    def __repr__(self):
+        return f"<AccessEventDoorHourlyUserSketch(bucket_start={self.bucket_start}, door_name='{self.door_name}')>"
+
+class AccessEventTopKSketch(Base):
+    """
+    Database model for a per-day heavy-hitter summary of one dimension
+    (e.g. the busiest doors of a UTC day), stored as a serialized
+    SpaceSavingSketch and updated as events are ingested.
+    """
+    __tablename__ = "access_event_top_k_sketches"
+
+    day_start = Column(Integer, primary_key=True) # Unix timestamp of the start of the UTC day
+    dimension = Column(String, primary_key=True) # "door" or "user"
+    sketch = Column(Text, nullable=False) # JSON from SpaceSavingSketch.to_dict()
+
+    def __repr__(self):
+        return f"<AccessEventTopKSketch(day_start={self.day_start}, dimension='{self.dimension}')>"
+
+class AccessEventName(Base):
+    """
+    Database model for a user or door name seen in access events, with the
+    id it belongs to, for name search and name-to-id resolution.
+    Maintained as events are ingested; searched through the
+    access_event_names_fts trigram index created with the table.
+    """
+    __tablename__ = "access_event_names"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False) # "user" or "door"
+    name = Column(String, nullable=False)
+    name_key = Column(String, nullable=False) # Case-folded name, for prefix search and exact resolution
+    entity_id = Column(String, nullable=False, default="") # user_id for users, device_id for doors; "" if unknown
+    event_count = Column(Integer, nullable=False, default=0)
+    last_seen = Column(Integer, nullable=False) # Unix timestamp of the newest event with this name
+
+    __table_args__ = (
+        UniqueConstraint("kind", "name", "entity_id", name="uq_access_event_names_kind_name_entity"),
+        Index("ix_access_event_names_name_key", "name_key"),
+    )
+
+    def __repr__(self):
+        return f"<AccessEventName(kind='{self.kind}', name='{self.name}', entity_id='{self.entity_id}')>"
+
+# Trigram full-text index over access_event_names.name (SQLite >= 3.34), kept in
+# sync by triggers. Names are only ever inserted or deleted, never renamed.
+for _statement in (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS access_event_names_fts USING fts5("
+    "name, content='access_event_names', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS access_event_names_fts_insert AFTER INSERT ON access_event_names BEGIN "
+    "INSERT INTO access_event_names_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER IF NOT EXISTS access_event_names_fts_delete AFTER DELETE ON access_event_names BEGIN "
+    "INSERT INTO access_event_names_fts(access_event_names_fts, rowid, name) VALUES ('delete', old.id, old.name); END",
+):
+    event.listen(AccessEventName.__table__, "after_create", DDL(_statement))
+event.listen(AccessEventName.__table__, "before_drop", DDL("DROP TABLE IF EXISTS access_event_names_fts"))
+
+class SyncCheckpoint(Base):
+    """
+    Database model for the progress of a sync job.
+    synced_until is the end of the last time range fetched completely, so a
+    failed pass never moves it past events that were not fetched.
+    """
+    __tablename__ = "sync_checkpoints"
+
+    name = Column(String, primary_key=True) # e.g. "access_events"
+    synced_until = Column(Integer, nullable=False) # Unix timestamp in seconds (UTC)
+
+    def __repr__(self):
+        return f"<SyncCheckpoint(name='{self.name}', synced_until={self.synced_until})>"
+
+class BackfillWindow(Base):
+    """
+    Database model for a completed window of a historical backfill.
+    Windows are aligned to the backfill window size, so a restarted (or
+    overlapping) backfill skips every window already imported.
+    """
+    __tablename__ = "backfill_windows"
+
+    window_start = Column(Integer, primary_key=True) # Unix timestamp in seconds (UTC)
+    window_end = Column(Integer, primary_key=True) # Unix timestamp in seconds (UTC), exclusive
+    event_count = Column(Integer, nullable=False, default=0) # Events fetched for the window
+    completed_at = Column(Integer, nullable=False) # Unix timestamp in seconds (UTC)
+
+    def __repr__(self):
+        return f"<BackfillWindow(window_start={self.window_start}, window_end={self.window_end}, event_count={self.event_count})>"
+
 # Add other models here as needed, e.g., for audit logs or other entities.
\ No newline at end of file
@@ -1,22 +1,66 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.ext.declarative import declarative_base
+
+from .models import Base # noqa: F401 - re-exported; all tables are declared on models.Base
 
 # Define the SQLite database URL.
 # The database file will be created in the 'backend' directory.
 SQLALCHEMY_DATABASE_URL = "sqlite:////app/data/dashboard.db"  # Absolute path for clarity
+# Same database through the aiosqlite driver, used by async endpoints and services.
+ASYNC_SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:////app/data/dashboard.db"
+
+# Pragmas applied to every new connection.
+SQLITE_PRAGMAS = (
+    ("journal_mode", "WAL"), # Readers no longer block behind the writer (and vice versa)
+    ("synchronous", "NORMAL"), # Durable with WAL; fsync only at checkpoints
+    ("cache_size", -65536), # 64 MiB page cache per connection (negative = KiB)
+    ("temp_store", "MEMORY"),
+    ("mmap_size", 268435456), # Memory-map up to 256 MiB of the database file
+    ("busy_timeout", 5000), # Wait up to 5s for the write lock instead of failing
+)
+
+# Connection pool sizing. SQLite allows one writer at a time, so the pool
+# mostly bounds concurrent readers; WAL lets them proceed during writes.
+POOL_SIZE = 10
+MAX_OVERFLOW = 10
+POOL_TIMEOUT_SECONDS = 10
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """SQLAlchemy 'connect' event handler applying SQLITE_PRAGMAS to a new connection."""
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
 
 # Create the SQLAlchemy engine.
 # connect_args is needed for SQLite to allow multithreaded access.
+# Kept for startup schema creation, scripts and thread-pool code.
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT_SECONDS,
 )
+event.listen(engine, "connect", apply_sqlite_pragmas)
 
 # Create a SessionLocal class, which will be used to create database sessions.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Base class for declarative class definitions.
-Base = declarative_base()
+# Async engine: queries run on aiosqlite's worker threads, so awaiting them
+# does not block the event loop.
+async_engine = create_async_engine(
+    ASYNC_SQLALCHEMY_DATABASE_URL,
+    pool_size=POOL_SIZE,
+    max_overflow=MAX_OVERFLOW,
+    pool_timeout=POOL_TIMEOUT_SECONDS,
+)
+event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+# Reason: expire_on_commit=False keeps loaded attributes usable after commit
+# without an implicit (and, in async code, impossible) lazy reload.
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
 
 def init_db():
     """
@@ -38,4 +82,13 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    """
+    Dependency to get an async database session.
+    Ensures the session is closed (and its connection returned to the pool) after the request.
+    Synchronous service functions can be run on it with `await db.run_sync(func, *args)`.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,8 +1,20 @@
-from fastapi import FastAPI
-from .db.session import engine # engine is used, init_db is not directly called here anymore
+import asyncio
+import time
+from datetime import timedelta
+from fastapi import FastAPI, Request, Response
+from .core import metrics
+from .db.session import engine, AsyncSessionLocal # engine is used, init_db is not directly called here anymore
 from .db import models # Import models to ensure Base knows about them
+from .core.config import verkada_api_client, get_settings # Shared async Verkada client (connection pool)
+from .services import backfill_service, event_archive_service, event_store_service, event_sync_service, live_feed_service, name_search_service, webhook_service
 from .api.endpoints import auth as auth_router # Import the auth router
 from .api.endpoints import verkada as verkada_router # Import the Verkada router
+from .api.endpoints import archive as archive_router
+from .api.endpoints import live as live_router
+from .api.endpoints import analytics as analytics_router
+from .api.endpoints import search as search_router
+from .api.endpoints import admin as admin_router
+from .api.endpoints import webhooks as webhooks_router
 
 # Create all tables in the database if they don't exist yet.
 # This should ideally be handled by Alembic for migrations in a production app,
@@ -19,9 +31,109 @@ app = FastAPI(
 async def on_startup():
     """
     Actions to perform on application startup.
-    Initializes the database.
+    Initializes the database and starts the background event sync if enabled.
     """
     # models.Base.metadata.create_all(bind=engine) # This is already done at module level
+    settings = get_settings()
+    app.state.event_sync_task = None
+    app.state.live_poller_task = None
+    app.state.webhook_writer_task = None
+    app.state.archive_flush_task = None
+    app.state.event_loop_lag_task = asyncio.create_task(metrics.monitor_event_loop_lag())
+    if settings.EVENT_STORE_ENABLED:
+        async with AsyncSessionLocal() as db:
+            await db.run_sync(event_store_service.ensure_keyset_index)
+            await db.run_sync(event_store_service.ensure_hourly_rollups)
+            await db.run_sync(event_store_service.ensure_top_k_sketches)
+            await db.run_sync(event_store_service.ensure_user_sketches)
+            await db.run_sync(name_search_service.ensure_name_index)
+            await db.run_sync(
+                event_store_service.enable_event_id_index,
+                settings.EVENT_DEDUPE_FILTER_CAPACITY,
+                settings.EVENT_DEDUPE_FILTER_ERROR_RATE,
+                settings.EVENT_DEDUPE_RECENT_IDS,
+            )
+        event_archive = event_archive_service.get_event_archive()
+        if event_archive:
+            # Archive events as they are ingested into the local store, including backfilled ones.
+            event_store_service.add_ingest_listener(event_archive.append, historical=True)
+            app.state.archive_flush_task = asyncio.create_task(event_archive.run_flush_timer())
+        # The event sync feeds the live feed; no separate upstream polling.
+        event_store_service.add_ingest_listener(live_feed_service.live_event_broker.publish)
+        if settings.WEBHOOK_SECRET:
+            app.state.webhook_writer_task = asyncio.create_task(
+                webhook_service.webhook_event_queue.run_writer(AsyncSessionLocal)
+            )
+    if settings.EVENT_STORE_ENABLED and verkada_api_client:
+        app.state.event_sync_task = asyncio.create_task(
+            event_sync_service.run_periodic_sync(
+                verkada_api_client,
+                interval_seconds=settings.EVENT_SYNC_INTERVAL_SECONDS,
+                initial_lookback=timedelta(days=settings.EVENT_SYNC_INITIAL_LOOKBACK_DAYS),
+                overlap=timedelta(seconds=settings.EVENT_SYNC_OVERLAP_SECONDS),
+            )
+        )
+    elif verkada_api_client:
+        app.state.live_poller_task = asyncio.create_task(
+            live_feed_service.run_live_poller(
+                verkada_api_client,
+                live_feed_service.live_event_broker,
+                interval_seconds=settings.LIVE_FEED_POLL_INTERVAL_SECONDS,
+                overlap=timedelta(seconds=settings.LIVE_FEED_OVERLAP_SECONDS),
+            )
+        )
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """
+    Actions to perform on application shutdown.
+    Stops the background tasks (event sync, live poller, loop lag probe, archive flush timer, backfill) and closes the shared Verkada API connection pool.
+    Webhook events still queued are stored before the event archive is closed.
+    """
+    backfill_service.cancel_backfill()
+    for task_name in ("event_sync_task", "live_poller_task", "event_loop_lag_task", "archive_flush_task"):
+        task = getattr(app.state, task_name, None)
+        if task:
+            task.cancel()
+    webhook_writer_task = getattr(app.state, "webhook_writer_task", None)
+    if webhook_writer_task:
+        webhook_writer_task.cancel()
+        await asyncio.gather(webhook_writer_task, return_exceptions=True)
+    if get_settings().EVENT_STORE_ENABLED:
+        event_archive = event_archive_service.get_event_archive()
+        if event_archive:
+            await asyncio.to_thread(event_archive.close)
+    if verkada_api_client:
+        await verkada_api_client.aclose()
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    """
+    Records the latency of every request, labelled by route template (e.g.
+    /api/v1/verkada/events) rather than raw path to keep label cardinality bounded.
+    """
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        metrics.HTTP_REQUEST_DURATION.labels(
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status_code),
+        ).observe(time.perf_counter() - started)
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    """
+    Exposes application metrics in the Prometheus text format.
+    Unauthenticated, like most scrape targets; restrict access at the network level.
+    """
+    content, content_type = metrics.render_metrics()
+    return Response(content=content, media_type=content_type)
 
 @app.get("/")
 async def root():
@@ -34,5 +146,11 @@ async def root():
 # Include API routers
 app.include_router(auth_router.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(verkada_router.router, prefix="/api/v1/verkada", tags=["verkada"])
+app.include_router(archive_router.router, prefix="/api/v1/archive", tags=["archive"])
+app.include_router(live_router.router, prefix="/api/v1/live", tags=["live"])
+app.include_router(analytics_router.router, prefix="/api/v1/analytics", tags=["analytics"])
+app.include_router(search_router.router, prefix="/api/v1/search", tags=["search"])
+app.include_router(admin_router.router, prefix="/api/v1/admin", tags=["admin"])
+app.include_router(webhooks_router.router, prefix="/api/v1/webhooks", tags=["webhooks"])
 
 # Further imports and other routers will be added here.
\ No newline at end of file
@@ -1,6 +1,9 @@
+import logging
 from pydantic import BaseModel, Field
-from typing import Optional, List
-from datetime import datetime
+from typing import Any, Iterable, Optional, List
+from datetime import date, datetime
+
+logger = logging.getLogger(__name__)
 
 class VerkadaEventQueryParams(BaseModel):
     """
@@ -14,6 +17,10 @@ class VerkadaEventQueryParams(BaseModel):
     site_id: Optional[str] = Field(None, description="Comma-separated list of site IDs to filter by.")
     device_id: Optional[str] = Field(None, description="Comma-separated list of device IDs to filter by.")
     user_id: Optional[str] = Field(None, description="Comma-separated list of user IDs to filter by.")
+    # Only supported when events are served from the local event store.
+    user_name: Optional[str] = Field(None, description="Comma-separated list of user names to filter by (local store only).")
+    door_name: Optional[str] = Field(None, description="Comma-separated list of door names to filter by (local store only).")
+    order: Optional[str] = Field(None, pattern="^(asc|desc)$", description="Sort by time: 'desc' (newest first, default) or 'asc' (local store only).")
 
 class VerkadaEvent(BaseModel):
     """
@@ -24,8 +31,10 @@ class VerkadaEvent(BaseModel):
     timestamp: datetime 
     user_name: Optional[str] = Field(None, alias="userName")
     door_name: Optional[str] = Field(None, alias="doorName")
+    user_id: Optional[str] = Field(None, alias="userId")
+    device_id: Optional[str] = Field(None, alias="deviceId")
+    site_id: Optional[str] = Field(None, alias="siteId")
     # Add other relevant fields if needed from actual API response, e.g.:
-    # device_id: Optional[str] = Field(None, alias="deviceId")
     # org_id: Optional[int] = Field(None, alias="orgId")
     # person_id: Optional[str] = Field(None, alias="personId")
     # credential_id: Optional[str] = Field(None, alias="credentialId")
@@ -34,12 +43,26 @@ class VerkadaEvent(BaseModel):
         populate_by_name = True
         from_attributes = True
 
+def parse_events(raw_events: Iterable[Any]) -> List[VerkadaEvent]:
+    """
+    Parses raw Verkada event dictionaries (API pages or webhook payloads),
+    skipping and logging items that do not match the VerkadaEvent model.
+    """
+    events: List[VerkadaEvent] = []
+    for event_data_item in raw_events:
+        try:
+            events.append(VerkadaEvent.model_validate(event_data_item))
+        except Exception as parse_err:
+            logger.warning("Skipping unparseable Verkada event %s: %s", event_data_item, parse_err)
+    return events
+
 class VerkadaEventListResponse(BaseModel):
     """
     Pydantic model for the list response when fetching Verkada access events.
     """
     events: List[VerkadaEvent]
     next_page_token: Optional[str] = Field(None, alias="nextPageToken")
+    prev_page_token: Optional[str] = Field(None, alias="prevPageToken", description="Cursor of the previous page (local store only).")
 
     class Config:
         populate_by_name = True
@@ -59,4 +82,159 @@ class PeakTimesResponse(BaseModel):
     """
     data: List[PeakTimeDataPoint]
     time_range_start: Optional[datetime] = Field(None, description="Start of the time range analyzed")
-    time_range_end: Optional[datetime] = Field(None, description="End of the time range analyzed")
\ No newline at end of file
+    time_range_end: Optional[datetime] = Field(None, description="End of the time range analyzed")
+
+class CacheStats(BaseModel):
+    """
+    Pydantic model for the counters of an in-process cache.
+    """
+    size: int = Field(..., description="Number of entries currently cached")
+    maxsize: int = Field(..., description="Maximum number of entries")
+    hits: int
+    misses: int
+    evictions: int = Field(..., description="Entries dropped because the cache was full")
+    expirations: int = Field(..., description="Entries dropped because their TTL ran out")
+    hit_ratio: float
+
+class YearPeakTimes(BaseModel):
+    """
+    Hour-of-day event counts for one calendar year.
+    """
+    year: int
+    data: List[PeakTimeDataPoint]
+
+class ArchivePeakTimesResponse(BaseModel):
+    """
+    Pydantic model for year-over-year peak access times computed from the event archive.
+    """
+    years: List[YearPeakTimes]
+    time_range_start: datetime
+    time_range_end: datetime
+
+class DoorCount(BaseModel):
+    """
+    Number of access events at one door.
+    """
+    door_name: Optional[str] = Field(None, description="Door name, null for events without a door")
+    event_count: int = Field(..., ge=0)
+
+class DoorCountsResponse(BaseModel):
+    """
+    Pydantic model for per-door event counts, busiest door first.
+    """
+    data: List[DoorCount]
+    time_range_start: datetime
+    time_range_end: datetime
+
+class EventCountGroup(BaseModel):
+    """
+    Number of access events in one group of an aggregation.
+    Only the dimensions that were grouped by are set.
+    """
+    hour: Optional[int] = Field(None, ge=0, le=23, description="Hour of the day (0-23) in the requested time zone")
+    weekday: Optional[int] = Field(None, ge=0, le=6, description="Day of the week (0 = Monday) in the requested time zone")
+    day: Optional[date] = Field(None, description="Calendar day in the requested time zone")
+    door_name: Optional[str] = None
+    user_id: Optional[str] = None
+    event_type: Optional[str] = None
+    event_count: int = Field(..., ge=0)
+
+class EventAggregationResponse(BaseModel):
+    """
+    Pydantic model for event counts grouped by time, door, user and/or event type.
+    """
+    group_by: List[str]
+    timezone: str
+    data: List[EventCountGroup] = Field(..., description="Non-empty groups, sorted by the grouped dimensions")
+    time_range_start: datetime
+    time_range_end: datetime
+
+class TopKItem(BaseModel):
+    """
+    Estimated number of events of one door or user in a top-K summary.
+    The true count is between lower_bound and event_count.
+    """
+    value: str = Field(..., description="Door name or user ID")
+    event_count: int = Field(..., ge=0, description="Estimated count (never below the true count)")
+    lower_bound: int = Field(..., ge=0, description="Guaranteed minimum count")
+    guaranteed: bool = Field(..., description="True if the item is certainly among the top k")
+
+class TopKResponse(BaseModel):
+    """
+    Pydantic model for the busiest doors or users over a range, with error bounds.
+    """
+    dimension: str
+    data: List[TopKItem] = Field(..., description="Busiest first")
+    total_events: int = Field(..., description="Events counted in the summary (events with a value for the dimension)")
+    max_unlisted_count: int = Field(..., description="Upper bound of the count of any door or user not listed")
+    time_range_start: datetime
+    time_range_end: datetime
+
+class DistinctUsersGroup(BaseModel):
+    """
+    Estimated number of distinct users in one group of a distinct-user query.
+    Only the dimensions that were grouped by are set.
+    """
+    hour: Optional[int] = Field(None, ge=0, le=23, description="Hour of the day (0-23) in the requested time zone")
+    weekday: Optional[int] = Field(None, ge=0, le=6, description="Day of the week (0 = Monday) in the requested time zone")
+    day: Optional[date] = Field(None, description="Calendar day in the requested time zone")
+    door_name: Optional[str] = None
+    distinct_users: int = Field(..., ge=0)
+
+class DistinctUsersResponse(BaseModel):
+    """
+    Pydantic model for approximate distinct user counts grouped by time and/or door.
+    """
+    group_by: List[str]
+    timezone: str
+    relative_error: float = Field(..., description="Relative standard error of the estimates")
+    data: List[DistinctUsersGroup] = Field(..., description="Non-empty groups, sorted by the grouped dimensions")
+    time_range_start: datetime
+    time_range_end: datetime
+
+class NameMatch(BaseModel):
+    """
+    A user or door name seen in access events, as returned by name search.
+    """
+    kind: str = Field(..., description="'user' or 'door'")
+    name: str
+    id: Optional[str] = Field(None, description="User ID (users) or device ID (doors) the name appears with")
+    event_count: int = Field(..., ge=0, description="Number of stored events with this name and id")
+    last_seen: datetime = Field(..., description="Time of the newest event with this name and id")
+
+class NameSearchResponse(BaseModel):
+    """
+    Pydantic model for name autocomplete results, best match first.
+    """
+    query: str
+    data: List[NameMatch]
+
+class NameResolution(BaseModel):
+    """
+    The ids a name appears with in access events.
+    """
+    name: str
+    ids: List[str] = Field(..., description="Matching ids, most frequent first; empty if the name is unknown")
+
+class NameResolutionResponse(BaseModel):
+    """
+    Pydantic model for resolving user or door names to ids.
+    """
+    kind: str
+    data: List[NameResolution]
+
+class BackfillStatus(BaseModel):
+    """
+    Pydantic model for the progress of a historical backfill.
+    """
+    status: str = Field(..., description="'pending', 'running', 'completed' or 'failed'")
+    start_time: datetime
+    end_time: datetime
+    windows_total: int = Field(..., ge=0)
+    windows_completed: int = Field(..., ge=0, description="Including windows imported by an earlier backfill")
+    windows_skipped: int = Field(..., ge=0, description="Windows already imported by an earlier backfill")
+    events_fetched: int = Field(..., ge=0)
+    events_stored: int = Field(..., ge=0, description="Fetched events written to the local store (new or changed)")
+    elapsed_seconds: float = Field(..., ge=0)
+    events_per_second: float = Field(..., ge=0)
+    error: Optional[str] = None
@@ -0,0 +1,335 @@
+import hashlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..core.event_batch import EventBatch
+from ..models import verkada_event as verkada_event_schemas
+
+SECONDS_PER_HOUR = 3600
+HOURS_PER_DAY = 24
+
+class HourOfDayAggregator:
+    """
+    Streaming histogram of event counts per UTC hour of day.
+
+    Events are added as contiguous arrays of Unix seconds (one page at a time)
+    and counted with np.bincount, so memory stays at 24 counters no matter
+    how many events pass through.
+
+    With deduplicate=True, batches are counted once per event_id, so events
+    delivered more than once (overlapping fetch windows, re-sent pages) are
+    not double counted. This keeps the seen event_ids in memory as a sorted
+    array, matched against each batch with np.isin.
+    """
+
+    def __init__(self, deduplicate: bool = False):
+        self._counts = np.zeros(HOURS_PER_DAY, dtype=np.int64)
+        self._seen_event_ids: Optional[np.ndarray] = np.empty(0, dtype=str) if deduplicate else None
+
+    def add_timestamps(self, epoch_seconds: np.ndarray) -> None:
+        """
+        Adds an array of Unix timestamps (seconds) to the histogram.
+        """
+        if epoch_seconds.size == 0:
+            return
+        hours = (epoch_seconds // SECONDS_PER_HOUR) % HOURS_PER_DAY
+        self._counts += np.bincount(hours, minlength=HOURS_PER_DAY)
+
+    def add_batch(self, batch: EventBatch) -> None:
+        """
+        Adds the events of an EventBatch to the histogram.
+        """
+        if self._seen_event_ids is None:
+            self.add_timestamps(batch.timestamps)
+            return
+        event_ids, first_index = np.unique(batch.event_ids.astype(str), return_index=True)
+        unseen = ~np.isin(event_ids, self._seen_event_ids, assume_unique=True)
+        self._seen_event_ids = np.union1d(self._seen_event_ids, event_ids[unseen])
+        self.add_timestamps(batch.timestamps[first_index[unseen]])
+
+    def add_raw_events(self, raw_events: List[Dict[str, Any]]) -> None:
+        """
+        Adds a page of raw Verkada event dictionaries to the histogram.
+        """
+        self.add_batch(EventBatch.from_raw_events(raw_events))
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Event counts indexed by hour of day (0-23)."""
+        return self._counts.copy()
+
+    @property
+    def total(self) -> int:
+        """Total number of events added."""
+        return int(self._counts.sum())
+
+    def to_data_points(self) -> List[verkada_event_schemas.PeakTimeDataPoint]:
+        """
+        Returns the histogram as one PeakTimeDataPoint per hour of day.
+        """
+        return [
+            verkada_event_schemas.PeakTimeDataPoint(hour=hour, event_count=int(count))
+            for hour, count in enumerate(self._counts.tolist())
+        ]
+
+
+class SpaceSavingSketch:
+    """
+    Bounded-memory streaming top-K summary (Space-Saving).
+
+    At most `capacity` items are monitored, each with a count and an error.
+    When a new item arrives and the sketch is full, the item with the smallest
+    count is replaced and the newcomer inherits that count as its error. For
+    every monitored item, count - error <= true count <= count; any item not
+    monitored occurred at most `floor` times (at most total / capacity for a
+    sketch built with add()).
+
+    Sketches of disjoint streams (e.g. one per day) can be merged; the merged
+    sketch keeps the count, error and floor guarantees over the combined stream.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.capacity = capacity
+        self.total = 0
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._floor = 0 # Upper bound of items dropped when merging
+
+    @property
+    def floor(self) -> int:
+        """Upper bound of the count of any item that is not monitored."""
+        if len(self._counts) < self.capacity:
+            return self._floor
+        return max(self._floor, min(self._counts.values()))
+
+    def add(self, item: str, count: int = 1) -> None:
+        """Adds `count` occurrences of item."""
+        self.total += count
+        if item in self._counts:
+            self._counts[item] += count
+            return
+        base = self.floor
+        if len(self._counts) >= self.capacity:
+            evicted = min(self._counts, key=self._counts.__getitem__)
+            del self._counts[evicted], self._errors[evicted]
+        self._counts[item] = base + count
+        self._errors[item] = base
+
+    def add_counts(self, counts: Dict[str, int]) -> None:
+        """Adds pre-counted occurrences, largest first so frequent items are not evicted by rare ones."""
+        for item, count in sorted(counts.items(), key=lambda entry: entry[1], reverse=True):
+            self.add(item, count)
+
+    def merge(self, other: "SpaceSavingSketch") -> "SpaceSavingSketch":
+        """
+        Returns a new sketch summarizing the streams of both sketches, with the
+        capacity of this one. An item monitored by only one sketch is assumed
+        to have occurred `floor` times in the other (its upper bound there).
+        """
+        merged = SpaceSavingSketch(self.capacity)
+        merged.total = self.total + other.total
+        self_floor, other_floor = self.floor, other.floor
+        candidates: List[Tuple[str, int, int]] = []
+        for item in self._counts.keys() | other._counts.keys():
+            candidates.append((
+                item,
+                self._counts.get(item, self_floor) + other._counts.get(item, other_floor),
+                self._errors.get(item, self_floor) + other._errors.get(item, other_floor),
+            ))
+        candidates.sort(key=lambda candidate: candidate[1], reverse=True)
+        for item, count, error in candidates[:merged.capacity]:
+            merged._counts[item] = count
+            merged._errors[item] = error
+        dropped_max = candidates[merged.capacity][1] if len(candidates) > merged.capacity else 0
+        merged._floor = max(self_floor + other_floor, dropped_max)
+        return merged
+
+    def top(self, k: int) -> List[Tuple[str, int, int]]:
+        """
+        Returns up to k (item, count, error) tuples, largest count first.
+        The true count of each item is between count - error and count.
+        """
+        items = sorted(self._counts, key=lambda item: (-self._counts[item], item))[:k]
+        return [(item, self._counts[item], self._errors[item]) for item in items]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializes the sketch to a JSON-compatible dictionary."""
+        return {
+            "capacity": self.capacity,
+            "total": self.total,
+            "floor": self._floor,
+            "counters": [[item, count, self._errors[item]] for item, count in self._counts.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpaceSavingSketch":
+        """Restores a sketch serialized with to_dict."""
+        sketch = cls(data["capacity"])
+        sketch.total = data["total"]
+        sketch._floor = data["floor"]
+        for item, count, error in data["counters"]:
+            sketch._counts[item] = count
+            sketch._errors[item] = error
+        return sketch
+
+    @classmethod
+    def merge_all(cls, sketches: Iterable["SpaceSavingSketch"], capacity: int) -> "SpaceSavingSketch":
+        """Merges any number of sketches into one with the given capacity."""
+        merged = cls(capacity)
+        for sketch in sketches:
+            merged = merged.merge(sketch)
+        return merged
+
+
+class HyperLogLog:
+    """
+    Mergeable approximate distinct counter (HyperLogLog).
+
+    Items are hashed with a 64-bit BLAKE2b hash; the first `precision` bits
+    select one of 2**precision registers, which keeps the longest run of
+    leading zeros seen in the remaining bits. The relative standard error of
+    count() is about 1.04 / sqrt(2**precision) (1.6% at the default 12), and
+    merging two sketches (register-wise maximum) counts the union of their items.
+
+    to_bytes() stores the registers densely (2**precision bytes) or, while
+    few are set, as (index, value) pairs, so sketches of quiet buckets stay small.
+    """
+
+    _DENSE = b"D"
+    _SPARSE = b"S"
+
+    def __init__(self, precision: int = 12):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16.")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def relative_error(self) -> float:
+        """Relative standard error of count()."""
+        return 1.04 / float(np.sqrt(len(self.registers)))
+
+    def add(self, item: str) -> None:
+        """Adds an item (e.g. a user id)."""
+        hashed = int.from_bytes(hashlib.blake2b(item.encode(), digest_size=8).digest(), "big")
+        index = hashed >> (64 - self.precision)
+        remaining_bits = 64 - self.precision
+        rest = hashed & ((1 << remaining_bits) - 1)
+        rank = remaining_bits - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Adds the items of another sketch with the same precision to this one."""
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches of different precision.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> int:
+        """Returns the estimated number of distinct items added."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / float(np.sum(np.ldexp(1.0, -self.registers.astype(np.int32))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * m and zeros:
+            # Reason: The raw estimate is biased for small cardinalities; linear counting is exact-ish there.
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+    def to_bytes(self) -> bytes:
+        """Serializes the sketch, sparsely while fewer than a third of the registers are set."""
+        indexes = np.flatnonzero(self.registers)
+        header = bytes([self.precision])
+        if len(indexes) * 3 < len(self.registers):
+            pairs = np.zeros(len(indexes), dtype=[("index", ">u2"), ("value", "u1")])
+            pairs["index"], pairs["value"] = indexes, self.registers[indexes]
+            return self._SPARSE + header + pairs.tobytes()
+        return self._DENSE + header + self.registers.tobytes()
+
+    def merge_bytes(self, payloads: List[bytes]) -> None:
+        """
+        Merges sketches serialized with to_bytes into this one without
+        materializing them: all sparse sketches are applied with one scatter
+        and all dense ones with one reduction, so merging thousands of small
+        sketches costs little more than reading them.
+        """
+        sparse, dense = [], []
+        for data in payloads:
+            if len(data) < 2 or data[1] != self.precision:
+                raise ValueError("Cannot merge HyperLogLog sketches of different precision.")
+            if data[:1] == self._SPARSE:
+                sparse.append(data[2:])
+            elif data[:1] == self._DENSE:
+                dense.append(data[2:])
+            else:
+                raise ValueError("Malformed HyperLogLog sketch.")
+        if sparse:
+            pairs = np.frombuffer(b"".join(sparse), dtype=[("index", ">u2"), ("value", "u1")])
+            np.maximum.at(self.registers, pairs["index"].astype(np.intp), pairs["value"])
+        if dense:
+            stacked = np.frombuffer(b"".join(dense), dtype=np.uint8).reshape(len(dense), len(self.registers))
+            np.maximum(self.registers, stacked.max(axis=0), out=self.registers)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        """Restores a sketch serialized with to_bytes."""
+        if len(data) < 2:
+            raise ValueError("Malformed HyperLogLog sketch.")
+        sketch = cls(precision=data[1])
+        sketch.merge_bytes([data])
+        return sketch
+
+class BloomFilter:
+    """
+    Set membership filter without false negatives (Bloom filter).
+
+    Sized for `capacity` items at a false positive rate of `error_rate`:
+    -capacity * ln(error_rate) / ln(2)**2 bits and bits / capacity * ln(2)
+    hash functions (about 1.2 bytes per item at 1%). The bit positions of an
+    item are derived from one 128-bit BLAKE2b hash by double hashing, and
+    items are added and tested in batches with numpy, so checking a page of
+    event ids costs one hash per id. Past `capacity` items the false positive
+    rate grows, but contains_many never misses an added item.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        if capacity < 1:
+            raise ValueError("capacity must be positive.")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1.")
+        self.capacity = capacity
+        self.size = max(64, int(np.ceil(-capacity * np.log(error_rate) / np.log(2) ** 2)))
+        self.hash_count = max(1, int(round(self.size / capacity * np.log(2))))
+        self.bits = np.zeros((self.size + 7) // 8, dtype=np.uint8)
+        self.added = 0 # Items added, counting repeats
+
+    def _positions(self, items: List[str]) -> np.ndarray:
+        """Returns the (len(items), hash_count) bit positions of items."""
+        digests = b"".join(hashlib.blake2b(item.encode(), digest_size=16).digest() for item in items)
+        hashes = np.frombuffer(digests, dtype="<u8").reshape(len(items), 2)
+        # Reason: An odd step never cycles early, whatever the filter size.
+        first, step = hashes[:, :1], hashes[:, 1:] | np.uint64(1)
+        return (first + step * np.arange(self.hash_count, dtype=np.uint64)) % np.uint64(self.size)
+
+    def add_many(self, items: List[str]) -> None:
+        """Adds items (e.g. event ids)."""
+        if not items:
+            return
+        positions = self._positions(items)
+        masks = np.left_shift(np.uint8(1), (positions & np.uint64(7)).astype(np.uint8))
+        np.bitwise_or.at(self.bits, positions >> np.uint64(3), masks)
+        self.added += len(items)
+
+    def contains_many(self, items: List[str]) -> np.ndarray:
+        """
+        Returns a boolean array that is False where an item was certainly never
+        added and True where it probably was.
+        """
+        if not items:
+            return np.zeros(0, dtype=bool)
+        positions = self._positions(items)
+        bits = (self.bits[positions >> np.uint64(3)] >> (positions & np.uint64(7)).astype(np.uint8)) & 1
+        return bits.all(axis=1)
@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..core import metrics
+from ..core.verkada_client.client import VerkadaApiClient
+from ..core.verkada_client.rate_limiter import RequestPriority
+from ..db import models as db_models
+from ..models import verkada_event as verkada_event_schemas
+from . import event_store_service
+
+logger = logging.getLogger(__name__)
+
+class BackfillRunningError(Exception):
+    """Raised when a backfill is started while another one is still running."""
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(self.message)
+
+def plan_windows(start_time: int, end_time: int, window_seconds: int) -> List[Tuple[int, int]]:
+    """
+    Splits [start_time, end_time) into windows aligned to multiples of
+    window_seconds (the first and last are clipped to the range), e.g. with
+    one-day windows every window but the ends covers exactly one UTC day.
+    Alignment makes the windows of overlapping backfills coincide, so their
+    checkpoints are shared.
+    """
+    if window_seconds <= 0:
+        raise ValueError("window_seconds must be positive.")
+    windows = []
+    window_start = start_time
+    while window_start < end_time:
+        window_end = min(end_time, (window_start // window_seconds + 1) * window_seconds)
+        windows.append((window_start, window_end))
+        window_start = window_end
+    return windows
+
+def get_completed_windows(db: Session, start_time: int, end_time: int) -> Set[Tuple[int, int]]:
+    """
+    Returns the (window_start, window_end) of the backfill windows inside
+    [start_time, end_time) that were already imported completely.
+    """
+    rows = db.query(db_models.BackfillWindow.window_start, db_models.BackfillWindow.window_end).filter(
+        db_models.BackfillWindow.window_start >= start_time,
+        db_models.BackfillWindow.window_end <= end_time,
+    )
+    return {(window_start, window_end) for window_start, window_end in rows}
+
+def mark_window_completed(db: Session, window_start: int, window_end: int, event_count: int) -> None:
+    """
+    Records that every event of a backfill window has been stored and commits.
+    """
+    db.merge(db_models.BackfillWindow(
+        window_start=window_start,
+        window_end=window_end,
+        event_count=event_count,
+        completed_at=int(time.time()),
+    ))
+    db.commit()
+
+class Backfill:
+    """
+    Imports the access events of a historical time range into the local event store.
+
+    The range is split into windows (see plan_windows) that are fetched
+    concurrently, each page by page at BACKFILL priority, so the shared rate
+    limiter serves dashboard and sync requests first. A window is checkpointed
+    in backfill_windows once all its events are stored; a restarted backfill
+    skips checkpointed windows and refetches the others (the event_id upsert
+    makes the overlap harmless). Writes go through one lock, since SQLite has a
+    single writer anyway. Events are stored as historical, so they reach the
+    archive but not the live feed.
+
+    The counters below are read for progress reports while run() is going.
+    """
+
+    def __init__(
+        self,
+        api_client: VerkadaApiClient,
+        session_factory: Callable,
+        start_time: int,
+        end_time: int,
+        window_seconds: int,
+        concurrency: int,
+    ):
+        # Reason: Windows that are still receiving events must not be checkpointed.
+        end_time = min(end_time, int(time.time()))
+        if start_time >= end_time:
+            raise ValueError("The backfill range is empty: start_time must be before end_time and in the past.")
+        self.api_client = api_client
+        self.session_factory = session_factory
+        self.start_time = start_time
+        self.end_time = end_time
+        self.concurrency = max(1, concurrency)
+        self.windows = plan_windows(start_time, end_time, window_seconds)
+        self.windows_skipped = 0 # Checkpointed by an earlier backfill
+        self.windows_completed = 0 # Including the skipped ones
+        self.events_fetched = 0
+        self.events_stored = 0 # Events written (see event_store_service.store_events)
+        self.started_at: Optional[float] = None # time.monotonic()
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def status(self) -> str:
+        """'pending', 'running', 'completed' or 'failed'."""
+        if self.started_at is None:
+            return "pending"
+        if self.finished_at is None:
+            return "running"
+        return "failed" if self.error else "completed"
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def events_per_second(self) -> float:
+        """Fetch rate of this run (events from skipped windows are not counted)."""
+        elapsed = self.elapsed_seconds
+        return self.events_fetched / elapsed if elapsed > 0 else 0.0
+
+    async def run(self) -> None:
+        """
+        Runs the backfill to completion. If a window fails, the other windows
+        are cancelled and the error is raised; completed windows stay checkpointed.
+        """
+        self.started_at = time.monotonic()
+        try:
+            async with self.session_factory() as db:
+                completed = await db.run_sync(get_completed_windows, self.start_time, self.end_time)
+            pending = [window for window in self.windows if window not in completed]
+            self.windows_skipped = self.windows_completed = len(self.windows) - len(pending)
+            logger.info(
+                "Backfilling %d windows (%d already imported) from %s to %s",
+                len(pending), self.windows_skipped,
+                datetime.fromtimestamp(self.start_time, tz=timezone.utc).isoformat(),
+                datetime.fromtimestamp(self.end_time, tz=timezone.utc).isoformat(),
+            )
+            semaphore = asyncio.Semaphore(self.concurrency)
+            write_lock = asyncio.Lock()
+            # Reason: A TaskGroup cancels the remaining windows as soon as one fails.
+            async with asyncio.TaskGroup() as task_group:
+                for window_start, window_end in pending:
+                    task_group.create_task(self._run_window(window_start, window_end, semaphore, write_lock))
+        except BaseException as e:
+            self.error = repr(e.exceptions[0]) if isinstance(e, BaseExceptionGroup) else repr(e)
+            raise
+        finally:
+            self.finished_at = time.monotonic()
+
+    async def _run_window(
+        self,
+        window_start: int,
+        window_end: int,
+        semaphore: asyncio.Semaphore,
+        write_lock: asyncio.Lock,
+    ) -> None:
+        """Fetches and stores one window, then checkpoints it."""
+        async with semaphore:
+            fetched = 0
+            async with self.session_factory() as db:
+                async for raw_events in self.api_client.iter_access_event_pages(
+                    datetime.fromtimestamp(window_start, tz=timezone.utc),
+                    datetime.fromtimestamp(window_end, tz=timezone.utc),
+                    priority=RequestPriority.BACKFILL,
+                ):
+                    events = verkada_event_schemas.parse_events(raw_events)
+                    async with write_lock:
+                        self.events_stored += await db.run_sync(event_store_service.store_events, events, True)
+                    fetched += len(raw_events)
+                    self.events_fetched += len(raw_events)
+                    metrics.BACKFILL_EVENTS.inc(len(raw_events))
+                async with write_lock:
+                    await db.run_sync(mark_window_completed, window_start, window_end, fetched)
+            self.windows_completed += 1
+
+# The backfill started through the admin API (the latest one, finished or not).
+_current_backfill: Optional[Backfill] = None
+_current_task: Optional[asyncio.Task] = None
+
+def get_current_backfill() -> Optional[Backfill]:
+    """Returns the backfill last started with start_backfill, or None."""
+    return _current_backfill
+
+def start_backfill(backfill: Backfill) -> None:
+    """
+    Runs a backfill as a background task of the running event loop.
+    Failures are logged (and reported through the backfill's status).
+
+    Raises:
+        BackfillRunningError: If the previously started backfill is still running.
+    """
+    global _current_backfill, _current_task
+    if _current_task is not None and not _current_task.done():
+        raise BackfillRunningError("A backfill is already running; wait for it to finish.")
+
+    async def run() -> None:
+        try:
+            await backfill.run()
+            logger.info("Backfill wrote %d events", backfill.events_stored)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Backfill failed")
+
+    _current_backfill = backfill
+    _current_task = asyncio.create_task(run())
+
+def cancel_backfill() -> None:
+    """Cancels the running backfill task, if any. Completed windows stay checkpointed."""
+    if _current_task is not None:
+        _current_task.cancel()
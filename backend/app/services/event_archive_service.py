@@ -0,0 +1,341 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError: # pragma: no cover - depends on the deployment
+    pa = None # type: ignore
+    pc = None # type: ignore
+    pq = None # type: ignore
+
+from ..core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+SECONDS_PER_DAY = 86400
+PARTITION_PREFIX = "date="
+
+class ArchiveUnavailableError(Exception):
+    """Raised when the event archive is used but pyarrow is not installed."""
+    def __init__(self, message="The event archive requires the 'pyarrow' package."):
+        self.message = message
+        super().__init__(self.message)
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ArchiveUnavailableError()
+
+def _archive_schema():
+    """Arrow schema of archived events. Repeated strings are dictionary-encoded."""
+    dictionary_string = pa.dictionary(pa.int32(), pa.string())
+    return pa.schema([
+        ("event_id", pa.string()),
+        ("timestamp", pa.int64()), # Unix seconds (UTC)
+        ("event_type", dictionary_string),
+        ("user_id", dictionary_string),
+        ("user_name", dictionary_string),
+        ("door_name", dictionary_string),
+    ])
+
+class EventArchive:
+    """
+    Day-partitioned, zstd-compressed Parquet archive of access events.
+
+    Layout: <root>/date=YYYY-MM-DD/part-*.parquet, one directory per UTC day.
+    Rows handed to append() are buffered and written when the buffer reaches
+    flush_rows or is older than flush_seconds. Days that have ended are
+    compacted into a single file so long ranges scan few, large files.
+
+    append() is called on the event loop (it is an ingest listener), so those
+    flushes run on a single background thread; call close() at shutdown to
+    wait for them and write what is still buffered. append() only sees the
+    buffer's age when events arrive, so run_flush_timer() runs alongside it to
+    flush a quiet buffer once flush_seconds have passed.
+
+    Reads memory-map only the partitions overlapping the requested range and
+    only the requested columns. Compaction swaps files under a lock that reads
+    also hold, so a report never sees a day both compacted and uncompacted.
+    """
+
+    def __init__(self, root_dir: str, flush_rows: int = 50000, flush_seconds: float = 3600.0):
+        _require_pyarrow()
+        self._root_dir = root_dir
+        self._flush_rows = flush_rows
+        self._flush_seconds = flush_seconds
+        self._buffer: List[Dict] = []
+        self._buffer_started_at: Optional[float] = None
+        self._lock = threading.Lock()
+        # Reason: Held while listing and reading files, and while compaction swaps them.
+        self._files_lock = threading.Lock()
+        # Reason: One worker serializes flushes, so two never compact the same day at once.
+        self._flush_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="event-archive")
+
+    @property
+    def root_dir(self) -> str:
+        return self._root_dir
+
+    def _partition_dir(self, day: date) -> str:
+        return os.path.join(self._root_dir, f"{PARTITION_PREFIX}{day.isoformat()}")
+
+    def append(self, rows: List[Dict]) -> None:
+        """
+        Buffers access_events rows (dictionaries with at least event_id, timestamp
+        and event_type) and schedules a background flush if the buffer is large
+        or old enough. Does not block on disk I/O, so it is suitable as an event
+        store ingest listener.
+        """
+        with self._lock:
+            if not self._buffer:
+                self._buffer_started_at = time.monotonic()
+            self._buffer.extend(rows)
+            should_flush = len(self._buffer) >= self._flush_rows or self._buffer_is_due()
+        if should_flush:
+            self._flush_executor.submit(self._flush_in_background)
+
+    def _buffer_is_due(self) -> bool:
+        return bool(self._buffer) and time.monotonic() - (self._buffer_started_at or 0) >= self._flush_seconds
+
+    def flush_if_due(self) -> bool:
+        """
+        Schedules a background flush if buffered rows are older than flush_seconds.
+
+        Returns:
+            True if a flush was scheduled.
+        """
+        with self._lock:
+            should_flush = self._buffer_is_due()
+        if should_flush:
+            self._flush_executor.submit(self._flush_in_background)
+        return should_flush
+
+    async def run_flush_timer(self, interval_seconds: Optional[float] = None) -> None:
+        """
+        Calls flush_if_due() every interval_seconds (default: a tenth of
+        flush_seconds, at most a minute) forever, so rows are written on time
+        even when no further events arrive. Intended to run as a background
+        task started at application startup.
+        """
+        if interval_seconds is None:
+            interval_seconds = min(60.0, self._flush_seconds / 10)
+        while True:
+            await asyncio.sleep(interval_seconds)
+            self.flush_if_due()
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Event archive flush failed")
+
+    def wait_for_flushes(self) -> None:
+        """Blocks until the background flushes scheduled so far have finished."""
+        self._flush_executor.submit(lambda: None).result()
+
+    def close(self) -> int:
+        """
+        Waits for background flushes, then writes the rows still buffered.
+        Blocking; call it from a thread (e.g. asyncio.to_thread) in async code.
+
+        Returns:
+            The number of rows written by the final flush.
+        """
+        self._flush_executor.shutdown(wait=True)
+        return self.flush()
+
+    def flush(self) -> int:
+        """
+        Writes buffered rows to their day partitions and compacts days that have ended.
+
+        Returns:
+            The number of rows written.
+        """
+        with self._lock:
+            rows, self._buffer = self._buffer, []
+            self._buffer_started_at = None
+        if not rows:
+            return 0
+        by_day: Dict[date, List[Dict]] = {}
+        for row in rows:
+            day = datetime.fromtimestamp(row["timestamp"], tz=timezone.utc).date()
+            by_day.setdefault(day, []).append(row)
+        today = datetime.now(timezone.utc).date()
+        for day, day_rows in by_day.items():
+            self.write_partition(day, day_rows)
+            if day < today:
+                self.compact_partition(day)
+        return len(rows)
+
+    def _write_temporary_file(self, day: date, table) -> tuple:
+        """
+        Writes a table, sorted by timestamp, under a temporary name in a day's
+        partition. Readers skip the file until it is renamed to the returned path.
+
+        Returns:
+            (temporary path, final path)
+        """
+        partition_dir = self._partition_dir(day)
+        os.makedirs(partition_dir, exist_ok=True)
+        path = os.path.join(partition_dir, f"part-{int(time.time())}-{uuid.uuid4().hex[:8]}.parquet")
+        tmp_path = path + ".tmp"
+        pq.write_table(table.sort_by("timestamp"), tmp_path, compression="zstd")
+        return tmp_path, path
+
+    def write_partition(self, day: date, rows: Sequence[Dict]) -> str:
+        """
+        Writes rows of one UTC day as a new Parquet file in that day's partition.
+
+        Returns:
+            The path of the written file.
+        """
+        schema = _archive_schema()
+        table = pa.Table.from_pydict(
+            {field.name: [row.get(field.name) for row in rows] for field in schema},
+            schema=schema,
+        )
+        tmp_path, path = self._write_temporary_file(day, table)
+        os.replace(tmp_path, path)
+        return path
+
+    def compact_partition(self, day: date) -> None:
+        """
+        Merges all files of a day partition into one, dropping duplicate event ids.
+        The merged file is written under a temporary name, then swapped in for
+        the part files while holding the lock reads take.
+        """
+        partition_dir = self._partition_dir(day)
+        paths = self._partition_files(partition_dir)
+        if len(paths) <= 1:
+            return
+        table = pa.concat_tables([pq.read_table(path, memory_map=True) for path in paths])
+        # Reason: The same event may be archived twice if it was ingested around a restart.
+        _, first_index = np.unique(table.column("event_id").to_numpy(zero_copy_only=False), return_index=True)
+        table = table.take(pa.array(np.sort(first_index)))
+        tmp_path, path = self._write_temporary_file(day, table)
+        with self._files_lock:
+            os.replace(tmp_path, path)
+            for old_path in paths:
+                os.remove(old_path)
+
+    @staticmethod
+    def _partition_files(partition_dir: str) -> List[str]:
+        if not os.path.isdir(partition_dir):
+            return []
+        return sorted(
+            os.path.join(partition_dir, name)
+            for name in os.listdir(partition_dir)
+            if name.endswith(".parquet")
+        )
+
+    def partitions_for_range(self, start_time: int, end_time: int) -> List[str]:
+        """
+        Returns the Parquet files of the day partitions overlapping [start_time, end_time).
+        """
+        if not os.path.isdir(self._root_dir) or end_time <= start_time:
+            return []
+        first_day = datetime.fromtimestamp(start_time, tz=timezone.utc).date()
+        last_day = datetime.fromtimestamp(end_time - 1, tz=timezone.utc).date()
+        files: List[str] = []
+        for name in sorted(os.listdir(self._root_dir)):
+            if not name.startswith(PARTITION_PREFIX):
+                continue
+            try:
+                day = date.fromisoformat(name[len(PARTITION_PREFIX):])
+            except ValueError:
+                continue
+            if first_day <= day <= last_day:
+                files.extend(self._partition_files(os.path.join(self._root_dir, name)))
+        return files
+
+    def read(self, start_time: int, end_time: int, columns: Sequence[str] = ("timestamp",)):
+        """
+        Reads the given columns of archived events in [start_time, end_time).
+
+        Only the overlapping day partitions are opened, and each file is
+        memory-mapped with just the requested columns decoded.
+
+        Returns:
+            A pyarrow.Table with the requested columns.
+        """
+        read_columns = list(dict.fromkeys([*columns, "timestamp"]))
+        with self._files_lock:
+            tables = [
+                pq.read_table(path, columns=read_columns, memory_map=True)
+                for path in self.partitions_for_range(start_time, end_time)
+            ]
+        schema = _archive_schema()
+        if not tables:
+            return pa.schema([schema.field(name) for name in columns]).empty_table()
+        table = pa.concat_tables(tables)
+        timestamps = table.column("timestamp")
+        mask = pc.and_(pc.greater_equal(timestamps, start_time), pc.less(timestamps, end_time))
+        return table.filter(mask).select(list(columns))
+
+    def hour_of_day_counts_by_year(self, start_time: int, end_time: int) -> Dict[int, List[int]]:
+        """
+        Counts archived events per UTC hour of day, separately for each calendar year.
+
+        Returns:
+            A mapping of year to a list of 24 hourly counts.
+        """
+        timestamps = self.read(start_time, end_time, ["timestamp"]).column("timestamp").to_numpy()
+        if timestamps.size == 0:
+            return {}
+        years = timestamps.astype("datetime64[s]").astype("datetime64[Y]").astype(np.int64) + 1970
+        first_year = int(years.min())
+        hours = (timestamps // 3600) % 24
+        counts = np.bincount((years - first_year) * 24 + hours, minlength=(int(years.max()) - first_year + 1) * 24)
+        return {
+            first_year + offset: counts[offset * 24:(offset + 1) * 24].tolist()
+            for offset in range(len(counts) // 24)
+            if counts[offset * 24:(offset + 1) * 24].any()
+        }
+
+    def door_counts(self, start_time: int, end_time: int) -> Dict[Optional[str], int]:
+        """
+        Counts archived events per door.
+
+        Returns:
+            A mapping of door name (None for events without a door) to event count.
+        """
+        doors = self.read(start_time, end_time, ["door_name"]).column("door_name")
+        if len(doors) == 0:
+            return {}
+        counts = pc.value_counts(doors.cast(pa.string()))
+        return {
+            item["values"]: item["counts"]
+            for item in counts.to_pylist()
+        }
+
+@lru_cache()
+def get_event_archive() -> Optional[EventArchive]:
+    """
+    Returns the application's EventArchive, or None if the archive is disabled.
+
+    Raises:
+        ArchiveUnavailableError: If the archive is enabled but pyarrow is not installed.
+    """
+    settings = get_settings()
+    if not settings.EVENT_ARCHIVE_ENABLED:
+        return None
+    return EventArchive(
+        settings.EVENT_ARCHIVE_DIR,
+        flush_rows=settings.EVENT_ARCHIVE_FLUSH_ROWS,
+        flush_seconds=settings.EVENT_ARCHIVE_FLUSH_SECONDS,
+    )
+
+def default_report_range(years: int = 2) -> tuple:
+    """Returns (start_time, end_time) covering the last `years` years up to now."""
+    end = datetime.now(timezone.utc)
+    return int((end - timedelta(days=365 * years)).timestamp()), int(end.timestamp())
@@ -0,0 +1,110 @@
+import csv
+import io
+import json
+import logging
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..db import models as db_models
+from ..db.session import AsyncSessionLocal
+from ..models import verkada_event as verkada_event_schemas
+from . import event_store_service
+
+logger = logging.getLogger(__name__)
+
+EXPORT_COLUMNS = ("event_id", "event_type", "timestamp", "user_id", "user_name", "door_name", "device_id", "site_id")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+class ExportFailedError(Exception):
+    """Raised by a rows source when the export cannot be completed (e.g. an upstream error)."""
+    def __init__(self, message: str, status_code: int = 500):
+        self.message = message
+        self.status_code = status_code
+        super().__init__(self.message)
+
+def event_to_export_row(event: verkada_event_schemas.VerkadaEvent) -> Dict:
+    """
+    Maps a VerkadaEvent to an export row with an ISO 8601 UTC timestamp.
+    """
+    row = event_store_service.event_to_row(event)
+    row["timestamp"] = datetime.fromtimestamp(row["timestamp"], tz=timezone.utc).isoformat()
+    return row
+
+def stored_event_to_export_row(event: db_models.AccessEvent) -> Dict:
+    """
+    Maps a stored AccessEvent to an export row without going through Pydantic.
+    """
+    row = {column: getattr(event, column) for column in EXPORT_COLUMNS}
+    row["timestamp"] = datetime.fromtimestamp(event.timestamp, tz=timezone.utc).isoformat()
+    return row
+
+async def iter_stored_export_rows(
+    params: verkada_event_schemas.VerkadaEventQueryParams,
+    batch_size: int = 1000,
+) -> AsyncIterator[List[Dict]]:
+    """
+    Yields batches of export rows read from the local event store.
+
+    Each batch is a short keyset query on its own async session, so a long
+    export neither blocks the event loop nor holds a read transaction open
+    while the client is slow to consume the response.
+    """
+    def fetch_batch(db: Session, after: Optional[Tuple[int, str]]) -> Tuple[List[Dict], Optional[Tuple[int, str]]]:
+        events = event_store_service.get_events_after(db, params, after=after, limit=batch_size)
+        last_key = (events[-1].timestamp, events[-1].event_id) if events else None
+        return [stored_event_to_export_row(event) for event in events], last_key
+
+    after: Optional[Tuple[int, str]] = None
+    while True:
+        async with AsyncSessionLocal() as db:
+            rows, after = await db.run_sync(fetch_batch, after)
+        if rows:
+            yield rows
+        if len(rows) < batch_size:
+            return
+
+def format_ndjson(rows: Iterable[Dict]) -> str:
+    """Formats rows as newline-delimited JSON."""
+    return "".join(json.dumps(row) + "\n" for row in rows)
+
+def format_csv(rows: Iterable[Dict], include_header: bool = False) -> str:
+    """Formats rows as CSV lines in EXPORT_COLUMNS order, optionally preceded by a header."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction="ignore")
+    if include_header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+def format_error(error: ExportFailedError, export_format: str) -> str:
+    """
+    Formats the record that ends an incomplete export: an NDJSON object with
+    an "error" key, or a CSV line starting with "# export incomplete:".
+    """
+    if export_format == "csv":
+        message = " ".join(error.message.split()) # Keep it on one line
+        return f"# export incomplete: {error.status_code} {message}\n"
+    return json.dumps({"error": error.message, "status_code": error.status_code, "complete": False}) + "\n"
+
+async def stream_export(rows_batches: AsyncIterator[List[Dict]], export_format: str) -> AsyncIterator[str]:
+    """
+    Serializes batches of export rows as NDJSON or CSV chunks.
+
+    The CSV header is sent immediately, so the first byte reaches the client
+    before the first batch has been fetched. Because the 200 status is sent
+    by then too, a failure while streaming ends the export with an in-band
+    error record (see format_error) instead of a silently truncated file.
+    """
+    if export_format == "csv":
+        yield format_csv([], include_header=True)
+    try:
+        async for rows in rows_batches:
+            yield format_csv(rows) if export_format == "csv" else format_ndjson(rows)
+    except ExportFailedError as export_err:
+        logger.warning("Export ended early: %s", export_err.message)
+        yield format_error(export_err, export_format)
+    except Exception as unexpected_err:
+        logger.exception("Export failed while streaming")
+        yield format_error(ExportFailedError(f"Export failed: {unexpected_err}"), export_format)
@@ -0,0 +1,947 @@
+import base64
+import binascii
+import json
+from collections import Counter, OrderedDict, defaultdict
+from datetime import datetime, timezone, tzinfo
+from itertools import groupby
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import delete, func, insert, literal, or_, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..core import metrics
+from ..core.event_batch import to_epoch_seconds
+from ..db import models as db_models
+from ..models import verkada_event as verkada_event_schemas
+from . import name_search_service
+from .aggregation import BloomFilter, HyperLogLog, SpaceSavingSketch
+
+# Columns refreshed when an already stored event is seen again.
+_UPSERT_COLUMNS = ("event_type", "timestamp", "user_id", "user_name", "door_name", "device_id", "site_id")
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_DAY = 86400
+
+# Items monitored by each per-day top-K sketch. Counts of items outside a
+# day's top TOP_K_SKETCH_CAPACITY are approximate (see SpaceSavingSketch).
+TOP_K_SKETCH_CAPACITY = 1000
+# Dimensions with per-day top-K sketches, mapped to the access_events column they count.
+TOP_K_DIMENSIONS = {"door": "door_name", "user": "user_id"}
+# Precision of the per-hour, per-door distinct user sketches: 4096 registers,
+# at most 4 KB per sketch, about 1.6% relative error.
+USER_SKETCH_PRECISION = 12
+
+logger = logging.getLogger(__name__)
+
+# Rows of access_events read per chunk when building the event_id filter.
+_EVENT_ID_SCAN_CHUNK = 50000
+# Sketch rows (at most 4 KB each) read per chunk by count_distinct_users.
+_USER_SKETCH_SCAN_CHUNK = 1000
+
+# Callables notified with the rows of newly stored events after each commit,
+# mapped to whether they also receive historical (backfilled) events.
+_ingest_listeners: Dict[Callable[[List[Dict]], None], bool] = {}
+
+def add_ingest_listener(listener: Callable[[List[Dict]], None], historical: bool = False) -> None:
+    """
+    Registers a callable that receives the access_events rows (as dictionaries)
+    of events stored for the first time, after they are committed.
+    Events stored with store_events(historical=True), i.e. by a backfill, only
+    reach listeners registered with historical=True; consumers of new events
+    (e.g. the live feed) must not be flooded with months of old ones.
+    Listener errors are logged and do not affect ingestion.
+    """
+    _ingest_listeners[listener] = historical
+
+def remove_ingest_listener(listener: Callable[[List[Dict]], None]) -> None:
+    """Unregisters a listener added with add_ingest_listener."""
+    _ingest_listeners.pop(listener, None)
+
+def _notify_ingest_listeners(new_rows: List[Dict], historical: bool = False) -> None:
+    """Passes newly stored rows to every registered listener that takes them."""
+    if not new_rows:
+        return
+    for listener, takes_historical in list(_ingest_listeners.items()):
+        if historical and not takes_historical:
+            continue
+        try:
+            listener(new_rows)
+        except Exception:
+            logger.exception("Ingest listener %r failed", listener)
+
+def event_to_row(event: verkada_event_schemas.VerkadaEvent) -> Dict:
+    """
+    Maps a VerkadaEvent to a dictionary of access_events column values.
+    """
+    return {
+        "event_id": event.event_id,
+        "event_type": event.event_type,
+        "timestamp": to_epoch_seconds(event.timestamp),
+        "user_id": event.user_id,
+        "user_name": event.user_name,
+        "door_name": event.door_name,
+        "device_id": event.device_id,
+        "site_id": event.site_id,
+    }
+
+def row_to_event(row: db_models.AccessEvent) -> verkada_event_schemas.VerkadaEvent:
+    """
+    Maps a stored AccessEvent back to the VerkadaEvent schema used by the API.
+    """
+    return verkada_event_schemas.VerkadaEvent(
+        event_id=row.event_id,
+        event_type=row.event_type,
+        timestamp=datetime.fromtimestamp(row.timestamp, tz=timezone.utc),
+        user_id=row.user_id,
+        user_name=row.user_name,
+        door_name=row.door_name,
+        device_id=row.device_id,
+        site_id=row.site_id,
+    )
+
+def hour_bucket(timestamp: int) -> int:
+    """Returns the Unix timestamp of the start of the UTC hour containing timestamp."""
+    return timestamp - timestamp % SECONDS_PER_HOUR
+
+def day_bucket(timestamp: int) -> int:
+    """Returns the Unix timestamp of the start of the UTC day containing timestamp."""
+    return timestamp - timestamp % SECONDS_PER_DAY
+
+class EventIdIndex:
+    """
+    In-memory view of the event_ids in access_events that lets store_events
+    skip most database work for duplicates and most lookups for new events.
+
+    - recent maps the newest recent_size event ids to a fingerprint of their
+      stored row. A re-delivered event (sync overlap, retry, webhook
+      redelivery) whose row is unchanged is dropped without touching the
+      database; a changed one is still upserted.
+    - bloom holds every stored event id. An id it does not contain was never
+      stored by this process, so the new event is inserted without looking it
+      up first.
+
+    Built from the store at startup (enable_event_id_index) and only updated
+    after commits, so it never claims an event is stored when it is not.
+    Writes by other processes (e.g. app.cli backfill) are not reflected; see
+    store_events for how they stay correct.
+    """
+
+    def __init__(self, capacity: int, error_rate: float, recent_size: int):
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.recent_size = recent_size
+        self.recent: "OrderedDict[str, int]" = OrderedDict()
+
+    @staticmethod
+    def fingerprint(row: Dict) -> int:
+        return hash(tuple(row[column] for column in _UPSERT_COLUMNS))
+
+    def is_stored_unchanged(self, row: Dict) -> bool:
+        """True if the row's event was stored recently with exactly these values."""
+        return self.recent.get(row["event_id"]) == self.fingerprint(row)
+
+    def remember(self, rows: List[Dict]) -> None:
+        """Records committed rows, forgetting the oldest recent ids beyond recent_size."""
+        self.bloom.add_many([row["event_id"] for row in rows])
+        for row in rows:
+            self.recent[row["event_id"]] = self.fingerprint(row)
+            self.recent.move_to_end(row["event_id"])
+        while len(self.recent) > self.recent_size:
+            self.recent.popitem(last=False)
+
+# The event_id index used by store_events, or None (every batch is looked up in the database).
+_event_id_index: Optional[EventIdIndex] = None
+
+def enable_event_id_index(db: Session, capacity: int, error_rate: float, recent_size: int) -> EventIdIndex:
+    """
+    Builds the event_id index from all stored events and makes store_events use it.
+    The Bloom filter is sized for at least twice the stored events, so it has
+    room to grow until the next restart.
+    """
+    global _event_id_index
+    event = db_models.AccessEvent
+    stored = db.query(func.count(event.id)).scalar() or 0
+    index = EventIdIndex(max(capacity, 2 * stored), error_rate, recent_size)
+    for chunk in db.execute(select(event.event_id).execution_options(yield_per=_EVENT_ID_SCAN_CHUNK)).partitions():
+        index.bloom.add_many([event_id for (event_id,) in chunk])
+    # Reason: Overlapping fetches re-read the newest events; remember them exactly, oldest first.
+    newest = db.query(event).order_by(event.timestamp.desc(), event.event_id.desc()).limit(recent_size).all()
+    for row in reversed(newest):
+        index.recent[row.event_id] = EventIdIndex.fingerprint(
+            {column: getattr(row, column) for column in _UPSERT_COLUMNS}
+        )
+    _event_id_index = index
+    logger.info("Event id index built from %d stored events", stored)
+    return index
+
+def disable_event_id_index() -> None:
+    """Stops store_events from using the event_id index."""
+    global _event_id_index
+    _event_id_index = None
+
+def store_events(
+    db: Session,
+    events: Iterable[verkada_event_schemas.VerkadaEvent],
+    historical: bool = False,
+) -> int:
+    """
+    Upserts access events into the local store, keyed on event_id, and adds
+    events not seen before to the hourly rollups, the per-day top-K sketches,
+    the hourly distinct user sketches and the name index in the same transaction.
+    Ingest listeners are then notified of the events not seen before (only
+    those registered for historical events when historical is set).
+
+    An already stored event that arrives with different values is moved:
+    its old values are subtracted from the rollups and name counts and the
+    new ones added. The top-K and distinct user sketches cannot subtract, so
+    the days and hours it leaves and enters are recomputed from the stored events.
+
+    With the event_id index enabled, recently stored events that arrive again
+    unchanged are dropped before any query, and events whose id the Bloom
+    filter has never seen are inserted without a lookup.
+
+    Args:
+        db: The database session.
+        events: The events to store.
+        historical: True for bulk imports of past events (backfills).
+
+    Returns:
+        The number of events written (inserted or updated).
+    """
+    rows = list({row["event_id"]: row for row in map(event_to_row, events)}.values())
+    index = _event_id_index
+    if index is not None:
+        received = len(rows)
+        rows = [row for row in rows if not index.is_stored_unchanged(row)]
+        metrics.EVENT_INGEST.labels(outcome="duplicate_memory").inc(received - len(rows))
+    if not rows:
+        return 0
+
+    if index is not None:
+        maybe_stored = index.bloom.contains_many([row["event_id"] for row in rows])
+        unseen_rows = [row for row, seen in zip(rows, maybe_stored) if not seen]
+        seen_rows = [row for row, seen in zip(rows, maybe_stored) if seen]
+    else:
+        unseen_rows, seen_rows = [], rows
+
+    new_rows: List[Dict] = []
+    if unseen_rows:
+        # Reason: Another process may have stored these ids since the filter was
+        # built; DO NOTHING + RETURNING reports which rows were really inserted.
+        inserted_ids = set(db.scalars(
+            sqlite_insert(db_models.AccessEvent).values(unseen_rows)
+            .on_conflict_do_nothing(index_elements=[db_models.AccessEvent.event_id])
+            .returning(db_models.AccessEvent.event_id)
+        ))
+        new_rows.extend(row for row in unseen_rows if row["event_id"] in inserted_ids)
+        seen_rows.extend(row for row in unseen_rows if row["event_id"] not in inserted_ids)
+    changed: List[Tuple[Dict, Dict]] = [] # (old row, new row) of stored events whose values change
+    if seen_rows:
+        event = db_models.AccessEvent
+        stored_rows = {
+            stored["event_id"]: stored
+            for stored in db.execute(
+                select(event.event_id, *(getattr(event, column) for column in _UPSERT_COLUMNS))
+                .where(event.event_id.in_([row["event_id"] for row in seen_rows]))
+            ).mappings()
+        }
+        seen_new_rows = [row for row in seen_rows if row["event_id"] not in stored_rows]
+        for row in seen_rows:
+            stored = stored_rows.get(row["event_id"])
+            if stored is not None and any(stored[column] != row[column] for column in _UPSERT_COLUMNS):
+                changed.append((dict(stored), row))
+        if index is not None:
+            metrics.EVENT_ID_FILTER_FALSE_POSITIVES.inc(len(seen_new_rows))
+        new_rows.extend(seen_new_rows)
+        stmt = sqlite_insert(db_models.AccessEvent).values(seen_rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[db_models.AccessEvent.event_id],
+            set_={column: stmt.excluded[column] for column in _UPSERT_COLUMNS},
+        )
+        db.execute(stmt)
+    _add_to_hourly_rollups(db, new_rows + [row for _, row in changed], [old for old, _ in changed])
+    _add_to_top_k_sketches(db, new_rows)
+    _add_to_user_sketches(db, new_rows)
+    name_search_service.add_names(db, new_rows)
+    if changed:
+        _move_changed_events(db, changed)
+    db.commit()
+    metrics.EVENT_INGEST.labels(outcome="new").inc(len(new_rows))
+    metrics.EVENT_INGEST.labels(outcome="duplicate_store").inc(len(rows) - len(new_rows))
+    if index is not None:
+        index.remember(rows)
+    _notify_ingest_listeners(new_rows, historical)
+    return len(rows)
+
+def _move_changed_events(db: Session, changed: List[Tuple[Dict, Dict]]) -> None:
+    """
+    Updates the name index and the sketches for stored events whose values
+    changed, given (old row, new row) pairs; the rollups are adjusted by
+    the caller. Does not commit; runs after the events were updated.
+    """
+    name_search_service.remove_names(db, [old for old, _ in changed])
+    name_search_service.add_names(db, [new for _, new in changed])
+    # Reason: Space-Saving and HyperLogLog sketches cannot forget an item, so
+    # the affected buckets are recomputed from the (already updated) events.
+    _rebuild_top_k_days(db, {day_bucket(row["timestamp"]) for pair in changed for row in pair})
+    _rebuild_user_sketch_hours(db, {hour_bucket(row["timestamp"]) for pair in changed for row in pair})
+
+def _add_to_hourly_rollups(db: Session, rows: List[Dict], removed_rows: Sequence[Dict] = ()) -> None:
+    """
+    Increments the hourly rollup counts (per door, and per door and user) for
+    newly stored event rows, and decrements them for removed_rows (the old
+    values of events that were updated). Does not commit; runs inside the
+    caller's transaction.
+    """
+    def door_key(row: Dict) -> tuple:
+        return (hour_bucket(row["timestamp"]), row["door_name"] or "", row["event_type"])
+
+    def user_key(row: Dict) -> tuple:
+        return (hour_bucket(row["timestamp"]), row["door_name"] or "", row["user_id"] or "", row["event_type"])
+
+    for rollup_model, key_columns, key in (
+        (db_models.AccessEventHourlyRollup, ("bucket_start", "door_name", "event_type"), door_key),
+        (db_models.AccessEventUserHourlyRollup, ("bucket_start", "door_name", "user_id", "event_type"), user_key),
+    ):
+        counts = Counter(map(key, rows))
+        counts.subtract(map(key, removed_rows))
+        _increment_rollup(db, rollup_model, key_columns, Counter({k: v for k, v in counts.items() if v}))
+
+def _increment_rollup(db: Session, rollup_model, key_columns: Tuple[str, ...], counts: Counter) -> None:
+    """
+    Adds counts (keyed by tuples of key_columns values, possibly negative) to
+    a rollup table. Rows whose count drops to zero are deleted.
+    """
+    if not counts:
+        return
+    stmt = sqlite_insert(rollup_model).values([
+        dict(zip(key_columns, key), event_count=count) for key, count in counts.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(key_columns),
+        set_={"event_count": rollup_model.event_count + stmt.excluded.event_count},
+    )
+    db.execute(stmt)
+    for key, count in counts.items():
+        if count < 0:
+            db.execute(
+                delete(rollup_model)
+                .where(*(getattr(rollup_model, column) == value for column, value in zip(key_columns, key)))
+                .where(rollup_model.event_count <= 0)
+            )
+
+def rebuild_hourly_rollups(db: Session) -> None:
+    """
+    Recomputes the hourly rollups from all stored events.
+    Used to initialise the rollups for a store populated before they existed.
+    """
+    event = db_models.AccessEvent
+    bucket_start = (event.timestamp - event.timestamp % SECONDS_PER_HOUR).label("bucket_start")
+    door_name = func.coalesce(event.door_name, "").label("door_name")
+    user_id = func.coalesce(event.user_id, "").label("user_id")
+    for rollup_model, key_columns in (
+        (db_models.AccessEventHourlyRollup, (bucket_start, door_name, event.event_type)),
+        (db_models.AccessEventUserHourlyRollup, (bucket_start, door_name, user_id, event.event_type)),
+    ):
+        aggregated = select(*key_columns, func.count(event.id)).group_by(*key_columns)
+        db.query(rollup_model).delete()
+        db.execute(
+            insert(rollup_model).from_select(
+                [column.key for column in key_columns] + ["event_count"], aggregated
+            )
+        )
+    db.commit()
+
+def ensure_hourly_rollups(db: Session) -> None:
+    """
+    Rebuilds the hourly rollups if events are stored but a rollup table is
+    still empty (e.g. it was added after the events were stored).
+    """
+    has_rollups = all(
+        db.query(rollup_model.bucket_start).first() is not None
+        for rollup_model in (db_models.AccessEventHourlyRollup, db_models.AccessEventUserHourlyRollup)
+    )
+    has_events = db.query(db_models.AccessEvent.id).first() is not None
+    if has_events and not has_rollups:
+        rebuild_hourly_rollups(db)
+
+def _add_to_top_k_sketches(db: Session, rows: List[Dict]) -> None:
+    """
+    Adds newly stored event rows to the per-day top-K sketches of each of
+    TOP_K_DIMENSIONS. Events without a value for a dimension are not counted
+    in it. Does not commit; runs inside the caller's transaction.
+    """
+    counts: Dict[Tuple[int, str], Counter] = defaultdict(Counter)
+    for row in rows:
+        for dimension, column in TOP_K_DIMENSIONS.items():
+            if row[column]:
+                counts[(day_bucket(row["timestamp"]), dimension)][row[column]] += 1
+    for (day_start, dimension), item_counts in counts.items():
+        stored = db.get(db_models.AccessEventTopKSketch, (day_start, dimension))
+        if stored is None:
+            stored = db_models.AccessEventTopKSketch(day_start=day_start, dimension=dimension)
+            sketch = SpaceSavingSketch(TOP_K_SKETCH_CAPACITY)
+            db.add(stored)
+        else:
+            sketch = SpaceSavingSketch.from_dict(json.loads(stored.sketch))
+        sketch.add_counts(item_counts)
+        stored.sketch = json.dumps(sketch.to_dict(), separators=(",", ":"))
+
+def rebuild_top_k_sketches(db: Session) -> None:
+    """
+    Recomputes the per-day top-K sketches from all stored events.
+    Used to initialise the sketches for a store populated before they existed.
+    """
+    _rebuild_top_k_days(db)
+    db.commit()
+
+def _time_buckets_filter(bucket_starts: Iterable[int], bucket_seconds: int):
+    """Returns a condition matching events in any of the given buckets (usable with the timestamp index)."""
+    return or_(*(
+        db_models.AccessEvent.timestamp.between(bucket_start, bucket_start + bucket_seconds - 1)
+        for bucket_start in sorted(bucket_starts)
+    ))
+
+def _rebuild_top_k_days(db: Session, day_starts: Optional[Set[int]] = None) -> None:
+    """
+    Recomputes the top-K sketches of the given UTC days (all days if None)
+    from the stored events. Does not commit.
+    """
+    event = db_models.AccessEvent
+    day_start = (event.timestamp - event.timestamp % SECONDS_PER_DAY).label("day_start")
+    stale_sketches = db.query(db_models.AccessEventTopKSketch)
+    if day_starts is not None:
+        if not day_starts:
+            return
+        stale_sketches = stale_sketches.filter(db_models.AccessEventTopKSketch.day_start.in_(day_starts))
+    stale_sketches.delete(synchronize_session=False)
+    for dimension, column_name in TOP_K_DIMENSIONS.items():
+        column = getattr(event, column_name)
+        counts: Dict[int, Dict[str, int]] = defaultdict(dict)
+        query = select(day_start, column, func.count(event.id)).where(column.is_not(None), column != "")
+        if day_starts is not None:
+            query = query.where(_time_buckets_filter(day_starts, SECONDS_PER_DAY))
+        for row_day_start, value, count in db.execute(query.group_by(day_start, column)):
+            counts[row_day_start][value] = count
+        for row_day_start, item_counts in counts.items():
+            sketch = SpaceSavingSketch(TOP_K_SKETCH_CAPACITY)
+            sketch.add_counts(item_counts)
+            db.add(db_models.AccessEventTopKSketch(
+                day_start=row_day_start,
+                dimension=dimension,
+                sketch=json.dumps(sketch.to_dict(), separators=(",", ":")),
+            ))
+
+def ensure_top_k_sketches(db: Session) -> None:
+    """
+    Rebuilds the per-day top-K sketches if events are stored but no sketches exist yet.
+    """
+    has_sketches = db.query(db_models.AccessEventTopKSketch.day_start).first() is not None
+    has_events = db.query(db_models.AccessEvent.id).first() is not None
+    if has_events and not has_sketches:
+        rebuild_top_k_sketches(db)
+
+def merge_top_k_sketches(db: Session, dimension: str, start_time: int, end_time: int) -> SpaceSavingSketch:
+    """
+    Merges the per-day top-K sketches of a dimension for the UTC days
+    overlapping [start_time, end_time) (the range is widened to whole days).
+
+    Raises:
+        ValueError: If the dimension has no sketches (see TOP_K_DIMENSIONS).
+    """
+    if dimension not in TOP_K_DIMENSIONS:
+        raise ValueError(f"Top-K summaries exist for {', '.join(TOP_K_DIMENSIONS)}; got {dimension}.")
+    sketch_model = db_models.AccessEventTopKSketch
+    payloads = db.scalars(
+        select(sketch_model.sketch)
+        .where(sketch_model.dimension == dimension)
+        .where(sketch_model.day_start >= day_bucket(start_time))
+        .where(sketch_model.day_start < end_time)
+    )
+    return SpaceSavingSketch.merge_all(
+        (SpaceSavingSketch.from_dict(json.loads(payload)) for payload in payloads), TOP_K_SKETCH_CAPACITY
+    )
+
+def _user_key(row: Dict) -> Optional[str]:
+    """Identifies the person of an event row for distinct counting: the user id, else the user name."""
+    return row["user_id"] or row["user_name"] or None
+
+def _add_to_user_sketches(db: Session, rows: List[Dict]) -> None:
+    """
+    Adds the users of newly stored event rows to the hourly distinct user
+    sketches, for all doors and per door. Events without a user are not
+    counted. Does not commit; runs inside the caller's transaction.
+    """
+    users_by_hour: Dict[tuple, set] = defaultdict(set)
+    users_by_door_hour: Dict[tuple, set] = defaultdict(set)
+    for row in rows:
+        user = _user_key(row)
+        if user:
+            bucket_start = hour_bucket(row["timestamp"])
+            users_by_hour[(bucket_start,)].add(user)
+            users_by_door_hour[(bucket_start, row["door_name"] or "")].add(user)
+    _update_user_sketches(db, db_models.AccessEventHourlyUserSketch, ("bucket_start",), users_by_hour)
+    _update_user_sketches(
+        db, db_models.AccessEventDoorHourlyUserSketch, ("bucket_start", "door_name"), users_by_door_hour
+    )
+
+def _update_user_sketches(db: Session, sketch_model, key_columns: Tuple[str, ...], users: Dict[tuple, set]) -> None:
+    """Adds users (keyed by tuples of key_columns values, bucket_start first) to a sketch table."""
+    if not users:
+        return
+    stored = {
+        tuple(getattr(row, column) for column in key_columns): row
+        for row in db.scalars(
+            select(sketch_model).where(sketch_model.bucket_start.in_({key[0] for key in users}))
+        )
+    }
+    for key, key_users in users.items():
+        row = stored.get(key)
+        sketch = HyperLogLog.from_bytes(row.sketch) if row else HyperLogLog(USER_SKETCH_PRECISION)
+        for user in key_users:
+            sketch.add(user)
+        if row is None:
+            db.add(sketch_model(**dict(zip(key_columns, key)), sketch=sketch.to_bytes()))
+        else:
+            row.sketch = sketch.to_bytes()
+
+def rebuild_user_sketches(db: Session) -> None:
+    """
+    Recomputes the hourly distinct user sketches from all stored events, one
+    hour at a time. Used to initialise them for a store populated before they existed.
+    """
+    _rebuild_user_sketch_hours(db)
+    db.commit()
+
+def _rebuild_user_sketch_hours(db: Session, bucket_starts: Optional[Set[int]] = None) -> None:
+    """
+    Recomputes the distinct user sketches (all doors and per door) of the
+    given UTC hours (all hours if None) from the stored events. Does not commit.
+    """
+    event = db_models.AccessEvent
+    bucket_start = (event.timestamp - event.timestamp % SECONDS_PER_HOUR).label("bucket_start")
+    door_name = func.coalesce(event.door_name, "").label("door_name")
+    user = func.coalesce(func.nullif(event.user_id, ""), func.nullif(event.user_name, "")).label("user")
+    query = select(bucket_start, door_name, user).where(user.is_not(None))
+    for sketch_model in (db_models.AccessEventHourlyUserSketch, db_models.AccessEventDoorHourlyUserSketch):
+        stale_sketches = db.query(sketch_model)
+        if bucket_starts is not None:
+            stale_sketches = stale_sketches.filter(sketch_model.bucket_start.in_(bucket_starts))
+        stale_sketches.delete(synchronize_session=False)
+    if bucket_starts is not None:
+        if not bucket_starts:
+            return
+        query = query.where(_time_buckets_filter(bucket_starts, SECONDS_PER_HOUR))
+    rows = db.execute(query.distinct().order_by(bucket_start))
+    for row_bucket, bucket_rows in groupby(rows, key=lambda row: row.bucket_start):
+        door_sketches: Dict[str, HyperLogLog] = {}
+        for _, row_door, row_user in bucket_rows:
+            door_sketches.setdefault(row_door, HyperLogLog(USER_SKETCH_PRECISION)).add(row_user)
+        hour_sketch = HyperLogLog(USER_SKETCH_PRECISION)
+        hour_sketch.merge_bytes([sketch.to_bytes() for sketch in door_sketches.values()])
+        db.add(db_models.AccessEventHourlyUserSketch(bucket_start=row_bucket, sketch=hour_sketch.to_bytes()))
+        db.add_all(
+            db_models.AccessEventDoorHourlyUserSketch(bucket_start=row_bucket, door_name=door, sketch=sketch.to_bytes())
+            for door, sketch in door_sketches.items()
+        )
+
+def ensure_user_sketches(db: Session) -> None:
+    """
+    Rebuilds the hourly distinct user sketches if events are stored but no sketches exist yet.
+    """
+    has_sketches = db.query(db_models.AccessEventHourlyUserSketch.bucket_start).first() is not None
+    has_events = db.query(db_models.AccessEvent.id).first() is not None
+    if has_events and not has_sketches:
+        rebuild_user_sketches(db)
+
+def get_latest_event_timestamp(db: Session) -> Optional[int]:
+    """
+    Returns the Unix timestamp of the newest stored event, or None if the store is empty.
+    """
+    return db.query(func.max(db_models.AccessEvent.timestamp)).scalar()
+
+def get_sync_checkpoint(db: Session, name: str) -> Optional[int]:
+    """
+    Returns the synced_until timestamp of a sync job, or None if it never completed a pass.
+    """
+    checkpoint = db.get(db_models.SyncCheckpoint, name)
+    return checkpoint.synced_until if checkpoint else None
+
+def set_sync_checkpoint(db: Session, name: str, synced_until: int) -> None:
+    """
+    Records that a sync job has fetched everything up to synced_until and commits.
+    """
+    db.merge(db_models.SyncCheckpoint(name=name, synced_until=synced_until))
+    db.commit()
+
+def split_csv(value: Optional[str]) -> List[str]:
+    """Splits a comma-separated query parameter into a list of non-empty values."""
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def _filtered_query(db: Session, params: verkada_event_schemas.VerkadaEventQueryParams):
+    """
+    Builds an AccessEvent query applying the time range and filters from the API query params.
+    """
+    query = db.query(db_models.AccessEvent)
+    if params.start_time is not None:
+        query = query.filter(db_models.AccessEvent.timestamp >= params.start_time)
+    if params.end_time is not None:
+        query = query.filter(db_models.AccessEvent.timestamp < params.end_time)
+    for column, value in (
+        (db_models.AccessEvent.event_type, params.event_type),
+        (db_models.AccessEvent.site_id, params.site_id),
+        (db_models.AccessEvent.device_id, params.device_id),
+        (db_models.AccessEvent.user_id, params.user_id),
+        (db_models.AccessEvent.user_name, params.user_name),
+        (db_models.AccessEvent.door_name, params.door_name),
+    ):
+        values = split_csv(value)
+        if values:
+            query = query.filter(column.in_(values))
+    return query
+
+def encode_cursor(timestamp: int, event_id: str, direction: str, order: str) -> str:
+    """
+    Encodes an opaque page cursor pointing just past (direction "next") or just
+    before (direction "prev") the event with the given (timestamp, event_id) key.
+    """
+    payload = json.dumps({"t": timestamp, "e": event_id, "d": direction, "o": order}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[int, str, str, str]:
+    """
+    Decodes a cursor produced by encode_cursor.
+
+    Returns:
+        A tuple of (timestamp, event_id, direction, order).
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        timestamp, event_id, direction, order = payload["t"], payload["e"], payload["d"], payload["o"]
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, TypeError, KeyError) as decode_err:
+        raise ValueError("Malformed page cursor.") from decode_err
+    if not isinstance(timestamp, int) or not isinstance(event_id, str) \
+            or direction not in ("next", "prev") or order not in ("asc", "desc"):
+        raise ValueError("Malformed page cursor.")
+    return timestamp, event_id, direction, order
+
+def query_events(
+    db: Session,
+    params: verkada_event_schemas.VerkadaEventQueryParams,
+) -> Tuple[List[verkada_event_schemas.VerkadaEvent], Optional[str], Optional[str]]:
+    """
+    Returns one page of stored events matching the query params, using keyset
+    pagination on (timestamp, event_id).
+
+    params.page_token is a cursor returned by a previous call (or None for the
+    first page) and params.order selects newest-first ("desc", the default) or
+    oldest-first ("asc"). Each page is a single range scan of the
+    (timestamp, event_id) index that starts at the cursor, so deep pages cost the
+    same as the first one. To jump to a point in time, pass start_time (asc) or
+    end_time (desc).
+
+    Args:
+        db: The database session.
+        params: The /events query parameters (page_size limits the page).
+
+    Returns:
+        A tuple of (events, next_page_token, prev_page_token); a token is None
+        when there is no page in that direction.
+
+    Raises:
+        ValueError: If the page_token is malformed or was issued for another order.
+    """
+    event = db_models.AccessEvent
+    page_size = params.page_size or 100
+    order = params.order or "desc"
+    query = _filtered_query(db, params)
+
+    direction = "next"
+    if params.page_token:
+        timestamp, event_id, direction, cursor_order = decode_cursor(params.page_token)
+        if cursor_order != order:
+            raise ValueError("The page cursor was issued for a different sort order.")
+        # Walking forward in a descending listing (or backward in an ascending one)
+        # means moving to smaller keys.
+        towards_smaller_keys = (direction == "next") == (order == "desc")
+        if towards_smaller_keys:
+            query = query.filter(
+                (event.timestamp < timestamp) | ((event.timestamp == timestamp) & (event.event_id < event_id))
+            )
+        else:
+            query = query.filter(
+                (event.timestamp > timestamp) | ((event.timestamp == timestamp) & (event.event_id > event_id))
+            )
+
+    # Reason: Backward pages are read in the opposite order so the scan starts at the cursor.
+    scan_descending = (order == "desc") == (direction == "next")
+    sort_columns = (event.timestamp.desc(), event.event_id.desc()) if scan_descending \
+        else (event.timestamp.asc(), event.event_id.asc())
+    rows = query.order_by(*sort_columns).limit(page_size + 1).all()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if direction == "prev":
+        rows.reverse()
+    if not rows:
+        return [], None, None
+
+    first, last = rows[0], rows[-1]
+    # A forward page always has a page before it (unless it is the first), and a
+    # backward page always has the page it was reached from after it.
+    has_next = has_more if direction == "next" else True
+    has_prev = bool(params.page_token) if direction == "next" else has_more
+    next_page_token = encode_cursor(last.timestamp, last.event_id, "next", order) if has_next else None
+    prev_page_token = encode_cursor(first.timestamp, first.event_id, "prev", order) if has_prev else None
+    return [row_to_event(row) for row in rows], next_page_token, prev_page_token
+
+def ensure_keyset_index(db: Session) -> None:
+    """
+    Creates the (timestamp, event_id) pagination index on databases whose
+    access_events table predates it (create_all does not add indexes to
+    existing tables).
+    """
+    for index in db_models.AccessEvent.__table__.indexes:
+        if index.name == "ix_access_events_timestamp_event_id":
+            index.create(bind=db.get_bind(), checkfirst=True)
+
+def get_events_after(
+    db: Session,
+    params: verkada_event_schemas.VerkadaEventQueryParams,
+    after: Optional[Tuple[int, str]] = None,
+    limit: int = 1000,
+) -> List[db_models.AccessEvent]:
+    """
+    Returns up to `limit` stored events matching the query params in ascending
+    (timestamp, event_id) order, starting after the given key. Used to walk
+    large ranges in fixed-size batches without OFFSET.
+
+    Args:
+        db: The database session.
+        params: The query params providing the time range and filters.
+        after: The (timestamp, event_id) of the last event of the previous batch.
+        limit: Maximum number of events returned.
+    """
+    event = db_models.AccessEvent
+    query = _filtered_query(db, params)
+    if after is not None:
+        after_timestamp, after_event_id = after
+        query = query.filter(
+            (event.timestamp > after_timestamp)
+            | ((event.timestamp == after_timestamp) & (event.event_id > after_event_id))
+        )
+    return query.order_by(event.timestamp.asc(), event.event_id.asc()).limit(limit).all()
+
+def count_events_by_hour(db: Session, start_time: int, end_time: int) -> Dict[int, int]:
+    """
+    Counts stored events per UTC hour of day within [start_time, end_time),
+    summing the pre-aggregated hourly rollups rather than scanning raw events.
+    The range is widened to whole hours.
+
+    Returns:
+        A mapping of hour (0-23) to event count; hours without events are omitted.
+    """
+    rollup = db_models.AccessEventHourlyRollup
+    hour = ((rollup.bucket_start // SECONDS_PER_HOUR) % 24).label("hour")
+    rows = (
+        db.query(hour, func.sum(rollup.event_count))
+        .filter(rollup.bucket_start >= hour_bucket(start_time))
+        .filter(rollup.bucket_start < end_time)
+        .group_by(hour)
+        .all()
+    )
+    return {int(row_hour): int(count) for row_hour, count in rows}
+
+# Dimensions aggregate_event_counts can group by, mapped to the key they are returned under.
+AGGREGATION_DIMENSIONS = {
+    "hour": "hour",
+    "weekday": "weekday",
+    "day": "day",
+    "door": "door_name",
+    "user": "user_id",
+    "event_type": "event_type",
+}
+_TIME_DIMENSIONS = ("hour", "weekday", "day")
+
+def aggregate_event_counts(
+    db: Session,
+    start_time: int,
+    end_time: int,
+    group_by: Sequence[str],
+    tz: tzinfo = timezone.utc,
+    door_names: Optional[List[str]] = None,
+    user_ids: Optional[List[str]] = None,
+    event_types: Optional[List[str]] = None,
+    max_groups: Optional[int] = None,
+) -> List[Tuple[Dict[str, Any], int]]:
+    """
+    Counts stored events within [start_time, end_time) grouped by any
+    combination of AGGREGATION_DIMENSIONS, summing the hourly rollups rather
+    than scanning raw events. The range is widened to whole hours.
+
+    Door and event type groupings are answered from the per-door rollups; the
+    per-user rollups are only read when grouping or filtering by user. The
+    time dimensions are computed in `tz` from the start of each UTC hour bucket:
+    hour (0-23), weekday (0 = Monday) and day (a date). In zones whose offset is
+    not a whole number of hours, a bucket counts towards the local hour it starts in.
+
+    Args:
+        db: The database session.
+        start_time: Start of the range (Unix timestamp in seconds).
+        end_time: End of the range (Unix timestamp in seconds), exclusive.
+        group_by: Dimension names, e.g. ["weekday", "hour"]. Empty for a single total.
+        tz: Time zone of the time dimensions.
+        door_names: Only count events at these doors.
+        user_ids: Only count events of these users.
+        event_types: Only count events of these types.
+        max_groups: Maximum number of groups returned.
+
+    Returns:
+        (key, event_count) pairs sorted by key, where key maps the
+        AGGREGATION_DIMENSIONS key of each grouped dimension to its value
+        (None for events without a door or user). Groups without events are omitted.
+
+    Raises:
+        ValueError: If a dimension is unknown or repeated, or more than max_groups groups match.
+    """
+    _validate_group_by(group_by, AGGREGATION_DIMENSIONS)
+    by_user = "user" in group_by or bool(user_ids)
+    rollup = db_models.AccessEventUserHourlyRollup if by_user else db_models.AccessEventHourlyRollup
+    rollup_columns = {"door": rollup.door_name, "event_type": rollup.event_type}
+    if by_user:
+        rollup_columns["user"] = rollup.user_id
+    column_dimensions = [dimension for dimension in group_by if dimension in rollup_columns]
+    by_time = any(dimension in _TIME_DIMENSIONS for dimension in group_by)
+    group_columns = ([rollup.bucket_start] if by_time else []) + [rollup_columns[d] for d in column_dimensions]
+
+    query = (
+        db.query(*group_columns, func.sum(rollup.event_count))
+        .filter(rollup.bucket_start >= hour_bucket(start_time))
+        .filter(rollup.bucket_start < end_time)
+    )
+    filters = [(rollup.door_name, door_names), (rollup.event_type, event_types)]
+    if by_user:
+        filters.append((rollup.user_id, user_ids))
+    for column, values in filters:
+        if values:
+            query = query.filter(column.in_(values))
+    if group_columns:
+        query = query.group_by(*group_columns)
+
+    totals: Counter = Counter()
+    local_times: Dict[int, Dict[str, Any]] = {}
+    for row in query:
+        *values, count = row
+        if count is None: # Empty range without grouping
+            continue
+        if by_time:
+            bucket_start, *values = values
+        dimension_values = dict(zip(column_dimensions, (value or None for value in values)))
+        if by_time:
+            dimension_values.update(_local_time_parts(bucket_start, tz, local_times))
+        key = tuple(dimension_values[dimension] for dimension in group_by)
+        if key not in totals:
+            _check_group_limit(len(totals), max_groups)
+        totals[key] += int(count)
+
+    return _sorted_groups(totals, group_by, AGGREGATION_DIMENSIONS)
+
+def _validate_group_by(group_by: Sequence[str], dimensions: Dict[str, str]) -> None:
+    """Raises ValueError unless group_by lists distinct names of dimensions."""
+    unknown = [dimension for dimension in group_by if dimension not in dimensions]
+    if unknown or len(set(group_by)) != len(group_by):
+        raise ValueError(
+            f"group_by must be distinct values of {', '.join(dimensions)}; got {', '.join(group_by)}."
+        )
+
+def _local_time_parts(bucket_start: int, tz: tzinfo, cache: Dict[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """Returns the hour, weekday and day in tz of the start of an hour bucket, memoized in cache."""
+    if bucket_start not in cache:
+        local = datetime.fromtimestamp(bucket_start, tz=tz)
+        cache[bucket_start] = {"hour": local.hour, "weekday": local.weekday(), "day": local.date()}
+    return cache[bucket_start]
+
+def _check_group_limit(group_count: int, max_groups: Optional[int]) -> None:
+    """Raises ValueError if another group would exceed max_groups."""
+    if max_groups is not None and group_count >= max_groups:
+        raise ValueError(f"More than {max_groups} groups match; narrow the range, filters or group_by.")
+
+def _sorted_groups(values: Dict[tuple, Any], group_by: Sequence[str], dimensions: Dict[str, str]) -> List[Tuple[Dict[str, Any], Any]]:
+    """Turns {key tuple: value} into (key dict, value) pairs sorted by key, with None values last."""
+    return [
+        ({dimensions[dimension]: key_value for dimension, key_value in zip(group_by, key)}, value)
+        for key, value in sorted(values.items(), key=lambda item: tuple((part is None, part) for part in item[0]))
+    ]
+
+
+# Dimensions count_distinct_users can group by, mapped to the key they are returned under.
+DISTINCT_USER_DIMENSIONS = {"hour": "hour", "weekday": "weekday", "day": "day", "door": "door_name"}
+
+def count_distinct_users(
+    db: Session,
+    start_time: int,
+    end_time: int,
+    group_by: Sequence[str],
+    tz: tzinfo = timezone.utc,
+    door_names: Optional[List[str]] = None,
+    max_groups: Optional[int] = None,
+) -> List[Tuple[Dict[str, Any], int]]:
+    """
+    Estimates the number of distinct users (by user id, else user name) with
+    events within [start_time, end_time), grouped by any combination of
+    DISTINCT_USER_DIMENSIONS, by merging the hourly HyperLogLog sketches.
+    The per-door sketches are only read when grouping or filtering by door.
+    The range is widened to whole hours, and the time dimensions are
+    computed as in aggregate_event_counts.
+
+    Returns:
+        (key, distinct_users) pairs sorted by key (see aggregate_event_counts).
+        Estimates have a relative standard error of about
+        HyperLogLog(USER_SKETCH_PRECISION).relative_error.
+
+    Raises:
+        ValueError: If a dimension is unknown or repeated, or more than max_groups groups match.
+    """
+    _validate_group_by(group_by, DISTINCT_USER_DIMENSIONS)
+    by_door = "door" in group_by or bool(door_names)
+    if by_door:
+        sketch_model = db_models.AccessEventDoorHourlyUserSketch
+        door_column = sketch_model.door_name
+    else:
+        sketch_model = db_models.AccessEventHourlyUserSketch
+        door_column = literal("")
+    query = (
+        select(sketch_model.bucket_start, door_column, sketch_model.sketch)
+        .where(sketch_model.bucket_start >= hour_bucket(start_time))
+        .where(sketch_model.bucket_start < end_time)
+    )
+    if door_names:
+        query = query.where(sketch_model.door_name.in_(door_names))
+
+    sketches: Dict[tuple, HyperLogLog] = {}
+    keys: Dict[Tuple[int, str], tuple] = {}
+    local_times: Dict[int, Dict[str, Any]] = {}
+    # Reason: Merge the payloads chunk by chunk as they are read, so memory holds
+    # one sketch per group and one chunk of payloads, not every payload in range.
+    result = db.execute(query.execution_options(yield_per=_USER_SKETCH_SCAN_CHUNK))
+    for chunk in result.partitions():
+        chunk_payloads: Dict[tuple, List[bytes]] = defaultdict(list)
+        for bucket_start, door_name, payload in chunk:
+            key = keys.get((bucket_start, door_name))
+            if key is None:
+                dimension_values = {"door": door_name or None, **_local_time_parts(bucket_start, tz, local_times)}
+                key = keys[(bucket_start, door_name)] = tuple(dimension_values[dimension] for dimension in group_by)
+            if key not in sketches:
+                _check_group_limit(len(sketches), max_groups)
+                sketches[key] = HyperLogLog(USER_SKETCH_PRECISION)
+            chunk_payloads[key].append(payload)
+        for key, group_payloads in chunk_payloads.items():
+            sketches[key].merge_bytes(group_payloads)
+
+    counts = {key: sketch.count() for key, sketch in sketches.items()}
+    return _sorted_groups(counts, group_by, DISTINCT_USER_DIMENSIONS)
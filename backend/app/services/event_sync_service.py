@@ -0,0 +1,83 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.verkada_client.client import VerkadaApiClient
+from ..core.verkada_client.rate_limiter import RequestPriority
+from ..db.session import AsyncSessionLocal
+from ..models import verkada_event as verkada_event_schemas
+from . import event_store_service
+
+logger = logging.getLogger(__name__)
+
+# sync_checkpoints row of the periodic access event sync.
+SYNC_CHECKPOINT_NAME = "access_events"
+
+async def sync_access_events(
+    db: AsyncSession,
+    api_client: VerkadaApiClient,
+    initial_lookback: timedelta,
+    overlap: timedelta = timedelta(seconds=0),
+) -> int:
+    """
+    Pulls access events newer than the last completed sync and upserts them.
+
+    The high-water mark is the sync checkpoint: the end of the last time range
+    that was fetched completely. It only advances after a full successful pass,
+    so a sync that fails partway (whatever order Verkada returns pages in) is
+    retried from the same point and never skips events. A small overlap is
+    subtracted from it so events that arrive late at Verkada are not missed;
+    the event_id upsert makes re-fetching them harmless.
+
+    Store reads and writes run through db.run_sync on the async session, so
+    the event loop is not blocked while SQLite does the work.
+
+    Args:
+        db: The async database session.
+        api_client: The shared Verkada API client.
+        initial_lookback: How far back to fetch when nothing was synced yet.
+        overlap: How far before the high-water mark to start fetching.
+
+    Returns:
+        The number of events written to the store.
+    """
+    end_time = datetime.now(timezone.utc)
+    synced_until = await db.run_sync(event_store_service.get_sync_checkpoint, SYNC_CHECKPOINT_NAME)
+    if synced_until is None:
+        start_time = end_time - initial_lookback
+    else:
+        start_time = datetime.fromtimestamp(synced_until, tz=timezone.utc) - overlap
+
+    stored = 0
+    async for raw_events in api_client.iter_access_event_pages(
+        start_time, end_time, priority=RequestPriority.BACKGROUND
+    ):
+        events = verkada_event_schemas.parse_events(raw_events)
+        # Reason: Store page by page so a failure mid-sync keeps the events fetched so far.
+        stored += await db.run_sync(event_store_service.store_events, events)
+    await db.run_sync(event_store_service.set_sync_checkpoint, SYNC_CHECKPOINT_NAME, int(end_time.timestamp()))
+    return stored
+
+async def run_periodic_sync(
+    api_client: VerkadaApiClient,
+    interval_seconds: float,
+    initial_lookback: timedelta,
+    overlap: timedelta,
+) -> None:
+    """
+    Runs sync_access_events forever, once every interval_seconds.
+    Errors are logged and retried on the next cycle. Intended to run as a
+    background task started at application startup.
+    """
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                stored = await sync_access_events(db, api_client, initial_lookback, overlap)
+            logger.info("Verkada event sync stored %d events", stored)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Verkada event sync failed")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,256 @@
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, FrozenSet, List, Optional
+
+from ..core import metrics
+from ..core.config import get_settings
+from ..core.verkada_client.client import VerkadaApiClient
+from ..core.verkada_client.rate_limiter import RequestPriority
+from ..models import verkada_event as verkada_event_schemas
+from . import event_store_service
+
+logger = logging.getLogger(__name__)
+
+# access_events columns a live feed subscriber can filter on (comma-separated values).
+FILTER_FIELDS = ("event_type", "user_id", "user_name", "door_name", "device_id", "site_id")
+
+class LiveFeedFullError(Exception):
+    """Raised when the live feed already has its maximum number of subscribers."""
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(self.message)
+
+def parse_filters(**values: Optional[str]) -> Dict[str, FrozenSet[str]]:
+    """
+    Builds subscriber filters from comma-separated query values, e.g.
+    parse_filters(door_name="Front Door,Lobby"). Empty values are ignored.
+    """
+    filters = {}
+    for field, value in values.items():
+        if field not in FILTER_FIELDS:
+            raise ValueError(f"Unknown live feed filter: {field}")
+        if value:
+            filters[field] = frozenset(item.strip() for item in value.split(",") if item.strip())
+    return filters
+
+class LiveFeedSubscription:
+    """
+    One live feed client: its filters and a bounded queue of matching events.
+    A subscription that falls more than maxsize events behind is dropped by
+    the broker; get() then returns None.
+    """
+
+    def __init__(self, filters: Dict[str, FrozenSet[str]], maxsize: int):
+        self.filters = filters
+        self.dropped = False
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def matches(self, row: Dict) -> bool:
+        """True if the event row passes every filter of this subscription."""
+        return all(row.get(field) in allowed for field, allowed in self.filters.items())
+
+    def offer(self, row: Dict) -> bool:
+        """Queues an event row without waiting. Returns False if the queue is full."""
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def drop(self) -> None:
+        """Discards queued events and wakes the consumer with the end-of-feed marker."""
+        self.dropped = True
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[List[Dict]]:
+        """
+        Waits for queued events and returns all that are available, or None
+        once the subscription was dropped. Raises asyncio.TimeoutError if
+        nothing arrives within timeout seconds.
+        """
+        if self.dropped:
+            return None
+        first = await asyncio.wait_for(self._queue.get(), timeout)
+        rows = [first]
+        while first is not None and not self._queue.empty():
+            row = self._queue.get_nowait()
+            if row is None:
+                return None
+            rows.append(row)
+        return None if first is None else rows
+
+class LiveEventBroker:
+    """
+    Fans events out to live feed subscribers.
+
+    publish() is called by a single source (the event sync's ingest listener
+    or the shared poller), so upstream load does not grow with the number of
+    viewers. Each subscriber has a bounded queue; a subscriber whose queue is
+    full is dropped rather than slowing down publishing or buffering without
+    limit. Must be used from the event loop thread.
+    """
+
+    def __init__(self, max_subscribers: int, queue_size: int):
+        self.max_subscribers = max_subscribers
+        self.queue_size = queue_size
+        self._subscriptions: List[LiveFeedSubscription] = []
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def check_capacity(self) -> None:
+        """
+        Raises:
+            LiveFeedFullError: If max_subscribers are already connected.
+        """
+        if len(self._subscriptions) >= self.max_subscribers:
+            raise LiveFeedFullError(f"{self.max_subscribers} live feed clients are already connected.")
+
+    def subscribe(self, filters: Optional[Dict[str, FrozenSet[str]]] = None) -> LiveFeedSubscription:
+        """
+        Registers a new subscriber.
+
+        Raises:
+            LiveFeedFullError: If max_subscribers are already connected.
+        """
+        self.check_capacity()
+        subscription = LiveFeedSubscription(filters or {}, self.queue_size)
+        self._subscriptions.append(subscription)
+        metrics.LIVE_FEED_SUBSCRIBERS.set(len(self._subscriptions))
+        return subscription
+
+    def unsubscribe(self, subscription: LiveFeedSubscription) -> None:
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+            metrics.LIVE_FEED_SUBSCRIBERS.set(len(self._subscriptions))
+
+    def publish(self, rows: List[Dict]) -> None:
+        """
+        Delivers access_events rows (as produced by event_store_service.event_to_row)
+        to every subscriber whose filters they match, dropping subscribers that fell behind.
+        """
+        if not rows:
+            return
+        metrics.LIVE_FEED_EVENTS.inc(len(rows))
+        for subscription in list(self._subscriptions):
+            for row in rows:
+                if subscription.matches(row) and not subscription.offer(row):
+                    logger.warning("Dropping live feed subscriber that is %d events behind", self.queue_size)
+                    self.unsubscribe(subscription)
+                    subscription.drop()
+                    metrics.LIVE_FEED_DROPPED_SUBSCRIBERS.inc()
+                    break
+
+live_event_broker = LiveEventBroker(
+    max_subscribers=get_settings().LIVE_FEED_MAX_SUBSCRIBERS,
+    queue_size=get_settings().LIVE_FEED_QUEUE_SIZE,
+)
+
+async def poll_new_events(
+    api_client: VerkadaApiClient,
+    broker: LiveEventBroker,
+    since: datetime,
+    until: datetime,
+    seen_event_ids: Dict[str, int],
+) -> int:
+    """
+    Fetches events in [since, until) from Verkada once and publishes those not in
+    seen_event_ids, which is updated (and pruned to the window) in place.
+
+    Returns:
+        The number of events published.
+    """
+    rows: List[Dict] = []
+    async for raw_events in api_client.iter_access_event_pages(since, until, priority=RequestPriority.BACKGROUND):
+        for event in verkada_event_schemas.parse_events(raw_events):
+            if event.event_id not in seen_event_ids:
+                row = event_store_service.event_to_row(event)
+                seen_event_ids[event.event_id] = row["timestamp"]
+                rows.append(row)
+    # Reason: Only ids inside the overlap window can be fetched again.
+    horizon = int(since.timestamp())
+    for event_id in [event_id for event_id, timestamp in seen_event_ids.items() if timestamp < horizon]:
+        del seen_event_ids[event_id]
+    rows.sort(key=lambda row: (row["timestamp"], row["event_id"]))
+    broker.publish(rows)
+    return len(rows)
+
+async def run_live_poller(
+    api_client: VerkadaApiClient,
+    broker: LiveEventBroker,
+    interval_seconds: float,
+    overlap: timedelta,
+) -> None:
+    """
+    Polls Verkada for new events once every interval_seconds while the broker
+    has subscribers and publishes them, whatever the number of subscribers.
+    Each poll re-reads `overlap` before the previous one to catch late events;
+    already published event ids are skipped. Errors are logged and retried on
+    the next cycle. Intended to run as a background task started at application
+    startup when the local event store (whose sync feeds the broker) is disabled.
+    """
+    seen_event_ids: Dict[str, int] = {}
+    high_water = datetime.now(timezone.utc)
+    while True:
+        await asyncio.sleep(interval_seconds)
+        now = datetime.now(timezone.utc)
+        if not broker.subscriber_count:
+            # Reason: Nobody is watching; start from "now" when someone connects.
+            high_water = now
+            seen_event_ids.clear()
+            continue
+        try:
+            await poll_new_events(api_client, broker, high_water - overlap, now, seen_event_ids)
+            high_water = now
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Live feed poll failed")
+
+def format_sse(rows: List[Dict]) -> str:
+    """Formats event rows as Server-Sent Events, one 'access_event' message per event."""
+    messages = []
+    for row in rows:
+        data = dict(row, timestamp=datetime.fromtimestamp(row["timestamp"], tz=timezone.utc).isoformat())
+        messages.append(f"id: {row['event_id']}\nevent: access_event\ndata: {json.dumps(data)}\n\n")
+    return "".join(messages)
+
+async def stream_subscription(
+    broker: LiveEventBroker,
+    filters: Dict[str, FrozenSet[str]],
+    heartbeat_seconds: float,
+) -> AsyncIterator[str]:
+    """
+    Subscribes to the broker and streams the subscription as Server-Sent Events
+    until the client disconnects or is dropped for falling behind (announced
+    with a final 'dropped' event). A comment line is sent every
+    heartbeat_seconds without events so proxies keep the connection open.
+
+    The subscription is made when the stream starts and removed when it ends,
+    so a response that is never sent cannot leave a subscriber behind.
+    """
+    try:
+        subscription = broker.subscribe(filters)
+    except LiveFeedFullError:
+        # Reason: Another client took the last slot after the endpoint checked capacity.
+        yield 'retry: 30000\nevent: dropped\ndata: {"reason": "live feed full"}\n\n'
+        return
+    try:
+        yield "retry: 5000\n: connected\n\n"
+        while True:
+            try:
+                rows = await subscription.get(timeout=heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if rows is None:
+                yield 'event: dropped\ndata: {"reason": "client too slow"}\n\n'
+                return
+            yield format_sse(rows)
+    finally:
+        broker.unsubscribe(subscription)
@@ -0,0 +1,177 @@
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import column, delete, func, select, table, text, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..db import models as db_models
+
+# Kinds of names indexed, mapped to the access_events columns of (name, entity id).
+NAME_KINDS = {"user": ("user_name", "user_id"), "door": ("door_name", "device_id")}
+
+# Shortest query answered from the trigram index; shorter ones only match name prefixes.
+MIN_SUBSTRING_QUERY_LENGTH = 3
+# Substring matches ranked per search. Very common substrings match more names
+# than this; the busiest of the first SUBSTRING_CANDIDATES are returned.
+SUBSTRING_CANDIDATES = 1000
+
+# The FTS5 trigram index over access_event_names.name (see db.models).
+_names_fts = table("access_event_names_fts", column("rowid"))
+
+def name_key(name: str) -> str:
+    """Returns the case-folded form of a name used for prefix search and resolution."""
+    return name.strip().casefold()
+
+def _count_names(rows: List[Dict]) -> Dict[Tuple[str, str, str], List[int]]:
+    """Counts the (kind, name, entity_id) of event rows, with the newest timestamp of each."""
+    counts: Dict[Tuple[str, str, str], List[int]] = defaultdict(lambda: [0, 0])
+    for row in rows:
+        for kind, (name_column, id_column) in NAME_KINDS.items():
+            name = (row.get(name_column) or "").strip()
+            if name:
+                entry = counts[(kind, name, row.get(id_column) or "")]
+                entry[0] += 1
+                entry[1] = max(entry[1], row["timestamp"])
+    return counts
+
+def add_names(db: Session, rows: List[Dict]) -> None:
+    """
+    Adds the user and door names of newly stored access_events rows to the
+    name index, counting their events. Does not commit; runs inside the
+    caller's transaction (see event_store_service.store_events).
+    """
+    counts = _count_names(rows)
+    if not counts:
+        return
+    stmt = sqlite_insert(db_models.AccessEventName).values([
+        {"kind": kind, "name": name, "name_key": name_key(name), "entity_id": entity_id,
+         "event_count": count, "last_seen": last_seen}
+        for (kind, name, entity_id), (count, last_seen) in counts.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["kind", "name", "entity_id"],
+        set_={
+            "event_count": db_models.AccessEventName.event_count + stmt.excluded.event_count,
+            "last_seen": func.max(db_models.AccessEventName.last_seen, stmt.excluded.last_seen),
+        },
+    )
+    db.execute(stmt)
+
+def remove_names(db: Session, rows: List[Dict]) -> None:
+    """
+    Takes the user and door names of access_events rows that were changed or
+    removed out of the name index, deleting names left without events.
+    last_seen is not moved back. Does not commit.
+    """
+    names = db_models.AccessEventName
+    for (kind, name, entity_id), (count, _) in _count_names(rows).items():
+        key = (names.kind == kind, names.name == name, names.entity_id == entity_id)
+        db.execute(update(names).where(*key).values(event_count=names.event_count - count))
+        db.execute(delete(names).where(*key).where(names.event_count <= 0))
+
+def rebuild_name_index(db: Session) -> None:
+    """
+    Recomputes the name index from all stored events.
+    Used to initialise it for a store populated before it existed.
+    """
+    event = db_models.AccessEvent
+    db.query(db_models.AccessEventName).delete()
+    for kind, (name_column, id_column) in NAME_KINDS.items():
+        name = func.trim(getattr(event, name_column))
+        entity_id = func.coalesce(getattr(event, id_column), "")
+        _insert_names(db, kind, db.execute(
+            select(name, entity_id, func.count(event.id), func.max(event.timestamp))
+            .where(name.is_not(None), name != "")
+            .group_by(name, entity_id)
+        ))
+    db.commit()
+
+def _insert_names(db: Session, kind: str, rows: Iterable[Tuple[str, str, int, int]]) -> None:
+    """Inserts aggregated (name, entity_id, event_count, last_seen) rows of one kind."""
+    values = [
+        {"kind": kind, "name": row_name, "name_key": name_key(row_name), "entity_id": row_entity_id,
+         "event_count": count, "last_seen": last_seen}
+        for row_name, row_entity_id, count, last_seen in rows
+    ]
+    if values:
+        db.execute(sqlite_insert(db_models.AccessEventName), values)
+
+def ensure_name_index(db: Session) -> None:
+    """
+    Rebuilds the name index if events are stored but no names are indexed yet.
+    """
+    has_names = db.query(db_models.AccessEventName.id).first() is not None
+    has_events = db.query(db_models.AccessEvent.id).first() is not None
+    if has_events and not has_names:
+        rebuild_name_index(db)
+
+def search_names(
+    db: Session,
+    query: str,
+    kind: Optional[str] = None,
+    limit: int = 10,
+) -> List[db_models.AccessEventName]:
+    """
+    Returns indexed names matching a search string, best first: names that
+    start with it (case-insensitively) before names that merely contain it,
+    each by descending event count. Never scans events.
+
+    Prefix matches are a range scan of the name_key index; substring matches
+    of queries of at least MIN_SUBSTRING_QUERY_LENGTH characters come from the
+    trigram index (at most SUBSTRING_CANDIDATES of them are ranked).
+
+    Args:
+        db: The database session.
+        query: The text typed so far.
+        kind: "user" or "door"; None searches both.
+        limit: Maximum number of names returned.
+    """
+    key = name_key(query)
+    if not key:
+        return []
+    names = db_models.AccessEventName
+    prefix_query = select(names).where(names.name_key >= key, names.name_key < key + "\U0010ffff")
+    if kind:
+        prefix_query = prefix_query.where(names.kind == kind)
+    matches = list(db.scalars(prefix_query.order_by(names.event_count.desc(), names.name).limit(limit)))
+
+    if len(matches) < limit and len(query.strip()) >= MIN_SUBSTRING_QUERY_LENGTH:
+        # Reason: A quoted FTS5 string is matched as a phrase, i.e. as a substring with the trigram tokenizer.
+        phrase = '"' + query.strip().replace('"', '""') + '"'
+        substring_query = select(names).where(
+            names.id.in_(
+                select(_names_fts.c.rowid)
+                .where(text("access_event_names_fts MATCH :phrase"))
+                .limit(SUBSTRING_CANDIDATES)
+            )
+        ).params(phrase=phrase)
+        if kind:
+            substring_query = substring_query.where(names.kind == kind)
+        if matches:
+            substring_query = substring_query.where(names.id.not_in([match.id for match in matches]))
+        matches.extend(db.scalars(
+            substring_query.order_by(names.event_count.desc(), names.name).limit(limit - len(matches))
+        ))
+    return matches
+
+def resolve_names(db: Session, kind: str, names: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Resolves names (case-insensitively) to the ids they appear with in events,
+    e.g. resolve_names(db, "user", ["Ada Lovelace"]) -> {"Ada Lovelace": ["u1"]}.
+    Names without a known id map to an empty list.
+    """
+    requested = {name: name_key(name) for name in names if name_key(name)}
+    ids_by_key: Dict[str, List[str]] = defaultdict(list)
+    if requested:
+        entries = db.execute(
+            select(db_models.AccessEventName.name_key, db_models.AccessEventName.entity_id)
+            .where(db_models.AccessEventName.kind == kind)
+            .where(db_models.AccessEventName.name_key.in_(set(requested.values())))
+            .where(db_models.AccessEventName.entity_id != "")
+            .order_by(db_models.AccessEventName.event_count.desc())
+        )
+        for entry_key, entity_id in entries:
+            if entity_id not in ids_by_key[entry_key]:
+                ids_by_key[entry_key].append(entity_id)
+    return {name: ids_by_key.get(key, []) for name, key in requested.items()}
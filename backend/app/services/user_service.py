@@ -1,11 +1,23 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from ..db import models as db_models
 from ..models import user as user_schemas
-from ..core.security import get_password_hash
+from ..core import metrics
+from ..core.cache import TTLLRUCache
+from ..core.config import get_settings
+from ..core.security import get_password_hash_async
 
-def get_user_by_username(db: Session, username: str) -> Optional[db_models.User]:
+# Authenticated principals keyed by username (the JWT subject), so protected
+# requests do not query the users table every time.
+principal_cache = TTLLRUCache(
+    maxsize=get_settings().PRINCIPAL_CACHE_MAX_ENTRIES,
+    default_ttl=get_settings().PRINCIPAL_CACHE_TTL_SECONDS,
+)
+metrics.register_cache("principal", principal_cache)
+
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[db_models.User]:
     """
     Retrieves a user by their username.
 
@@ -16,9 +28,10 @@ def get_user_by_username(db: Session, username: str) -> Optional[db_models.User]
     Returns:
         The User database model instance if found, otherwise None.
     """
-    return db.query(db_models.User).filter(db_models.User.username == username).first()
+    result = await db.execute(select(db_models.User).where(db_models.User.username == username))
+    return result.scalars().first()
 
-def get_user(db: Session, user_id: int) -> Optional[db_models.User]:
+async def get_user(db: AsyncSession, user_id: int) -> Optional[db_models.User]:
     """
     Retrieves a user by their ID.
 
@@ -29,24 +42,81 @@ def get_user(db: Session, user_id: int) -> Optional[db_models.User]:
     Returns:
         The User database model instance if found, otherwise None.
     """
-    return db.query(db_models.User).filter(db_models.User.id == user_id).first()
+    return await db.get(db_models.User, user_id)
 
-def create_user(db: Session, user: user_schemas.UserCreate) -> db_models.User:
+async def create_user(
+    db: AsyncSession, user: user_schemas.UserCreate, hashed_password: Optional[str] = None
+) -> db_models.User:
     """
     Creates a new user in the database.
 
     Args:
         db: The database session.
         user: The UserCreate schema containing user details (username, password).
+        hashed_password: The password hash, if already computed (e.g. off the event loop).
+                         Hashed here, in the password hashing pool, if not given.
 
     Returns:
         The created User database model instance.
     """
-    hashed_password = get_password_hash(user.password)
+    if hashed_password is None:
+        hashed_password = await get_password_hash_async(user.password)
     db_user = db_models.User(username=user.username, hashed_password=hashed_password)
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     return db_user
 
+async def update_password_hash(db: AsyncSession, user: db_models.User, hashed_password: str) -> None:
+    """
+    Replaces a user's stored password hash, e.g. after a bcrypt cost upgrade.
+
+    Args:
+        db: The database session.
+        user: The User database model instance.
+        hashed_password: The new hash.
+    """
+    user.hashed_password = hashed_password
+    await db.commit()
+
+async def get_principal(db: AsyncSession, username: str) -> Optional[db_models.User]:
+    """
+    Returns the user for an authenticated request, from the principal cache if possible.
+
+    The returned User is a detached copy holding only id and username (never the
+    password hash); it is shared between requests and must be treated as read-only.
+    Unknown usernames are not cached.
+
+    Args:
+        db: The database session, used only on a cache miss.
+        username: The username from the token subject.
+
+    Returns:
+        The principal, or None if no such user exists.
+    """
+    principal = principal_cache.get(username)
+    if principal is not None:
+        return principal
+    user = await get_user_by_username(db, username=username)
+    if user is None:
+        return None
+    principal = db_models.User(id=user.id, username=user.username)
+    principal_cache.set(username, principal)
+    return principal
+
+def invalidate_principal(username: str) -> None:
+    """Drops a user from the principal cache, e.g. after it was changed or deleted."""
+    principal_cache.invalidate(username)
+
+@event.listens_for(db_models.User, "after_insert")
+@event.listens_for(db_models.User, "after_update")
+@event.listens_for(db_models.User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: db_models.User) -> None:
+    """Invalidates the cached principal whenever a User row is written through the ORM."""
+    # Reason: A rename changes the username; drop the principal under the old name too.
+    history = inspect(target).attrs.username.history
+    for username in (target.username, *(history.deleted or ())):
+        if username:
+            invalidate_principal(username)
+
 # Additional CRUD operations (update, delete) can be added here later if needed.
\ No newline at end of file
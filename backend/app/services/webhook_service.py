@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import time
+from typing import Any, Callable, List, Optional
+
+from ..core import metrics
+from ..core.config import get_settings
+from ..models import verkada_event as verkada_event_schemas
+from . import event_store_service
+
+logger = logging.getLogger(__name__)
+
+# Header carrying "<unix timestamp>|<hex HMAC-SHA256 of '<timestamp>|<raw body>'>".
+SIGNATURE_HEADER = "Verkada-Signature"
+
+class InvalidSignatureError(Exception):
+    """Raised when a webhook request is unsigned, wrongly signed or too old."""
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(self.message)
+
+class WebhookQueueFullError(Exception):
+    """Raised when the webhook queue cannot take more events until the writer catches up."""
+    def __init__(self, message: str):
+        self.message = message
+        super().__init__(self.message)
+
+def sign(secret: str, timestamp: int, body: bytes) -> str:
+    """Returns the signature header value for a request body sent at timestamp."""
+    digest = hmac.new(secret.encode(), f"{timestamp}|".encode() + body, hashlib.sha256).hexdigest()
+    return f"{timestamp}|{digest}"
+
+def verify_signature(
+    secret: str,
+    header: Optional[str],
+    body: bytes,
+    tolerance_seconds: float,
+    now: Optional[float] = None,
+) -> None:
+    """
+    Checks the signature header of a webhook request against the raw body.
+    The signed timestamp must be within tolerance_seconds of now, so captured
+    requests cannot be replayed later.
+
+    Raises:
+        InvalidSignatureError: If the signature is missing, malformed, wrong or stale.
+    """
+    if not header:
+        raise InvalidSignatureError(f"Missing {SIGNATURE_HEADER} header.")
+    timestamp, _, digest = header.partition("|")
+    try:
+        signed_at = int(timestamp)
+    except ValueError:
+        raise InvalidSignatureError(f"Malformed {SIGNATURE_HEADER} header.")
+    if abs((now if now is not None else time.time()) - signed_at) > tolerance_seconds:
+        raise InvalidSignatureError("Webhook signature timestamp is outside the allowed tolerance.")
+    # Reason: compare_digest takes the same time wherever the strings differ.
+    if not hmac.compare_digest(sign(secret, signed_at, body), f"{signed_at}|{digest}"):
+        raise InvalidSignatureError("Webhook signature does not match.")
+
+def parse_notification(payload: Any) -> List[verkada_event_schemas.VerkadaEvent]:
+    """
+    Extracts the access events of a webhook notification. Accepts a single
+    event, a list of events, or an envelope holding them under "data" or
+    "events"; fields may be camelCase or snake_case. Unparseable events are
+    skipped with a warning.
+
+    Raises:
+        ValueError: If the payload holds no event objects at all.
+    """
+    if isinstance(payload, dict):
+        for key in ("data", "events"):
+            if key in payload:
+                payload = payload[key]
+                break
+    items = payload if isinstance(payload, list) else [payload]
+    if not all(isinstance(item, dict) for item in items):
+        raise ValueError("Webhook payload must contain access event objects.")
+    return verkada_event_schemas.parse_events(items)
+
+class WebhookEventQueue:
+    """
+    Buffers events received by the webhook endpoint until the writer stores them.
+
+    The endpoint only verifies and enqueues, so it answers without waiting on
+    SQLite. run_writer() drains the queue into the local event store in one
+    transaction per batch of flush_rows events, or whatever arrived within
+    flush_seconds of the first buffered event, whichever comes first. The
+    queue is bounded: when it is full, put() fails and the endpoint asks
+    Verkada to retry rather than buffering without limit. Must be used from
+    the event loop thread.
+    """
+
+    def __init__(self, maxsize: int, flush_rows: int, flush_seconds: float):
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def put(self, events: List[verkada_event_schemas.VerkadaEvent]) -> None:
+        """
+        Queues events without waiting; all of them or none.
+
+        Raises:
+            WebhookQueueFullError: If they do not fit in the queue.
+        """
+        if self._queue.maxsize - self._queue.qsize() < len(events):
+            metrics.WEBHOOK_EVENTS.labels(outcome="rejected").inc(len(events))
+            raise WebhookQueueFullError("The webhook queue is full; retry later.")
+        for event in events:
+            self._queue.put_nowait(event)
+        metrics.WEBHOOK_EVENTS.labels(outcome="queued").inc(len(events))
+        metrics.WEBHOOK_QUEUE_DEPTH.set(self._queue.qsize())
+
+    async def fill_batch(self, batch: List[verkada_event_schemas.VerkadaEvent]) -> None:
+        """
+        Waits for an event, then moves events from the queue into batch until
+        flush_rows are buffered or flush_seconds have passed since the first one.
+        Fills the caller's list in place, so events taken before a cancellation are not lost.
+        """
+        batch.append(await self._queue.get())
+        deadline = time.monotonic() + self.flush_seconds
+        while len(batch) < self.flush_rows:
+            if self._queue.empty():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            else:
+                batch.append(self._queue.get_nowait())
+
+    def drain(self) -> List[verkada_event_schemas.VerkadaEvent]:
+        """Removes and returns every queued event without waiting."""
+        events = []
+        while not self._queue.empty():
+            events.append(self._queue.get_nowait())
+        return events
+
+    async def _store(self, session_factory: Callable, events: List[verkada_event_schemas.VerkadaEvent]) -> None:
+        async with session_factory() as db:
+            stored = await db.run_sync(event_store_service.store_events, events)
+        metrics.WEBHOOK_EVENTS.labels(outcome="stored").inc(stored)
+        metrics.WEBHOOK_QUEUE_DEPTH.set(self._queue.qsize())
+
+    async def run_writer(self, session_factory: Callable) -> None:
+        """
+        Stores queued events in batches forever. A batch that fails to store is
+        logged and dropped; the periodic sync (whose overlap and upsert cover
+        missed events) fetches those events again. On cancellation the events
+        still queued or batched are stored before the task ends. Intended to run
+        as a background task started at application startup.
+        """
+        batch: List[verkada_event_schemas.VerkadaEvent] = []
+        try:
+            while True:
+                await self.fill_batch(batch)
+                try:
+                    await self._store(session_factory, batch)
+                except Exception:
+                    logger.exception("Failed to store %d webhook events", len(batch))
+                batch = []
+        except asyncio.CancelledError:
+            # Reason: A batch interrupted mid-store is stored again; the event_id upsert makes that harmless.
+            remaining = batch + self.drain()
+            if remaining:
+                await self._store(session_factory, remaining)
+            raise
+
+webhook_event_queue = WebhookEventQueue(
+    maxsize=get_settings().WEBHOOK_QUEUE_SIZE,
+    flush_rows=get_settings().WEBHOOK_FLUSH_ROWS,
+    flush_seconds=get_settings().WEBHOOK_FLUSH_SECONDS,
+)
@@ -0,0 +1,79 @@
+"""
+Microbenchmark of the authentication dependency chain
+(get_async_db -> get_current_user -> get_current_active_user) as run for every
+protected request: without the principal cache (a users table query per
+request, as before) and with it (a cache hit after the first request).
+
+Uses a throwaway SQLite file database with some users, so the query cost
+is realistic.
+
+Usage (from the project root):
+    PYTHONPATH=backend python benchmarks/bench_auth_dependency.py [--iterations 20000]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Callable
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core import security
+from app.core.dependencies import get_current_active_user, get_current_user
+from app.db import models as db_models
+from app.services import user_service
+
+
+def run_chain(session_factory: Callable, token: str, iterations: int, clear_cache: bool) -> float:
+    """Runs the dependency chain `iterations` times and returns microseconds per call."""
+
+    async def chain() -> None:
+        async with session_factory() as db: # What get_async_db does per request
+            user = await get_current_user(db=db, token=token)
+            await get_current_active_user(current_user=user)
+
+    async def run() -> float:
+        await chain() # Warm up
+        started = time.perf_counter()
+        for _ in range(iterations):
+            if clear_cache:
+                user_service.principal_cache.clear()
+            await chain()
+        elapsed = time.perf_counter() - started
+        await session_factory.kw["bind"].dispose()
+        return elapsed / iterations * 1e6
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'bench.db')
+        engine = create_engine(f"sqlite:///{db_path}")
+        db_models.Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as db:
+            db.add_all(db_models.User(username=f"user{i}", hashed_password="x" * 60) for i in range(args.users))
+            db.commit()
+        engine.dispose()
+        session_factory = async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{db_path}"), expire_on_commit=False)
+        token = security.create_access_token({"sub": f"user{args.users // 2}"})
+
+        uncached = run_chain(session_factory, token, args.iterations, clear_cache=True)
+        cached = run_chain(session_factory, token, args.iterations, clear_cache=False)
+
+    print(f"{'variant':<24} {'us/request':>12}")
+    print(f"{'db lookup (before)':<24} {uncached:>12.1f}")
+    print(f"{'principal cache (after)':<24} {cached:>12.1f}")
+    print(f"speedup: {uncached / cached:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
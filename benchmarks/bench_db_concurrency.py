@@ -0,0 +1,169 @@
+"""
+Concurrent read/write benchmark of the local event store: readers paging
+/events-style queries while a writer ingests batches of events (as the
+periodic sync does), run two ways:
+
+- sync (before): the default synchronous engine (rollback journal, no pragmas)
+  called directly from coroutines, so every query blocks the event loop and
+  readers wait behind the writer's lock.
+- async WAL (after): the aiosqlite engine with the pragmas from app.db.session,
+  with the store functions run through AsyncSession.run_sync.
+
+Reports reads/s, read p95 latency, batches written and the worst event loop
+lag seen by a probe coroutine.
+
+Usage (from the project root):
+    PYTHONPATH=backend python benchmarks/bench_db_concurrency.py [--events 50000] [--readers 8] [--duration 5]
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List
+
+import numpy as np
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db import models as db_models
+from app.db.session import apply_sqlite_pragmas
+from app.models.verkada_event import VerkadaEvent, VerkadaEventQueryParams
+from app.services import event_store_service
+
+END = int(datetime(2025, 6, 1, tzinfo=timezone.utc).timestamp())
+START = END - 30 * 86400
+
+
+def make_events(count: int, prefix: str, rng: random.Random) -> List[VerkadaEvent]:
+    return [
+        VerkadaEvent(
+            event_id=f"{prefix}-{i}",
+            event_type="door_opened",
+            timestamp=datetime.fromtimestamp(rng.randrange(START, END), tz=timezone.utc),
+            user_id=f"u{rng.randrange(500)}",
+            door_name=f"Door {rng.randrange(40)}",
+        )
+        for i in range(count)
+    ]
+
+
+async def run_workload(
+    read: Callable[[VerkadaEventQueryParams], Awaitable[Any]],
+    write: Callable[[List[VerkadaEvent]], Awaitable[Any]],
+    readers: int,
+    duration: float,
+) -> Dict[str, float]:
+    rng = random.Random(7)
+    read_latencies: List[float] = []
+    lags: List[float] = []
+    batches_written = 0
+    deadline = time.perf_counter() + duration
+
+    async def reader() -> None:
+        while time.perf_counter() < deadline:
+            params = VerkadaEventQueryParams(user_id=f"u{rng.randrange(500)}", page_size=100)
+            started = time.perf_counter()
+            await read(params)
+            read_latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0)
+
+    async def writer() -> None:
+        nonlocal batches_written
+        while time.perf_counter() < deadline:
+            await write(make_events(200, f"w{batches_written}", rng))
+            batches_written += 1
+            await asyncio.sleep(0.05)
+
+    async def probe() -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            await asyncio.sleep(0.01)
+            lags.append(time.perf_counter() - started - 0.01)
+
+    await asyncio.gather(probe(), writer(), *(reader() for _ in range(readers)))
+    return {
+        "reads_per_second": len(read_latencies) / duration,
+        "read_p95_ms": float(np.percentile(read_latencies, 95)) * 1000,
+        "batches_written": batches_written,
+        "max_loop_lag_ms": max(lags) * 1000,
+    }
+
+
+def seed(db_path: str, events: int) -> None:
+    engine = create_engine(f"sqlite:///{db_path}")
+    db_models.Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        event_store_service.store_events(db, make_events(events, "seed", random.Random(42)))
+        event_store_service.ensure_keyset_index(db)
+    engine.dispose()
+
+
+def bench_sync(db_path: str, readers: int, duration: float) -> Dict[str, float]:
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    session_factory = sessionmaker(autoflush=False, bind=engine)
+
+    async def read(params: VerkadaEventQueryParams) -> None:
+        with session_factory() as db:
+            event_store_service.query_events(db, params)
+
+    async def write(events: List[VerkadaEvent]) -> None:
+        with session_factory() as db:
+            event_store_service.store_events(db, events)
+
+    try:
+        return asyncio.run(run_workload(read, write, readers, duration))
+    finally:
+        engine.dispose()
+
+
+def bench_async_wal(db_path: str, readers: int, duration: float) -> Dict[str, float]:
+    async def run() -> Dict[str, float]:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", pool_size=readers + 2)
+        event.listen(engine.sync_engine, "connect", apply_sqlite_pragmas)
+        session_factory = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+        async def read(params: VerkadaEventQueryParams) -> None:
+            async with session_factory() as db:
+                await db.run_sync(event_store_service.query_events, params)
+
+        async def write(events: List[VerkadaEvent]) -> None:
+            async with session_factory() as db:
+                await db.run_sync(event_store_service.store_events, events)
+
+        try:
+            return await run_workload(read, write, readers, duration)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=50000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5.0)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, bench in (("sync (before)", bench_sync), ("async WAL (after)", bench_async_wal)):
+            db_path = os.path.join(tmp_dir, f"{bench.__name__}.db")
+            seed(db_path, args.events)
+            results[name] = bench(db_path, args.readers, args.duration)
+
+    print(f"{args.events} stored events, {args.readers} readers + 1 writer, {args.duration:.0f}s")
+    print(f"{'variant':<18} {'reads/s':>9} {'read p95 ms':>12} {'batches':>8} {'max loop lag ms':>16}")
+    for name, result in results.items():
+        print(
+            f"{name:<18} {result['reads_per_second']:>9.1f} {result['read_p95_ms']:>12.1f} "
+            f"{result['batches_written']:>8} {result['max_loop_lag_ms']:>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Login throughput benchmark: a burst of concurrent logins (e.g. at shift change)
+against the in-process app, with bcrypt run inline on the event loop (the old
+behaviour) and in the bounded password hashing pool.
+
+Besides logins/s and login latency it reports the latency of a cheap request
+(GET /) issued while the burst is running, which is what every dashboard
+user feels when the event loop is blocked. Logins rejected with 503 because
+the pool was saturated are counted separately.
+
+Usage (from the project root):
+    PYTHONPATH=backend python benchmarks/bench_login_throughput.py [--logins 64] [--concurrency 32]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+import httpx
+import numpy as np
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+os.environ.setdefault("VERKADA_API_KEY", "bench-api-key")
+from app.core import security  # noqa: E402
+from app.db import models as db_models  # noqa: E402
+from app.db.session import apply_sqlite_pragmas, get_async_db  # noqa: E402
+from app.main import app  # noqa: E402
+
+PASSWORD = "shift-change-password"
+
+
+class InlinePool:
+    """Stand-in for PasswordHashingPool that runs bcrypt on the event loop, as before."""
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        return func(*args)
+
+
+async def run_burst(logins: int, concurrency: int, users: int) -> Dict[str, Any]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://dashboard", timeout=120) as client:
+        semaphore = asyncio.Semaphore(concurrency)
+        login_latencies: List[float] = []
+        probe_latencies: List[float] = []
+        statuses: Dict[int, int] = {}
+        burst_done = asyncio.Event()
+
+        async def login(index: int) -> None:
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post(
+                    "/api/v1/auth/login/token", data={"username": f"user{index % users}", "password": PASSWORD}
+                )
+                login_latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        async def probe() -> None:
+            while not burst_done.is_set():
+                started = time.perf_counter()
+                await client.get("/")
+                probe_latencies.append(time.perf_counter() - started)
+                await asyncio.sleep(0.01)
+
+        probe_task = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login(index) for index in range(logins)))
+        elapsed = time.perf_counter() - started
+        burst_done.set()
+        await probe_task
+
+    successful = statuses.get(200, 0)
+    return {
+        "logins_per_second": successful / elapsed,
+        "login_p95_ms": float(np.percentile(login_latencies, 95)) * 1000,
+        "probe_p95_ms": float(np.percentile(probe_latencies, 95)) * 1000 if probe_latencies else 0.0,
+        "probe_max_ms": max(probe_latencies) * 1000 if probe_latencies else 0.0,
+        "rejected": statuses.get(503, 0),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--users", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}", connect_args={"check_same_thread": False}
+        )
+        db_models.Base.metadata.create_all(bind=engine)
+        session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        password_hash = security.get_password_hash(PASSWORD)
+        with session_factory() as db:
+            db.add_all(db_models.User(username=f"user{i}", hashed_password=password_hash) for i in range(args.users))
+            db.commit()
+
+        engine.dispose()
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp_dir, 'bench.db')}")
+        event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+        async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+        async def override_get_async_db():
+            async with async_session_factory() as db:
+                yield db
+
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        pool = security.password_hashing_pool
+        results = {}
+        try:
+            security.password_hashing_pool = InlinePool()
+            results["inline (before)"] = asyncio.run(run_burst(args.logins, args.concurrency, args.users))
+            # Reason: Pooled aiosqlite connections belong to the event loop that opened them.
+            asyncio.run(async_engine.dispose())
+            security.password_hashing_pool = pool
+            results["hashing pool (after)"] = asyncio.run(run_burst(args.logins, args.concurrency, args.users))
+            asyncio.run(async_engine.dispose())
+        finally:
+            security.password_hashing_pool = pool
+            app.dependency_overrides.pop(get_async_db, None)
+
+    print(f"{args.logins} logins, {args.concurrency} concurrent, bcrypt rounds={security.pwd_context.handler('bcrypt').default_rounds}")
+    print(f"{'variant':<22} {'logins/s':>9} {'login p95 ms':>13} {'GET / p95 ms':>13} {'GET / max ms':>13} {'503s':>6}")
+    for name, result in results.items():
+        print(
+            f"{name:<22} {result['logins_per_second']:>9.1f} {result['login_p95_ms']:>13.1f} "
+            f"{result['probe_p95_ms']:>13.1f} {result['probe_max_ms']:>13.1f} {result['rejected']:>6}"
+        )
+
+
+if __name__ == "__main__":
+    main()
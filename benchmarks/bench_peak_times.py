@@ -0,0 +1,105 @@
+"""
+Benchmark of the /peak-times aggregation: the previous pandas implementation
+(per-event Pydantic models, model_dump, DataFrame, merge, iterrows) against the
+streaming NumPy HourOfDayAggregator.
+
+Both start from the same pages of raw Verkada event dictionaries, as returned
+by the events API.
+
+Usage (from the project root, after pip install -r benchmarks/requirements.txt):
+    PYTHONPATH=backend python benchmarks/bench_peak_times.py [--sizes 4000 100000 1000000]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+import pandas as pd
+
+from app.models import verkada_event as verkada_event_schemas
+from app.services.aggregation import HourOfDayAggregator
+
+PAGE_SIZE = 200
+
+
+def make_pages(event_count: int, seed: int = 42) -> List[List[Dict]]:
+    """Generates pages of synthetic raw events spread over 30 days."""
+    rng = random.Random(seed)
+    end = int(datetime(2025, 6, 1, tzinfo=timezone.utc).timestamp())
+    start = end - 30 * 86400
+    events = [
+        {
+            "eventId": f"evt-{i}",
+            "eventType": "door_opened",
+            "timestamp": datetime.fromtimestamp(rng.randrange(start, end), tz=timezone.utc).isoformat(),
+            "userName": f"User {rng.randrange(500)}",
+            "doorName": f"Door {rng.randrange(40)}",
+        }
+        for i in range(event_count)
+    ]
+    return [events[i:i + PAGE_SIZE] for i in range(0, event_count, PAGE_SIZE)]
+
+
+def legacy_pandas(pages: List[List[Dict]]) -> List[int]:
+    """The aggregation /peak-times used before the NumPy engine."""
+    all_events = [
+        verkada_event_schemas.VerkadaEvent.model_validate(item) for page in pages for item in page
+    ]
+    df = pd.DataFrame([event.model_dump() for event in all_events])
+    df['timestamp'] = pd.to_datetime(df['timestamp'])
+    df['hour'] = df['timestamp'].dt.hour
+    peak_times_counts = df.groupby('hour').size().reset_index(name='event_count')
+    all_hours_df = pd.DataFrame({'hour': range(24)})
+    peak_times_counts = pd.merge(all_hours_df, peak_times_counts, on='hour', how='left').fillna(0)
+    peak_times_counts['event_count'] = peak_times_counts['event_count'].astype(int)
+    return [
+        verkada_event_schemas.PeakTimeDataPoint(hour=row['hour'], event_count=row['event_count']).event_count
+        for index, row in peak_times_counts.iterrows()
+    ]
+
+
+def streaming_numpy(pages: List[List[Dict]]) -> List[int]:
+    """The streaming HourOfDayAggregator used by /peak-times now."""
+    aggregator = HourOfDayAggregator()
+    for page in pages:
+        aggregator.add_raw_events(page)
+    return [point.event_count for point in aggregator.to_data_points()]
+
+
+def measure(func: Callable, pages: List[List[Dict]], trace_memory: bool):
+    """
+    Returns (result, seconds, peak traced memory in MB or None) of func(pages).
+    Memory is measured in a second run, since tracemalloc slows the code down.
+    """
+    started = time.perf_counter()
+    result = func(pages)
+    elapsed = time.perf_counter() - started
+    if not trace_memory:
+        return result, elapsed, None
+    tracemalloc.start()
+    func(pages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[4_000, 100_000, 1_000_000])
+    parser.add_argument("--memory", action="store_true", help="Also report peak memory (slower).")
+    args = parser.parse_args()
+
+    print(f"{'events':>10} {'pandas s':>10} {'numpy s':>10} {'speedup':>8} {'pandas MB':>10} {'numpy MB':>9}")
+    for size in args.sizes:
+        pages = make_pages(size)
+        legacy_result, legacy_s, legacy_mb = measure(legacy_pandas, pages, args.memory)
+        new_result, new_s, new_mb = measure(streaming_numpy, pages, args.memory)
+        assert legacy_result == new_result, "aggregations disagree"
+        memory = f"{legacy_mb:>10.1f} {new_mb:>9.1f}" if args.memory else f"{'-':>10} {'-':>9}"
+        print(f"{size:>10} {legacy_s:>10.3f} {new_s:>10.3f} {legacy_s / new_s:>7.1f}x {memory}")
+
+
+if __name__ == "__main__":
+    main()
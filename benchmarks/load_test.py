@@ -0,0 +1,243 @@
+"""
+End-to-end load test of the dashboard API.
+
+N concurrent simulated users log in once and then request the given endpoints
+in a loop for a fixed duration. Latency percentiles (p50/p95/p99), requests per
+second and error counts are reported per endpoint.
+
+By default the FastAPI app runs in-process (via httpx.ASGITransport) and its
+Verkada client is wired to the stub API from benchmarks/stub_verkada_api.py,
+so no network, live Verkada org or running server is needed. The in-process
+app uses a throwaway SQLite database that is deleted afterwards, so the
+load-test user and any synced events never reach /app/data/dashboard.db. With
+--target the harness drives an already running backend instead (e.g. the
+Proxmox VM started with VERKADA_API_BASE_URL pointing at a standalone stub);
+the --username account is registered there if it does not exist yet.
+
+Usage (from the project root):
+    PYTHONPATH=backend python benchmarks/load_test.py --users 20 --duration 15
+    PYTHONPATH=backend python benchmarks/load_test.py --users 50 --rate-limit-rate 0.05 \\
+        --endpoint "/api/v1/verkada/peak-times?days_history=7"
+    python benchmarks/load_test.py --target http://vm:8000 --users 20
+
+Exits with status 1 if --max-p95-ms or --max-error-rate is exceeded, so it can
+gate a deployment.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from typing import Dict, List, Optional
+
+import httpx
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from stub_verkada_api import build_arg_parser, config_from_args, create_stub_app  # noqa: E402
+
+DEFAULT_ENDPOINTS = [
+    "/api/v1/verkada/events?page_size=50",
+    "/api/v1/verkada/peak-times?days_history=7",
+]
+
+
+class EndpointStats:
+    """Latencies and status codes recorded for one endpoint."""
+
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.status_codes: Dict[int, int] = {}
+        self.failures = 0 # Transport errors (no HTTP response)
+
+    def record(self, latency_ms: float, status_code: Optional[int]) -> None:
+        self.latencies_ms.append(latency_ms)
+        if status_code is None:
+            self.failures += 1
+        else:
+            self.status_codes[status_code] = self.status_codes.get(status_code, 0) + 1
+
+    @property
+    def requests(self) -> int:
+        return len(self.latencies_ms)
+
+    @property
+    def errors(self) -> int:
+        return self.failures + sum(count for code, count in self.status_codes.items() if code >= 400)
+
+    def percentile(self, q: float) -> float:
+        return float(np.percentile(self.latencies_ms, q)) if self.latencies_ms else 0.0
+
+
+def use_throwaway_database(db_path: str) -> None:
+    """
+    Rebinds the backend's engines and session factories to a scratch SQLite
+    file. Must run before app.main is imported, which binds `engine` at import.
+    """
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from app.db import session
+
+    session.engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    event.listen(session.engine, "connect", session.apply_sqlite_pragmas)
+    session.async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    event.listen(session.async_engine.sync_engine, "connect", session.apply_sqlite_pragmas)
+    # Reason: Modules import the session factories themselves, so rebind them in place.
+    session.SessionLocal.configure(bind=session.engine)
+    session.AsyncSessionLocal.configure(bind=session.async_engine)
+
+
+async def install_inprocess_app(args: argparse.Namespace, stack: AsyncExitStack) -> httpx.AsyncClient:
+    """
+    Imports the backend on a throwaway database, points its Verkada client at an
+    in-process stub API and returns an httpx client bound to the app.
+    Startup/shutdown handlers are run.
+    """
+    os.environ.setdefault("VERKADA_API_KEY", "stub-api-key")
+    db_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="load-test-db-"))
+    use_throwaway_database(os.path.join(db_dir, "dashboard.db"))
+    from app.db import session as app_session
+    stack.push_async_callback(app_session.async_engine.dispose)
+    stack.callback(app_session.engine.dispose)
+    from app import main as app_main
+    from app.api.endpoints import verkada as verkada_endpoints
+    from app.core import config as app_config
+    from app.core.verkada_client.authenticator import VerkadaAuthenticator
+    from app.core.verkada_client.client import VerkadaApiClient
+    from app.core.verkada_client.rate_limiter import RateLimitScheduler
+
+    settings = app_config.get_settings()
+    stub_app = create_stub_app(config_from_args(args))
+    api_client = VerkadaApiClient(
+        authenticator=VerkadaAuthenticator(api_key="stub-api-key", token_url="http://verkada-stub/token"),
+        base_url="http://verkada-stub",
+        max_connections=settings.VERKADA_HTTP_MAX_CONNECTIONS,
+        transport=httpx.ASGITransport(app=stub_app),
+        rate_limiter=RateLimitScheduler(
+            rate=args.upstream_rate or settings.VERKADA_RATE_LIMIT_PER_SECOND,
+            burst=settings.VERKADA_RATE_LIMIT_BURST,
+        ),
+        max_rate_limit_retries=settings.VERKADA_RATE_LIMIT_MAX_RETRIES,
+    )
+    # Reason: Modules bind the shared client at import time, so each reference is swapped.
+    for module in (app_config, app_main, verkada_endpoints):
+        module.verkada_api_client = api_client
+    args.stub_stats = stub_app.state.stats
+
+    await stack.enter_async_context(app_main.app.router.lifespan_context(app_main.app))
+    return await stack.enter_async_context(httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app_main.app), base_url="http://dashboard", timeout=args.timeout
+    ))
+
+
+async def login(client: httpx.AsyncClient, username: str, password: str) -> Dict[str, str]:
+    """Registers the load-test user if needed and returns bearer auth headers."""
+    await client.post("/api/v1/auth/register", json={
+        "username": username, "email": f"{username}@example.com", "password": password,
+    })
+    response = await client.post("/api/v1/auth/login/token", data={"username": username, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def simulated_user(
+    user_index: int,
+    client: httpx.AsyncClient,
+    headers: Dict[str, str],
+    endpoints: List[str],
+    deadline: float,
+    stats: Dict[str, EndpointStats],
+) -> None:
+    """Requests the endpoints round-robin until the deadline."""
+    request_index = user_index
+    while time.perf_counter() < deadline:
+        endpoint = endpoints[request_index % len(endpoints)]
+        request_index += 1
+        started = time.perf_counter()
+        try:
+            response = await client.get(endpoint, headers=headers)
+            status_code: Optional[int] = response.status_code
+        except httpx.HTTPError:
+            status_code = None
+        stats[endpoint].record((time.perf_counter() - started) * 1000, status_code)
+
+
+async def run_load_test(args: argparse.Namespace) -> Dict[str, EndpointStats]:
+    stats = {endpoint: EndpointStats() for endpoint in args.endpoint}
+    async with AsyncExitStack() as stack:
+        if args.target:
+            client = await stack.enter_async_context(httpx.AsyncClient(
+                base_url=args.target, timeout=args.timeout,
+                limits=httpx.Limits(max_connections=args.users),
+            ))
+        else:
+            client = await install_inprocess_app(args, stack)
+        headers = await login(client, args.username, args.password)
+
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            simulated_user(index, client, headers, args.endpoint, deadline, stats)
+            for index in range(args.users)
+        ))
+        args.elapsed = time.perf_counter() - started
+    return stats
+
+
+def print_report(args: argparse.Namespace, stats: Dict[str, EndpointStats]) -> bool:
+    """Prints the results table and returns False if a threshold was exceeded."""
+    print(f"{args.users} users, {args.elapsed:.1f}s, target: {args.target or 'in-process app + stub API'}")
+    header = f"{'endpoint':<48} {'requests':>9} {'errors':>7} {'rps':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    passed = True
+    for endpoint, endpoint_stats in stats.items():
+        rps = endpoint_stats.requests / args.elapsed if args.elapsed else 0.0
+        p95 = endpoint_stats.percentile(95)
+        print(
+            f"{endpoint:<48} {endpoint_stats.requests:>9} {endpoint_stats.errors:>7} {rps:>8.1f} "
+            f"{endpoint_stats.percentile(50):>9.1f} {p95:>9.1f} {endpoint_stats.percentile(99):>9.1f}"
+        )
+        if endpoint_stats.errors:
+            print(f"    status codes: {dict(sorted(endpoint_stats.status_codes.items()))}, transport errors: {endpoint_stats.failures}")
+        error_rate = endpoint_stats.errors / endpoint_stats.requests if endpoint_stats.requests else 0.0
+        if args.max_p95_ms is not None and p95 > args.max_p95_ms:
+            passed = False
+        if args.max_error_rate is not None and error_rate > args.max_error_rate:
+            passed = False
+    stub_stats = getattr(args, "stub_stats", None)
+    if stub_stats is not None:
+        print(
+            f"stub API: {stub_stats.events_requests} events requests, {stub_stats.events_served} events served, "
+            f"{stub_stats.rate_limits_injected} 429s and {stub_stats.errors_injected} 500s injected, "
+            f"{stub_stats.token_requests} token requests"
+        )
+    return passed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, parents=[build_arg_parser()], formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=10, help="Number of concurrent simulated users.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Test duration in seconds.")
+    parser.add_argument("--endpoint", action="append", help="Endpoint path and query; repeatable.")
+    parser.add_argument("--target", help="Base URL of a running backend. Omit to run the app in-process.")
+    parser.add_argument("--upstream-rate", type=float, help="In-process only: override the Verkada client rate limit (req/s).")
+    parser.add_argument("--username", default="loadtest")
+    parser.add_argument("--password", default="loadtest-password")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--max-p95-ms", type=float, help="Fail if any endpoint's p95 latency exceeds this.")
+    parser.add_argument("--max-error-rate", type=float, help="Fail if any endpoint's error rate exceeds this fraction.")
+    args = parser.parse_args()
+    args.endpoint = args.endpoint or DEFAULT_ENDPOINTS
+
+    stats = asyncio.run(run_load_test(args))
+    if not print_report(args, stats):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Local stand-in for the Verkada API, for load tests and development without a
+live Verkada org.
+
+Serves the two endpoints the backend uses:
+- POST /token               returns a fixed API token for any x-api-key.
+- GET  /events/v1/access    returns synthetic access events for
+                            [start_time, end_time), paged with page_size and
+                            page_token like the real API.
+
+Events are derived from their position on a fixed time grid (events_per_hour),
+so the same range always returns the same events and pages never overlap.
+Response latency, HTTP 500 errors and 429 rate-limit responses can be injected.
+
+Run standalone (from the project root), then point the backend at it with
+VERKADA_API_BASE_URL=http://localhost:8081:
+    python benchmarks/stub_verkada_api.py --port 8081 --events-per-hour 600 --latency-ms 40
+
+Or mount it in-process with httpx.ASGITransport(app=create_stub_app(...)),
+as benchmarks/load_test.py does.
+"""
+import argparse
+import asyncio
+import math
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from fastapi import FastAPI, Header, Query
+from fastapi.responses import JSONResponse
+
+EVENT_TYPES = ["door_opened", "door_opened", "door_opened", "access_granted", "access_denied", "door_held_open"]
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stub API."""
+    events_per_hour: float = 120.0
+    max_page_size: int = 200
+    latency_ms: float = 20.0
+    latency_jitter_ms: float = 10.0
+    error_rate: float = 0.0 # Fraction of events requests answered with HTTP 500
+    rate_limit_rate: float = 0.0 # Fraction of events requests answered with HTTP 429
+    retry_after_seconds: float = 1.0
+    user_count: int = 200
+    door_count: int = 20
+    token: str = "stub-token"
+    seed: int = 0
+
+
+@dataclass
+class StubStats:
+    """Request counters of the stub API."""
+    token_requests: int = 0
+    events_requests: int = 0
+    events_served: int = 0
+    errors_injected: int = 0
+    rate_limits_injected: int = 0
+    by_status: Dict[int, int] = field(default_factory=dict)
+
+
+def synthetic_event(index: int, config: StubConfig) -> Dict:
+    """Returns the raw event at position `index` of the stub's time grid."""
+    interval = 3600.0 / config.events_per_hour
+    # Reason: Multiplicative hashing spreads users and doors evenly without a per-event RNG.
+    user = (index * 2654435761 + config.seed) % config.user_count
+    door = (index * 40503 + config.seed) % config.door_count
+    return {
+        "eventId": f"evt-{index}",
+        "eventType": EVENT_TYPES[(index * 7 + config.seed) % len(EVENT_TYPES)],
+        "timestamp": datetime.fromtimestamp(int(index * interval), tz=timezone.utc).isoformat(),
+        "userId": f"user-{user}",
+        "userName": f"User {user}",
+        "doorName": f"Door {door}",
+        "deviceId": f"device-{door}",
+        "siteId": "site-1",
+    }
+
+
+def create_stub_app(config: Optional[StubConfig] = None) -> FastAPI:
+    """
+    Builds the stub API application. Counters are kept in app.state.stats.
+    """
+    config = config or StubConfig()
+    rng = random.Random(config.seed)
+    stub_app = FastAPI(title="Verkada API stub")
+    stub_app.state.config = config
+    stub_app.state.stats = StubStats()
+
+    def count_status(status_code: int) -> None:
+        stats = stub_app.state.stats
+        stats.by_status[status_code] = stats.by_status.get(status_code, 0) + 1
+
+    async def simulate_latency() -> None:
+        delay_ms = config.latency_ms + rng.uniform(-config.latency_jitter_ms, config.latency_jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+    @stub_app.post("/token")
+    async def token(x_api_key: Optional[str] = Header(None)):
+        stub_app.state.stats.token_requests += 1
+        await simulate_latency()
+        if not x_api_key:
+            count_status(401)
+            return JSONResponse(status_code=401, content={"message": "missing x-api-key"})
+        count_status(200)
+        return {"token": config.token}
+
+    @stub_app.get("/events/v1/access")
+    async def access_events(
+        start_time: Optional[int] = Query(None),
+        end_time: Optional[int] = Query(None),
+        page_size: int = Query(100),
+        page_token: Optional[str] = Query(None),
+        x_verkada_auth: Optional[str] = Header(None),
+    ):
+        stats = stub_app.state.stats
+        stats.events_requests += 1
+        await simulate_latency()
+        if x_verkada_auth != config.token:
+            count_status(401)
+            return JSONResponse(status_code=401, content={"message": "invalid token"})
+        roll = rng.random()
+        if roll < config.rate_limit_rate:
+            stats.rate_limits_injected += 1
+            count_status(429)
+            return JSONResponse(
+                status_code=429,
+                content={"message": "rate limit exceeded"},
+                headers={"Retry-After": f"{config.retry_after_seconds:g}"},
+            )
+        if roll < config.rate_limit_rate + config.error_rate:
+            stats.errors_injected += 1
+            count_status(500)
+            return JSONResponse(status_code=500, content={"message": "injected error"})
+
+        now = int(datetime.now(timezone.utc).timestamp())
+        end_time = min(end_time if end_time is not None else now, now)
+        start_time = start_time if start_time is not None else end_time - 3600
+        interval = 3600.0 / config.events_per_hour
+        # Grid indexes of the events in [start_time, end_time).
+        first_index = math.ceil(start_time / interval)
+        end_index = math.ceil(end_time / interval)
+        try:
+            page_start = max(first_index, int(page_token)) if page_token else first_index
+        except ValueError:
+            count_status(400)
+            return JSONResponse(status_code=400, content={"message": "invalid page_token"})
+        page_end = min(end_index, page_start + max(1, min(page_size, config.max_page_size)))
+
+        events = [synthetic_event(index, config) for index in range(page_start, page_end)]
+        stats.events_served += len(events)
+        count_status(200)
+        return {
+            "events": events,
+            "nextPageToken": str(page_end) if page_end < end_index else None,
+        }
+
+    return stub_app
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command line options shared by the stub and the load-test harness."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--events-per-hour", type=float, default=StubConfig.events_per_hour)
+    parser.add_argument("--max-page-size", type=int, default=StubConfig.max_page_size)
+    parser.add_argument("--latency-ms", type=float, default=StubConfig.latency_ms)
+    parser.add_argument("--latency-jitter-ms", type=float, default=StubConfig.latency_jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=StubConfig.error_rate)
+    parser.add_argument("--rate-limit-rate", type=float, default=StubConfig.rate_limit_rate)
+    parser.add_argument("--retry-after-seconds", type=float, default=StubConfig.retry_after_seconds)
+    parser.add_argument("--seed", type=int, default=StubConfig.seed)
+    return parser
+
+
+def config_from_args(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(
+        events_per_hour=args.events_per_hour,
+        max_page_size=args.max_page_size,
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.latency_jitter_ms,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_seconds=args.retry_after_seconds,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, parents=[build_arg_parser()],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    args = parser.parse_args()
+
+    import uvicorn
+    uvicorn.run(create_stub_app(config_from_args(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,7 +12,7 @@ import './App.css'; // Keep existing App.css or remove if not needed for new lay
 // Placeholder for Dashboard Page
 function DashboardPage() {
   const { logout, user } = useAuth();
-  const [filters, setFilters] = useState({ startDate: '', endDate: ''/*, user: ''*/ });
+  const [filters, setFilters] = useState({ startDate: '', endDate: '', user: '' });
 
   const handleFilterChange = (newFilters) => {
     setFilters(newFilters);
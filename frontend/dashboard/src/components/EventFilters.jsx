@@ -1,34 +1,70 @@
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
+import axios from 'axios';
 
 function EventFilters({ onFilterChange }) {
   const [startDate, setStartDate] = useState('');
   const [endDate, setEndDate] = useState('');
-  // const [userFilter, setUserFilter] = useState(''); // Placeholder for user filter
+  const [userFilter, setUserFilter] = useState(''); // Name (or ID) typed by the user
+  const [userSuggestions, setUserSuggestions] = useState([]);
+
+  // Suggest user names from the server-side name index as the user types.
+  useEffect(() => {
+    const query = userFilter.trim();
+    if (!query) {
+      setUserSuggestions([]);
+      return undefined;
+    }
+    const controller = new AbortController();
+    const timer = setTimeout(async () => {
+      try {
+        const response = await axios.get('/api/v1/search/names', {
+          params: { q: query, kind: 'user', limit: 10 },
+          signal: controller.signal,
+        });
+        setUserSuggestions(response.data.data || []);
+      } catch (err) {
+        if (!axios.isCancel(err)) {
+          setUserSuggestions([]); // Search unavailable (e.g. no local event store); the field still accepts IDs
+        }
+      }
+    }, 150);
+    return () => {
+      clearTimeout(timer);
+      controller.abort();
+    };
+  }, [userFilter]);
+
+  // A suggested name resolves to its user ID; anything else is treated as an ID.
+  const resolveUserId = () => {
+    const typed = userFilter.trim();
+    const match = userSuggestions.find((s) => s.name.toLowerCase() === typed.toLowerCase() && s.id);
+    return match ? match.id : typed;
+  };
 
   const handleApplyFilters = () => {
     // Basic validation: ensure dates are reasonable if needed
     onFilterChange({
       startDate,
       endDate,
-      // user: userFilter,
+      user: resolveUserId(),
     });
   };
 
   const handleClearFilters = () => {
     setStartDate('');
     setEndDate('');
-    // setUserFilter('');
+    setUserFilter('');
     onFilterChange({
       startDate: '',
       endDate: '',
-      // user: '',
+      user: '',
     });
   };
 
   return (
     <div className="bg-white shadow-md rounded-lg p-4 mb-6">
       <h3 className="text-lg font-semibold text-gray-700 mb-3">Filter Events</h3>
-      <div className="grid grid-cols-1 md:grid-cols-3 gap-4 items-end">
+      <div className="grid grid-cols-1 md:grid-cols-4 gap-4 items-end">
         <div>
           <label htmlFor="startDate" className="block text-sm font-medium text-gray-600 mb-1">
             Start Date
@@ -53,7 +89,6 @@ function EventFilters({ onFilterChange }) {
             className="w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-indigo-500 focus:border-indigo-500 sm:text-sm"
           />
         </div>
-        {/* 
         <div>
           <label htmlFor="userFilter" className="block text-sm font-medium text-gray-600 mb-1">
             User
@@ -61,13 +96,21 @@ function EventFilters({ onFilterChange }) {
           <input
             type="text"
             id="userFilter"
+            list="userSuggestions"
+            autoComplete="off"
             placeholder="Enter username or ID"
             value={userFilter}
             onChange={(e) => setUserFilter(e.target.value)}
             className="w-full px-3 py-2 border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-indigo-500 focus:border-indigo-500 sm:text-sm"
           />
+          <datalist id="userSuggestions">
+            {userSuggestions.map((s) => (
+              <option key={`${s.name}-${s.id}`} value={s.name}>
+                {s.id}
+              </option>
+            ))}
+          </datalist>
         </div>
-        */}
         <div className="md:col-span-1 flex space-x-2">
           <button
             onClick={handleApplyFilters}
@@ -26,9 +26,9 @@ function EventTimeline({ filters }) { // Accept filters as a prop
         if (filters?.endDate) {
           queryParams.append('end_date', filters.endDate);
         }
-        // if (filters?.user) { // If user filter is implemented
-        //   queryParams.append('user_id', filters.user);
-        // }
+        if (filters?.user) { // User ID, resolved from the typed name by EventFilters
+          queryParams.append('user_id', filters.user);
+        }
         
         const endpoint = `/api/v1/verkada/events${queryParams.toString() ? `?${queryParams.toString()}` : ''}`;
         
@@ -46,6 +46,49 @@ function EventTimeline({ filters }) { // Accept filters as a prop
     fetchEvents();
   }, [token, filters]); // Re-fetch if token or filters change
 
+  // Prepend new events pushed by the server instead of polling /events.
+  // fetch() is used rather than EventSource so the bearer token can be sent as a header.
+  useEffect(() => {
+    if (!token) {
+      return undefined;
+    }
+    const controller = new AbortController();
+    const listen = async () => {
+      try {
+        const response = await fetch('/api/v1/live/events', {
+          headers: { Authorization: `Bearer ${token}`, Accept: 'text/event-stream' },
+          signal: controller.signal,
+        });
+        if (!response.ok || !response.body) {
+          return;
+        }
+        const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = '';
+        for (;;) {
+          const { value, done } = await reader.read();
+          if (done) {
+            return;
+          }
+          buffer += value;
+          const messages = buffer.split('\n\n');
+          buffer = messages.pop();
+          const newEvents = messages
+            .filter((message) => message.includes('event: access_event'))
+            .map((message) => JSON.parse(message.split('\n').find((line) => line.startsWith('data: ')).slice(6)));
+          if (newEvents.length) {
+            setEvents((current) => [...newEvents.reverse(), ...current]);
+          }
+        }
+      } catch (err) {
+        if (err.name !== 'AbortError') {
+          console.error('Live event feed failed:', err);
+        }
+      }
+    };
+    listen();
+    return () => controller.abort();
+  }, [token]);
+
   if (loading) {
     return <div className="text-center p-4">Loading events...</div>;
   }
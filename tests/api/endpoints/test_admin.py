@@ -0,0 +1,23 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import get_settings as app_get_settings
+from backend.app.core.config import get_settings
+
+
+def _token(client: TestClient, username: str) -> str:
+    credentials = {"username": username, "password": "adminpassword123"}
+    client.post("/api/v1/auth/register", json=credentials)
+    return client.post("/api/v1/auth/login/token", data=credentials).json()["access_token"]
+
+
+def test_backfill_endpoints_require_an_administrator(client: TestClient, monkeypatch):
+    """
+    Any registered user is authenticated, but only ADMIN_USERNAMES may use the admin endpoints.
+    """
+    headers = {"Authorization": f"Bearer {_token(client, 'backfill_admin')}"}
+    assert client.get("/api/v1/admin/backfill", headers=headers).status_code == 403
+
+    # Reason: The app under test is imported as "app", the tests import it as "backend.app".
+    for settings in (get_settings(), app_get_settings()):
+        monkeypatch.setattr(settings, "ADMIN_USERNAMES", "someone, backfill_admin")
+    assert client.get("/api/v1/admin/backfill", headers=headers).status_code == 404
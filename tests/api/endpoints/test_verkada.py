@@ -0,0 +1,35 @@
+import time
+
+from backend.app.api.endpoints import verkada
+from backend.app.core.config import get_settings
+from backend.app.models.verkada_event import VerkadaEventQueryParams
+
+
+def test_events_cache_key_normalizes_comma_separated_filters():
+    """
+    Filter lists that differ only in order or whitespace share a cache entry;
+    different filters or time windows do not.
+    """
+    key = verkada._events_cache_key(VerkadaEventQueryParams(start_time=100, event_type="a,b", user_id="u1"))
+
+    assert verkada._events_cache_key(VerkadaEventQueryParams(start_time=100, event_type="b, a", user_id=" u1,")) == key
+    assert verkada._events_cache_key(VerkadaEventQueryParams(start_time=100, event_type="a", user_id="u1")) != key
+    assert verkada._events_cache_key(VerkadaEventQueryParams(start_time=200, event_type="a,b", user_id="u1")) != key
+
+
+def test_events_cache_key_ignores_local_only_params():
+    params = VerkadaEventQueryParams(start_time=100, event_type="a")
+    assert verkada._events_cache_key(params) == verkada._events_cache_key(
+        VerkadaEventQueryParams(start_time=100, event_type="a", door_name="Lobby", order="asc")
+    )
+
+
+def test_events_cache_ttl_is_long_only_for_windows_that_ended_long_ago():
+    settings = get_settings()
+    now = int(time.time())
+    old_end = now - settings.EVENTS_CACHE_IMMUTABLE_AFTER_SECONDS - 60
+    recent_end = now - settings.EVENTS_CACHE_IMMUTABLE_AFTER_SECONDS + 60
+
+    assert verkada._events_cache_ttl(VerkadaEventQueryParams(end_time=old_end)) == settings.EVENTS_CACHE_IMMUTABLE_TTL_SECONDS
+    assert verkada._events_cache_ttl(VerkadaEventQueryParams(end_time=recent_end)) == settings.EVENTS_CACHE_TTL_SECONDS
+    assert verkada._events_cache_ttl(VerkadaEventQueryParams(start_time=old_end)) == settings.EVENTS_CACHE_TTL_SECONDS
@@ -1,7 +1,9 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, delete
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool, StaticPool
 from typing import Generator
 
 # Corrected import paths assuming 'tests' is at the project root,
@@ -10,11 +12,13 @@ from typing import Generator
 # or run pytest from the project root.
 # Example: PYTHONPATH=. pytest
 from backend.app.main import app  # The FastAPI application instance
-from backend.app.db.session import Base, get_db # Base for tables, get_db to override
+from backend.app.db.session import Base, get_async_db, get_db # Base for tables, get_db/get_async_db to override
 from backend.app.db.models import User # To ensure User model is loaded by Base
+from backend.app.db import models as db_models
 
 # Define an in-memory SQLite database for testing
 SQLALCHEMY_DATABASE_URL_TEST = "sqlite:///./test.db"
+ASYNC_SQLALCHEMY_DATABASE_URL_TEST = "sqlite+aiosqlite:///./test.db"
 
 engine_test = create_engine(
     SQLALCHEMY_DATABASE_URL_TEST, connect_args={"check_same_thread": False}
@@ -49,7 +53,8 @@ def db_session() -> Generator[Session, None, None]:
 def client(db_session: Session) -> Generator[TestClient, None, None]:
     """
     Pytest fixture to provide a TestClient instance for the FastAPI app.
-    Overrides the `get_db` dependency to use the test database session.
+    Overrides the `get_db` dependency to use the test database session, and
+    `get_async_db` to use async sessions on the same test database.
     """
     def override_get_db():
         try:
@@ -57,8 +62,50 @@ def client(db_session: Session) -> Generator[TestClient, None, None]:
         finally:
             db_session.close() # Should be handled by db_session fixture's teardown
 
+    # NullPool: connections are not reused across the TestClient's event loops.
+    async_engine_test = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL_TEST, poolclass=NullPool)
+    AsyncSessionLocal_test = async_sessionmaker(async_engine_test, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal_test() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
     with TestClient(app) as c:
         yield c
-    # Clean up dependency override after test
-    app.dependency_overrides.pop(get_db, None)
\ No newline at end of file
+    # Clean up dependency overrides after test
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_async_db, None)
+    # Async sessions commit for real (no outer transaction to roll back), so remove the users they created.
+    with engine_test.begin() as connection:
+        connection.execute(delete(User))
+
+@pytest.fixture(scope="function")
+def store_db() -> Generator[Session, None, None]:
+    """
+    Pytest fixture to provide a session on a fresh in-memory database with all
+    tables from db.models (users, access events, rollups) created.
+    """
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    db_models.Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+@pytest.fixture(scope="function")
+def async_store_sessionmaker(tmp_path) -> Generator[async_sessionmaker, None, None]:
+    """
+    Pytest fixture to provide an async_sessionmaker (aiosqlite) on a fresh file
+    database with all tables from db.models created. Connections are not pooled,
+    so sessions can be opened from separate asyncio.run() calls.
+    """
+    db_path = tmp_path / "store.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    db_models.Base.metadata.create_all(bind=sync_engine)
+    sync_engine.dispose()
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+    yield async_sessionmaker(engine, expire_on_commit=False)
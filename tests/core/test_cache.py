@@ -0,0 +1,33 @@
+import time
+
+from backend.app.core.cache import TTLLRUCache
+
+
+def test_lru_eviction_and_counters():
+    """
+    The least recently used entry is evicted and counters track hits, misses and evictions.
+    """
+    cache = TTLLRUCache(maxsize=2, default_ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["size"]) == (2, 1, 1, 2)
+
+
+def test_entries_expire_after_their_ttl():
+    """
+    An entry stored with a short TTL is dropped once it expires.
+    """
+    cache = TTLLRUCache(maxsize=10, default_ttl=60)
+    cache.set("short", "value", ttl=0.01)
+    cache.set("long", "value")
+    time.sleep(0.02)
+
+    assert cache.get("short") is None
+    assert cache.get("long") == "value"
+    assert cache.stats()["expirations"] == 1
@@ -0,0 +1,42 @@
+import numpy as np
+
+from backend.app.core.event_batch import EventBatch, EventBatchBuilder
+
+RAW_EVENTS = [
+    {"eventId": "e3", "eventType": "door_opened", "timestamp": 300, "userName": "Ada", "doorName": "Lobby",
+     "deviceId": "d1", "siteId": "s1"},
+    {"eventId": "e1", "eventType": "door_opened", "timestamp": 100, "userName": "Bob", "doorName": "Lobby"},
+    {"eventId": "e2", "eventType": "access_denied", "timestamp": 200, "userName": "Ada", "doorName": None},
+    {"eventId": "bad", "eventType": "door_opened", "timestamp": "not-a-date"},
+]
+
+
+def test_columns_are_dictionary_encoded():
+    """
+    Repeated strings are stored once and rows decode back to the original values.
+    """
+    batch = EventBatch.from_raw_events(RAW_EVENTS)
+
+    assert len(batch) == 3
+    assert batch.timestamps.dtype == np.int64
+    assert batch.door_names.values == ["Lobby"]
+    assert batch.user_names.values == ["Ada", "Bob"]
+    row = batch[2]
+    assert (row.event_id, row.user_name, row.door_name, row.epoch_seconds) == ("e2", "Ada", None, 200)
+    assert row.event_type == "access_denied"
+    assert (batch[0].device_id, batch[0].site_id) == ("d1", "s1")
+
+
+
+def test_builder_shares_dictionaries_across_pages():
+    """
+    Pages added to one builder are encoded against the same dictionaries.
+    """
+    builder = EventBatchBuilder()
+    builder.add_raw_events(RAW_EVENTS[:2])
+    builder.add_raw_events([dict(RAW_EVENTS[0], eventId="e4", doorName="Side Door")])
+    batch = builder.build()
+
+    assert [row.event_id for row in batch] == ["e3", "e1", "e4"]
+    assert batch.door_names.values == ["Lobby", "Side Door"]
+    assert batch.door_name_codes.tolist() == [0, 0, 1]
@@ -0,0 +1,35 @@
+from fastapi.testclient import TestClient
+
+from backend.app.core import metrics
+from backend.app.core.cache import TTLLRUCache
+
+
+def test_metrics_endpoint_reports_request_latency_by_route(client: TestClient):
+    """
+    Requests are recorded under their route template, and /metrics is served
+    in the Prometheus text format.
+    """
+    assert client.get("/").status_code == 200
+    assert client.get("/does-not-exist").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+    assert 'dashboard_http_request_duration_seconds_count{method="GET",route="/",status="200"}' in body
+    assert 'route="unmatched",status="404"' in body
+
+
+def test_registered_cache_counters_are_exported():
+    cache = TTLLRUCache(maxsize=1)
+    metrics.register_cache("test_cache", cache)
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("b")
+    cache.set("b", 2) # Evicts "a"
+
+    body = metrics.render_metrics()[0].decode()
+    assert 'cache_lookups_total{cache="test_cache",result="hit"} 1.0' in body
+    assert 'cache_lookups_total{cache="test_cache",result="miss"} 1.0' in body
+    assert 'cache_evictions_total{cache="test_cache"} 1.0' in body
+    assert 'cache_hit_ratio{cache="test_cache"} 0.5' in body
@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.app.core import security
+
+
+def test_verify_password_async_upgrades_outdated_hashes():
+    """
+    A correct password with a hash below the configured bcrypt cost is
+    verified and re-hashed; a wrong password is rejected without a new hash.
+    """
+    weak_hash = security.pwd_context.handler("bcrypt").using(rounds=4).hash("correct horse")
+
+    verified, new_hash = asyncio.run(security.verify_password_async("correct horse", weak_hash))
+    assert verified
+    assert new_hash is not None and not security.pwd_context.needs_update(new_hash)
+    assert security.verify_password("correct horse", new_hash)
+
+    assert asyncio.run(security.verify_password_async("wrong", weak_hash)) == (False, None)
+
+
+def test_hashing_pool_rejects_work_beyond_max_pending():
+    """
+    Work runs off the event loop; once max_pending operations are in flight,
+    further calls fail fast instead of queueing.
+    """
+    pool = security.PasswordHashingPool(max_workers=1, max_pending=2)
+    release = threading.Event()
+
+    async def run():
+        first = asyncio.create_task(pool.run(release.wait))
+        second = asyncio.create_task(pool.run(release.wait))
+        await asyncio.sleep(0.05) # The event loop stays free while the workers block
+        assert pool.pending == 2
+        with pytest.raises(security.PasswordHashingOverloadedError):
+            await pool.run(release.wait)
+        release.set()
+        await asyncio.gather(first, second)
+        await asyncio.sleep(0)
+        return pool.pending
+
+    assert asyncio.run(run()) == 0
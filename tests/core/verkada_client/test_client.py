@@ -0,0 +1,231 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from backend.app.core.verkada_client.authenticator import VerkadaAuthenticator
+from backend.app.core.verkada_client.client import VerkadaApiClient
+
+
+def _make_client(handler) -> VerkadaApiClient:
+    """
+    Builds a VerkadaApiClient whose requests are answered by `handler`.
+    """
+    return VerkadaApiClient(
+        authenticator=VerkadaAuthenticator(api_key="test-api-key"),
+        base_url="https://api.verkada.test/",
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def test_token_fetch_and_events_share_the_client():
+    """
+    The token request and the events request both go through the async client,
+    and the token is cached between calls.
+    """
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.url.path)
+        if request.url.path == "/token":
+            assert request.headers["x-api-key"] == "test-api-key"
+            return httpx.Response(200, json={"token": "tok-123"})
+        assert request.headers["x-verkada-auth"] == "tok-123"
+        return httpx.Response(200, json={"events": [], "nextPageToken": None})
+
+    async def run():
+        client = _make_client(handler)
+        await client.get_access_events({"page_size": 10})
+        await client.get_access_events({"page_size": 10})
+        await client.aclose()
+
+    asyncio.run(run())
+    assert seen == ["/token", "/events/v1/access", "/events/v1/access"]
+
+
+def test_iter_access_event_pages_follows_page_tokens():
+    """
+    Pagination follows nextPageToken and honours max_pages.
+    """
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/token":
+            return httpx.Response(200, json={"token": "tok"})
+        page = int(request.url.params.get("page_token", "0"))
+        return httpx.Response(200, json={
+            "events": [{"eventId": f"e{page}"}],
+            "nextPageToken": str(page + 1),
+        })
+
+    async def run(max_pages):
+        client = _make_client(handler)
+        end = datetime.now(timezone.utc)
+        pages = [
+            page async for page in client.iter_access_event_pages(
+                end - timedelta(days=1), end, max_pages=max_pages
+            )
+        ]
+        await client.aclose()
+        return pages
+
+    pages = asyncio.run(run(3))
+    assert [page[0]["eventId"] for page in pages] == ["e0", "e1", "e2"]
+
+
+def test_sharded_pages_split_dense_windows_under_concurrency_limit():
+    """
+    Dense windows are bisected, every event is yielded exactly once and
+    in-flight requests never exceed the limit.
+    """
+    end = datetime(2025, 1, 2, tzinfo=timezone.utc)
+    start = end - timedelta(days=1)
+    range_start = int(start.timestamp())
+    # Quiet first half of the day, a dense burst in the last hour.
+    timestamps = [range_start + i * 3600 for i in range(12)] + \
+                 [range_start + 23 * 3600 + i for i in range(0, 3600, 10)]
+    in_flight = {"now": 0, "max": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/token":
+            return httpx.Response(200, json={"token": "tok"})
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        await asyncio.sleep(0)
+        in_flight["now"] -= 1
+        window_start, window_end = int(request.url.params["start_time"]), int(request.url.params["end_time"])
+        page_size = int(request.url.params["page_size"])
+        offset = int(request.url.params.get("page_token", "0"))
+        matching = [ts for ts in timestamps if window_start <= ts < window_end]
+        page = matching[offset:offset + page_size]
+        next_token = str(offset + page_size) if offset + page_size < len(matching) else None
+        return httpx.Response(200, json={
+            "events": [{"eventId": f"e{ts}", "timestamp": ts} for ts in page],
+            "nextPageToken": next_token,
+        })
+
+    async def run():
+        client = _make_client(handler)
+        pages = [
+            page async for page in client.iter_access_event_pages_sharded(
+                start, end, concurrency=3, min_window_seconds=600, page_size=50
+            )
+        ]
+        await client.aclose()
+        return [event for page in pages for event in page]
+
+    events = asyncio.run(run())
+    assert sorted(event["eventId"] for event in events) == sorted(f"e{ts}" for ts in timestamps)
+    assert in_flight["max"] <= 3
+
+
+def test_concurrent_requests_share_one_token_fetch():
+    """
+    Concurrent callers with an empty token cache trigger a single token request.
+    """
+    token_requests = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/token":
+            token_requests.append(request)
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, json={"token": "tok"})
+        return httpx.Response(200, json={"events": []})
+
+    async def run():
+        client = _make_client(handler)
+        await asyncio.gather(*(client.get_access_events({}) for _ in range(10)))
+        await client.aclose()
+
+    asyncio.run(run())
+    assert len(token_requests) == 1
+
+
+def test_failed_background_refresh_is_not_retried_by_every_request():
+    """
+    A token close to expiry is refreshed in the background; after that refresh
+    fails, further requests keep the cached token without starting new refreshes.
+    """
+    token_requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/token":
+            token_requests.append(request)
+            if len(token_requests) > 1:
+                return httpx.Response(503, json={"message": "unavailable"})
+            return httpx.Response(200, json={"token": "tok"})
+        assert request.headers["x-verkada-auth"] == "tok"
+        return httpx.Response(200, json={"events": []})
+
+    async def run():
+        client = _make_client(handler)
+        await client.get_access_events({})
+        # Move the cached token into the refresh-ahead window.
+        client.authenticator._token_expiry_time = datetime.now(timezone.utc) + timedelta(minutes=1)
+        for _ in range(5):
+            await client.get_access_events({})
+            await asyncio.sleep(0)
+        await client.aclose()
+
+    asyncio.run(run())
+    assert len(token_requests) == 2
+
+
+def test_request_retries_once_with_fresh_token_on_401():
+    """
+    A 401 from the events API invalidates the cached token and retries once.
+    """
+    tokens = iter(["stale", "fresh"])
+    used_tokens = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/token":
+            return httpx.Response(200, json={"token": next(tokens)})
+        used_tokens.append(request.headers["x-verkada-auth"])
+        if request.headers["x-verkada-auth"] == "stale":
+            return httpx.Response(401, json={"message": "unauthorized"})
+        return httpx.Response(200, json={"events": []})
+
+    async def run():
+        client = _make_client(handler)
+        data = await client.get_access_events({})
+        await client.aclose()
+        return data
+
+    assert asyncio.run(run()) == {"events": []}
+    assert used_tokens == ["stale", "fresh"]
+
+
+def test_sharded_fetch_failure_cancels_sibling_windows():
+    """
+    When one window fails, the error is raised unwrapped and no window task is left running.
+    """
+    end = datetime(2025, 1, 2, tzinfo=timezone.utc)
+    start = end - timedelta(days=1)
+    failing_start = int(start.timestamp())
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/token":
+            return httpx.Response(200, json={"token": "tok"})
+        if int(request.url.params["start_time"]) == failing_start:
+            return httpx.Response(500, json={"message": "boom"})
+        await asyncio.sleep(0)
+        # Every other window is dense and keeps paging.
+        offset = int(request.url.params.get("page_token", "0"))
+        return httpx.Response(200, json={
+            "events": [{"eventId": f"e{offset}-{i}"} for i in range(10)],
+            "nextPageToken": str(offset + 1),
+        })
+
+    async def run():
+        client = _make_client(handler)
+        try:
+            async for _ in client.iter_access_event_pages_sharded(start, end, concurrency=4, min_window_seconds=3600):
+                pass
+            assert False, "expected HTTPStatusError"
+        except httpx.HTTPStatusError as err:
+            assert err.response.status_code == 500
+        await asyncio.sleep(0.05)
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        await client.aclose()
+        return pending
+
+    assert asyncio.run(run()) == []
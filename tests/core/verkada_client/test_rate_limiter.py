@@ -0,0 +1,112 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from backend.app.core.verkada_client.authenticator import VerkadaAuthenticator
+from backend.app.core.verkada_client.client import VerkadaApiClient
+from backend.app.core.verkada_client.rate_limiter import (
+    RateLimitScheduler,
+    RequestPriority,
+    parse_retry_after,
+)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0 # In the past
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+def test_waiting_requests_are_served_by_priority():
+    """
+    Once the burst is used up, queued interactive requests overtake
+    background and backfill requests that arrived earlier.
+    """
+    order = []
+
+    async def run():
+        scheduler = RateLimitScheduler(rate=50.0, burst=1)
+        await scheduler.acquire() # Drain the bucket
+
+        async def request(name, priority):
+            await scheduler.acquire(priority)
+            order.append(name)
+
+        tasks = [asyncio.create_task(request("backfill", RequestPriority.BACKFILL))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(request("background", RequestPriority.BACKGROUND)))
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(request("interactive", RequestPriority.INTERACTIVE)))
+        await asyncio.gather(*tasks)
+        return scheduler.stats()
+
+    stats = asyncio.run(run())
+    assert order == ["interactive", "background", "backfill"]
+    assert stats["granted_by_priority"] == {"interactive": 2, "background": 1, "backfill": 1}
+    assert stats["queued"] == 0
+
+
+def test_cancelled_waiter_does_not_block_the_queue():
+    async def run():
+        scheduler = RateLimitScheduler(rate=50.0, burst=1)
+        await scheduler.acquire()
+        cancelled = asyncio.create_task(scheduler.acquire(RequestPriority.INTERACTIVE))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.wait_for(scheduler.acquire(RequestPriority.BACKFILL), timeout=1)
+        return scheduler.stats()["queued"]
+
+    assert asyncio.run(run()) == 0
+
+
+def test_rate_limited_response_pauses_and_halves_the_rate():
+    scheduler = RateLimitScheduler(rate=10.0, burst=5, increase_step=1.0)
+    assert scheduler.on_rate_limited(retry_after=0.5) == 0.5
+    assert scheduler.rate == 5.0
+    assert scheduler.stats()["paused_for_seconds"] > 0.4
+    scheduler.on_success()
+    assert scheduler.rate == 6.0
+
+
+def test_client_retries_429_after_retry_after():
+    """
+    A 429 is retried after its Retry-After delay instead of failing the request,
+    and keeps failing with the 429 once the retries are used up.
+    """
+    responses = iter([429, 429, 200])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/token":
+            return httpx.Response(200, json={"token": "tok"})
+        code = next(responses)
+        if code == 429:
+            return httpx.Response(429, headers={"Retry-After": "0.05"})
+        return httpx.Response(200, json={"events": [{"eventId": "e1"}]})
+
+    async def run(max_retries):
+        scheduler = RateLimitScheduler(rate=100.0, burst=10)
+        client = VerkadaApiClient(
+            authenticator=VerkadaAuthenticator(api_key="test-api-key"),
+            transport=httpx.MockTransport(handler),
+            rate_limiter=scheduler,
+            max_rate_limit_retries=max_retries,
+        )
+        try:
+            return await client.get_access_events({}), scheduler
+        finally:
+            await client.aclose()
+
+    started = time.monotonic()
+    data, scheduler = asyncio.run(run(3))
+    assert data["events"] == [{"eventId": "e1"}]
+    assert time.monotonic() - started >= 0.1
+    assert scheduler.stats()["rate_limited_responses"] == 2
+
+    responses = iter([429, 200])
+    with pytest.raises(httpx.HTTPStatusError) as exc_info:
+        asyncio.run(run(0))
+    assert exc_info.value.response.status_code == 429
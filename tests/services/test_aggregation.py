@@ -0,0 +1,129 @@
+import random
+from collections import Counter
+from datetime import datetime, timezone
+
+from backend.app.services.aggregation import BloomFilter, HourOfDayAggregator, HyperLogLog, SpaceSavingSketch
+
+
+def test_hour_of_day_aggregator_counts_pages_of_mixed_timestamps():
+    """
+    Pages are accumulated into a 24-bucket UTC histogram; ISO strings, epoch
+    seconds and events without timestamps are handled.
+    """
+    aggregator = HourOfDayAggregator()
+    aggregator.add_raw_events([
+        {"eventId": "e1", "eventType": "door_opened", "timestamp": "2025-03-03T09:15:00Z"},
+        {"eventId": "e2", "eventType": "door_opened", "timestamp": "2025-03-03T11:15:00+02:00"},  # 09:15 UTC
+        {"eventId": "e3", "eventType": "door_opened",
+         "timestamp": int(datetime(2025, 3, 4, 23, 59, tzinfo=timezone.utc).timestamp())},
+    ])
+    aggregator.add_raw_events([
+        {"eventId": "e4", "eventType": "door_opened", "timestamp": "2025-03-05T00:00:00"},
+        {"eventId": "no-timestamp", "eventType": "door_opened"},
+    ])
+    aggregator.add_raw_events([])
+
+    points = aggregator.to_data_points()
+    assert len(points) == 24
+    assert {p.hour: p.event_count for p in points if p.event_count} == {0: 1, 9: 2, 23: 1}
+    assert aggregator.total == 4
+
+
+def test_hour_of_day_aggregator_deduplicates_event_ids_across_pages():
+    """
+    With deduplicate=True an event re-delivered in the same or a later page is counted once.
+    """
+    page = [
+        {"eventId": "e1", "eventType": "door_opened", "timestamp": "2025-03-03T09:15:00Z"},
+        {"eventId": "e1", "eventType": "door_opened", "timestamp": "2025-03-03T09:15:00Z"},
+        {"eventId": "e2", "eventType": "door_opened", "timestamp": "2025-03-03T10:15:00Z"},
+    ]
+    aggregator = HourOfDayAggregator(deduplicate=True)
+    aggregator.add_raw_events(page)
+    aggregator.add_raw_events(page[1:])
+    aggregator.add_raw_events([])
+
+    assert aggregator.total == 2
+    assert HourOfDayAggregator().total == 0
+
+
+def _skewed_stream(seed: int, length: int) -> list:
+    """Zipf-like stream over 500 items: a few heavy hitters and a long tail."""
+    rng = random.Random(seed)
+    items = [f"door-{i}" for i in range(500)]
+    return rng.choices(items, weights=[1 / (rank + 1) for rank in range(len(items))], k=length)
+
+
+def _assert_bounds(sketch: SpaceSavingSketch, exact: Counter) -> None:
+    for item, count, error in sketch.top(sketch.capacity):
+        assert count - error <= exact[item] <= count
+    listed = {item for item, _, _ in sketch.top(sketch.capacity)}
+    assert all(count <= sketch.floor for item, count in exact.items() if item not in listed)
+
+
+def test_space_saving_bounds_hold_and_heavy_hitters_are_found():
+    stream = _skewed_stream(seed=1, length=20000)
+    exact = Counter(stream)
+    sketch = SpaceSavingSketch(capacity=50)
+    for item in stream:
+        sketch.add(item)
+
+    _assert_bounds(sketch, exact)
+    assert sketch.total == len(stream) and sketch.floor <= len(stream) / 50
+    assert [item for item, _, _ in sketch.top(5)] == [item for item, _ in exact.most_common(5)]
+
+
+def test_space_saving_merge_keeps_bounds_and_round_trips():
+    """
+    Merging per-partition sketches bounds the counts of the combined stream,
+    and serialized sketches restore to the same state.
+    """
+    streams = [_skewed_stream(seed=day, length=3000) for day in range(10)]
+    sketches = []
+    for stream in streams:
+        sketch = SpaceSavingSketch(capacity=50)
+        sketch.add_counts(Counter(stream))
+        sketches.append(SpaceSavingSketch.from_dict(sketch.to_dict()))
+
+    merged = SpaceSavingSketch.merge_all(sketches, capacity=50)
+    exact = Counter(item for stream in streams for item in stream)
+
+    _assert_bounds(merged, exact)
+    assert merged.total == sum(map(len, streams))
+    assert [item for item, _, _ in merged.top(3)] == [item for item, _ in exact.most_common(3)]
+    assert SpaceSavingSketch.from_dict(merged.to_dict()).top(50) == merged.top(50)
+
+
+def test_hyperloglog_estimates_merges_and_round_trips():
+    """
+    Estimates stay within a few standard errors, merging counts the union,
+    and small sketches serialize sparsely.
+    """
+    first, second = HyperLogLog(), HyperLogLog()
+    for i in range(20000):
+        first.add(f"user-{i}")
+    for i in range(15000, 30000):
+        second.add(f"user-{i}")
+        second.add(f"user-{i}") # Duplicates do not count
+
+    assert abs(first.count() - 20000) <= 20000 * 4 * first.relative_error
+    first.merge(second)
+    assert abs(first.count() - 30000) <= 30000 * 4 * first.relative_error
+    assert HyperLogLog.from_bytes(first.to_bytes()).count() == first.count()
+
+    small = HyperLogLog()
+    for user in ("ada", "grace", "ada"):
+        small.add(user)
+    assert small.count() == 2
+    assert len(small.to_bytes()) < 16 and HyperLogLog.from_bytes(small.to_bytes()).count() == 2
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_false_positives():
+    bloom = BloomFilter(capacity=10000, error_rate=0.01)
+    added = [f"event-{i}" for i in range(10000)]
+    bloom.add_many(added)
+
+    assert bloom.contains_many(added).all()
+    false_positive_rate = bloom.contains_many([f"other-{i}" for i in range(10000)]).mean()
+    assert false_positive_rate < 0.02
+    assert bloom.contains_many([]).shape == (0,)
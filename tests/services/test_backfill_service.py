@@ -0,0 +1,80 @@
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.app.core.verkada_client.authenticator import VerkadaAuthenticator
+from backend.app.core.verkada_client.client import VerkadaApiClient
+from backend.app.db import models as db_models
+from backend.app.services import backfill_service
+from backend.app.services.backfill_service import Backfill
+
+DAY = 86400
+START = int(datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp())
+
+
+def _event(event_id: str, timestamp: int) -> dict:
+    return {
+        "eventId": event_id,
+        "eventType": "door_opened",
+        "timestamp": datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(),
+        "userId": "u1",
+        "doorName": "Front Door",
+    }
+
+
+def test_plan_windows_aligns_to_window_size():
+    assert backfill_service.plan_windows(START + 3600, START + 2 * DAY + 60, DAY) == [
+        (START + 3600, START + DAY),
+        (START + DAY, START + 2 * DAY),
+        (START + 2 * DAY, START + 2 * DAY + 60),
+    ]
+    with pytest.raises(ValueError):
+        Backfill(None, None, START, START, window_seconds=DAY, concurrency=1)
+
+
+def test_backfill_resumes_from_checkpointed_windows(async_store_sessionmaker: async_sessionmaker):
+    """
+    A failed backfill stops with the windows completed so far checkpointed;
+    re-running it fetches only the remaining windows and stores every event once.
+    """
+    events = [_event(f"e{day}", START + day * DAY + 600) for day in range(4)]
+    requested_starts: list = []
+    failing = {START + 2 * DAY}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/token":
+            return httpx.Response(200, json={"token": "tok"})
+        start, end = int(request.url.params["start_time"]), int(request.url.params["end_time"])
+        requested_starts.append(start)
+        if start in failing:
+            return httpx.Response(400, json={"message": "boom"})
+        page = [e for e in events if start <= datetime.fromisoformat(e["timestamp"]).timestamp() < end]
+        return httpx.Response(200, json={"events": page, "nextPageToken": None})
+
+    client = VerkadaApiClient(authenticator=VerkadaAuthenticator(api_key="key"), transport=httpx.MockTransport(handler))
+
+    async def run():
+        first = Backfill(client, async_store_sessionmaker, START, START + 4 * DAY, window_seconds=DAY, concurrency=1)
+        with pytest.raises(BaseExceptionGroup):
+            await first.run()
+        assert first.status == "failed" and first.error
+
+        failing.clear()
+        requested_starts.clear()
+        second = Backfill(client, async_store_sessionmaker, START, START + 4 * DAY, window_seconds=DAY, concurrency=2)
+        await second.run()
+        assert second.status == "completed"
+        assert sorted(requested_starts) == [START + 2 * DAY, START + 3 * DAY]
+        assert second.windows_skipped == 2 and second.windows_completed == 4
+        assert second.events_fetched == 2 and second.events_per_second > 0
+
+        async with async_store_sessionmaker() as db:
+            assert await db.scalar(select(func.count(db_models.AccessEvent.id))) == 4
+            assert await db.scalar(select(func.count()).select_from(db_models.BackfillWindow)) == 4
+        await client.aclose()
+
+    asyncio.run(run())
@@ -0,0 +1,145 @@
+import asyncio
+import os
+import threading
+from datetime import date, datetime, timezone
+
+from backend.app.services.event_archive_service import EventArchive
+
+
+def _ts(*args) -> int:
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp())
+
+
+def _row(event_id, timestamp, door_name="Front Door"):
+    return {
+        "event_id": event_id,
+        "timestamp": timestamp,
+        "event_type": "door_opened",
+        "user_id": "u1",
+        "user_name": "Ada",
+        "door_name": door_name,
+    }
+
+
+def test_flush_partitions_by_day_and_compacts_past_days(tmp_path):
+    """
+    Rows land in one partition per UTC day; flushing a past day twice compacts
+    it into a single file without duplicate event ids.
+    """
+    archive = EventArchive(str(tmp_path), flush_rows=1000)
+    archive.append([_row("e1", _ts(2024, 5, 1, 9)), _row("e2", _ts(2024, 5, 2, 10))])
+    assert archive.flush() == 2
+    archive.append([_row("e1", _ts(2024, 5, 1, 9)), _row("e3", _ts(2024, 5, 1, 23, 59))])
+    archive.flush()
+
+    assert sorted(os.listdir(tmp_path)) == ["date=2024-05-01", "date=2024-05-02"]
+    day_files = archive.partitions_for_range(_ts(2024, 5, 1), _ts(2024, 5, 2))
+    assert len(day_files) == 1
+    table = archive.read(_ts(2024, 5, 1), _ts(2024, 5, 2), ["event_id"])
+    assert sorted(table.column("event_id").to_pylist()) == ["e1", "e3"]
+
+
+def test_append_flushes_when_buffer_is_full(tmp_path):
+    archive = EventArchive(str(tmp_path), flush_rows=2)
+    archive.append([_row("e1", _ts(2024, 5, 1, 9))])
+    archive.wait_for_flushes()
+    assert not os.listdir(tmp_path)
+    archive.append([_row("e2", _ts(2024, 5, 1, 10))])
+    archive.wait_for_flushes()
+    assert os.listdir(tmp_path) == ["date=2024-05-01"]
+
+
+def test_flush_timer_writes_a_quiet_buffer(tmp_path):
+    """
+    Rows older than flush_seconds are written by the flush timer even when no
+    further append() call arrives.
+    """
+    archive = EventArchive(str(tmp_path), flush_rows=1000, flush_seconds=0.05)
+    archive.append([_row("e1", _ts(2024, 5, 1, 9))])
+    assert not archive.flush_if_due()
+
+    async def run_timer_briefly():
+        timer = asyncio.create_task(archive.run_flush_timer(interval_seconds=0.02))
+        await asyncio.sleep(0.2)
+        timer.cancel()
+
+    asyncio.run(run_timer_briefly())
+    archive.wait_for_flushes()
+    assert os.listdir(tmp_path) == ["date=2024-05-01"]
+
+
+def test_compaction_swaps_files_without_reads_seeing_both(tmp_path, monkeypatch):
+    """
+    A read running while a day is compacted sees either the part files or the
+    compacted file, never both.
+    """
+    archive = EventArchive(str(tmp_path))
+    archive.write_partition(date(2024, 5, 1), [_row("e1", _ts(2024, 5, 1, 9))])
+    archive.write_partition(date(2024, 5, 1), [_row("e2", _ts(2024, 5, 1, 10))])
+    original_remove = os.remove
+    counts_during_swap = []
+    readers = []
+
+    def remove_while_reading(path):
+        reader = threading.Thread(
+            target=lambda: counts_during_swap.append(archive.read(_ts(2024, 5, 1), _ts(2024, 5, 2)).num_rows)
+        )
+        readers.append(reader)
+        reader.start()
+        reader.join(timeout=0.1) # Blocked until the swap is done
+        original_remove(path)
+
+    monkeypatch.setattr(os, "remove", remove_while_reading)
+    archive.compact_partition(date(2024, 5, 1))
+    for reader in readers:
+        reader.join()
+
+    assert counts_during_swap == [2, 2]
+    assert len(archive.partitions_for_range(_ts(2024, 5, 1), _ts(2024, 5, 2))) == 1
+
+
+def test_append_flushes_off_the_calling_thread_and_close_writes_the_rest(tmp_path, monkeypatch):
+    """
+    Flushes triggered by append() run on the archive's worker thread; close()
+    waits for them and writes rows that are still buffered.
+    """
+    archive = EventArchive(str(tmp_path), flush_rows=2)
+    flush_threads = []
+    original_flush = archive.flush
+
+    def recording_flush():
+        flush_threads.append(threading.current_thread().name)
+        return original_flush()
+
+    monkeypatch.setattr(archive, "flush", recording_flush)
+    archive.append([_row("e1", _ts(2024, 5, 1, 9)), _row("e2", _ts(2024, 5, 1, 10))])
+    archive.append([_row("e3", _ts(2024, 5, 2, 9))])
+    assert archive.close() == 1
+
+    assert flush_threads[0].startswith("event-archive") and flush_threads[-1] == threading.current_thread().name
+    assert archive.read(_ts(2024, 5, 1), _ts(2024, 5, 3), ["event_id"]).num_rows == 3
+
+
+def test_read_prunes_partitions_and_filters_range(tmp_path):
+    archive = EventArchive(str(tmp_path))
+    archive.write_partition(date(2024, 5, 1), [_row("e1", _ts(2024, 5, 1, 9))])
+    archive.write_partition(date(2024, 5, 3), [_row("e2", _ts(2024, 5, 3, 9)), _row("e3", _ts(2024, 5, 3, 18))])
+
+    assert archive.partitions_for_range(_ts(2024, 5, 2), _ts(2024, 5, 3)) == []
+    table = archive.read(_ts(2024, 5, 2), _ts(2024, 5, 3, 12), ["event_id", "door_name"])
+    assert table.column_names == ["event_id", "door_name"]
+    assert table.column("event_id").to_pylist() == ["e2"]
+    assert archive.read(_ts(2025, 1, 1), _ts(2025, 2, 1)).num_rows == 0
+
+
+def test_year_over_year_and_door_reports(tmp_path):
+    archive = EventArchive(str(tmp_path))
+    archive.write_partition(date(2023, 6, 1), [_row("a", _ts(2023, 6, 1, 9)), _row("b", _ts(2023, 6, 1, 9, 30), "Back Door")])
+    archive.write_partition(date(2024, 6, 1), [_row("c", _ts(2024, 6, 1, 17)), _row("d", _ts(2024, 6, 1, 18), None)])
+
+    by_year = archive.hour_of_day_counts_by_year(_ts(2023, 1, 1), _ts(2025, 1, 1))
+    assert sorted(by_year) == [2023, 2024]
+    assert by_year[2023][9] == 2 and sum(by_year[2023]) == 2
+    assert by_year[2024][17] == 1 and by_year[2024][18] == 1
+
+    assert archive.door_counts(_ts(2023, 1, 1), _ts(2025, 1, 1)) == {"Front Door": 2, "Back Door": 1, None: 1}
@@ -0,0 +1,87 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
+
+from backend.app.models.verkada_event import VerkadaEvent, VerkadaEventQueryParams
+from backend.app.services import event_export_service, event_store_service
+
+START = int(datetime(2025, 3, 3, tzinfo=timezone.utc).timestamp())
+
+
+def _store(db: Session, count: int) -> None:
+    event_store_service.store_events(db, [
+        VerkadaEvent(
+            event_id=f"e{i:05d}",
+            event_type="door_opened",
+            # Several events share each second to exercise the (timestamp, event_id) keyset.
+            timestamp=datetime.fromtimestamp(START + i // 3, tz=timezone.utc),
+            user_name="Ada, \"the\" Admin",
+        )
+        for i in range(count)
+    ])
+
+
+def _collect(chunks) -> list:
+    async def run():
+        return [chunk async for chunk in chunks]
+    return asyncio.run(run())
+
+
+def test_stored_export_streams_every_event_once_in_batches(async_store_sessionmaker: async_sessionmaker, monkeypatch):
+    """
+    The store is walked in fixed-size keyset batches covering each event exactly once, in order.
+    """
+    async def fill():
+        async with async_store_sessionmaker() as db:
+            await db.run_sync(_store, 2500)
+    asyncio.run(fill())
+    monkeypatch.setattr(event_export_service, "AsyncSessionLocal", async_store_sessionmaker)
+    params = VerkadaEventQueryParams(start_time=START, end_time=START + 86400)
+
+    batches = _collect(event_export_service.iter_stored_export_rows(params, batch_size=1000))
+
+    assert [len(batch) for batch in batches] == [1000, 1000, 500]
+    event_ids = [row["event_id"] for batch in batches for row in batch]
+    assert event_ids == sorted(event_ids) and len(set(event_ids)) == 2500
+
+
+def test_stream_export_formats_csv_and_ndjson():
+    """
+    CSV starts with a header chunk and quotes values; NDJSON emits one object per line.
+    """
+    rows = [{"event_id": "e1", "event_type": "door_opened", "timestamp": "2025-03-03T00:00:00+00:00",
+             "user_name": "Ada, \"the\" Admin"}]
+
+    async def batches():
+        yield rows
+
+    csv_chunks = _collect(event_export_service.stream_export(batches(), "csv"))
+    parsed = list(csv.DictReader(io.StringIO("".join(csv_chunks))))
+    assert csv_chunks[0].startswith("event_id,event_type,timestamp")
+    assert parsed[0]["user_name"] == "Ada, \"the\" Admin"
+
+    ndjson_chunks = _collect(event_export_service.stream_export(batches(), "ndjson"))
+    assert [json.loads(line) for line in "".join(ndjson_chunks).splitlines()] == rows
+
+
+def test_stream_export_ends_with_error_record_when_source_fails():
+    """
+    A failure after streaming started is reported in-band, so a truncated export is detectable.
+    """
+    rows = [{"event_id": "e1", "event_type": "door_opened", "timestamp": "2025-03-03T00:00:00+00:00"}]
+
+    async def failing_batches():
+        yield rows
+        raise event_export_service.ExportFailedError("HTTP error from Verkada API:\nboom", 503)
+
+    ndjson_lines = "".join(_collect(event_export_service.stream_export(failing_batches(), "ndjson"))).splitlines()
+    assert json.loads(ndjson_lines[0]) == rows[0]
+    assert json.loads(ndjson_lines[-1]) == {"error": "HTTP error from Verkada API:\nboom", "status_code": 503, "complete": False}
+
+    csv_lines = "".join(_collect(event_export_service.stream_export(failing_batches(), "csv"))).splitlines()
+    assert csv_lines[-1] == "# export incomplete: 503 HTTP error from Verkada API: boom"
@@ -0,0 +1,319 @@
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from sqlalchemy.orm import Session
+
+from backend.app.db import models as db_models
+from backend.app.models.verkada_event import VerkadaEvent, VerkadaEventQueryParams
+from backend.app.services import event_store_service
+
+DAY_START = int(datetime(2025, 3, 3, tzinfo=timezone.utc).timestamp())
+
+
+def _event(event_id: str, timestamp: int, door_name: str = "Front Door", user_id: str = "u1") -> VerkadaEvent:
+    return VerkadaEvent(
+        event_id=event_id,
+        event_type="door_opened",
+        timestamp=datetime.fromtimestamp(timestamp, tz=timezone.utc),
+        door_name=door_name,
+        user_id=user_id,
+    )
+
+
+def _rollup_counts(db: Session) -> dict:
+    return {
+        (row.bucket_start, row.door_name, row.event_type): row.event_count
+        for row in db.query(db_models.AccessEventHourlyRollup).all()
+    }
+
+
+def _user_rollup_counts(db: Session) -> dict:
+    return {
+        (row.bucket_start, row.door_name, row.user_id, row.event_type): row.event_count
+        for row in db.query(db_models.AccessEventUserHourlyRollup).all()
+    }
+
+
+def test_rollups_count_each_event_once(store_db: Session):
+    """
+    Re-ingesting an event does not increment the hourly rollups again.
+    """
+    events = [
+        _event("e1", DAY_START + 9 * 3600 + 5),
+        _event("e2", DAY_START + 9 * 3600 + 50),
+        _event("e3", DAY_START + 17 * 3600, door_name=None),
+    ]
+    event_store_service.store_events(store_db, events[:2])
+    event_store_service.store_events(store_db, events)
+
+    assert _rollup_counts(store_db) == {
+        (DAY_START + 9 * 3600, "Front Door", "door_opened"): 2,
+        (DAY_START + 17 * 3600, "", "door_opened"): 1,
+    }
+    assert event_store_service.count_events_by_hour(store_db, DAY_START, DAY_START + 86400) == {9: 2, 17: 1}
+
+
+def test_rebuild_matches_incremental_rollups(store_db: Session):
+    """
+    Rebuilding the rollups from raw events gives the same counts as incremental maintenance.
+    """
+    event_store_service.store_events(store_db, [
+        _event(f"e{i}", DAY_START + i * 1234, door_name=f"Door {i % 3}", user_id=f"u{i % 4}") for i in range(100)
+    ])
+    incremental, incremental_by_user = _rollup_counts(store_db), _user_rollup_counts(store_db)
+
+    event_store_service.rebuild_hourly_rollups(store_db)
+
+    assert _rollup_counts(store_db) == incremental
+    assert _user_rollup_counts(store_db) == incremental_by_user
+
+
+def test_aggregate_event_counts_by_local_time_door_and_user(store_db: Session):
+    """
+    Time dimensions follow the requested time zone, and door and user
+    breakdowns combine with them and with filters.
+    """
+    monday = DAY_START # 2025-03-03 00:00 UTC, a Monday
+    event_store_service.store_events(store_db, [
+        _event("e1", monday + 9 * 3600, user_id="u1"),
+        _event("e2", monday + 9 * 3600 + 60, user_id="u2"),
+        _event("e3", monday + 9 * 3600 + 120, door_name="Lobby", user_id="u1"),
+        _event("e4", monday + 2 * 3600, door_name=None, user_id="u1"), # Sunday 21:00 in New York
+    ])
+    end = monday + 86400
+
+    assert event_store_service.aggregate_event_counts(store_db, monday, end, ["weekday", "hour"]) == [
+        ({"weekday": 0, "hour": 2}, 1),
+        ({"weekday": 0, "hour": 9}, 3),
+    ]
+    new_york = event_store_service.aggregate_event_counts(
+        store_db, monday, end, ["day", "hour"], tz=ZoneInfo("America/New_York")
+    )
+    assert new_york == [({"day": date(2025, 3, 2), "hour": 21}, 1), ({"day": date(2025, 3, 3), "hour": 4}, 3)]
+    assert event_store_service.aggregate_event_counts(store_db, monday, end, ["door", "user"]) == [
+        ({"door_name": "Front Door", "user_id": "u1"}, 1),
+        ({"door_name": "Front Door", "user_id": "u2"}, 1),
+        ({"door_name": "Lobby", "user_id": "u1"}, 1),
+        ({"door_name": None, "user_id": "u1"}, 1),
+    ]
+    assert event_store_service.aggregate_event_counts(store_db, monday, end, [], user_ids=["u1"]) == [({}, 3)]
+    assert event_store_service.aggregate_event_counts(store_db, end, end + 3600, []) == []
+
+    with pytest.raises(ValueError):
+        event_store_service.aggregate_event_counts(store_db, monday, end, ["door"], max_groups=1)
+    with pytest.raises(ValueError):
+        event_store_service.aggregate_event_counts(store_db, monday, end, ["minute"])
+
+
+def test_top_k_sketches_are_maintained_per_day_and_merged(store_db: Session):
+    """
+    Per-day sketches count each new event once, match a rebuild from raw
+    events, and merge across the days of a range.
+    """
+    events = [
+        _event(f"d{day}-{i}", DAY_START + day * 86400 + i, door_name="Lobby" if i % 3 else "Side Door", user_id=f"u{i % 2}")
+        for day in range(3) for i in range(30)
+    ]
+    event_store_service.store_events(store_db, events[:40])
+    event_store_service.store_events(store_db, events)
+
+    doors = event_store_service.merge_top_k_sketches(store_db, "door", DAY_START, DAY_START + 2 * 86400)
+    assert doors.top(2) == [("Lobby", 40, 0), ("Side Door", 20, 0)] and doors.total == 60
+    incremental = event_store_service.merge_top_k_sketches(store_db, "user", DAY_START, DAY_START + 3 * 86400).top(5)
+    assert incremental == [("u0", 45, 0), ("u1", 45, 0)]
+
+    event_store_service.rebuild_top_k_sketches(store_db)
+    assert event_store_service.merge_top_k_sketches(store_db, "user", DAY_START, DAY_START + 3 * 86400).top(5) == incremental
+    with pytest.raises(ValueError):
+        event_store_service.merge_top_k_sketches(store_db, "event_type", DAY_START, DAY_START + 86400)
+
+
+def test_distinct_users_merge_across_hours_and_doors(store_db: Session, monkeypatch):
+    """
+    Hourly per-door sketches count each user once per group, whatever the
+    number of their events, and match a rebuild from raw events. Results do
+    not depend on how the sketch rows are chunked while reading.
+    """
+    event_store_service.store_events(store_db, [
+        _event(f"a{i}", DAY_START + 9 * 3600 + i, user_id=f"u{i % 5}") for i in range(50) # 5 users at 09:00
+    ] + [
+        _event(f"b{i}", DAY_START + 10 * 3600 + i, door_name="Lobby", user_id=f"u{i % 8}") for i in range(40) # 8 users at 10:00
+    ])
+
+    def distinct(group_by: list) -> list:
+        return event_store_service.count_distinct_users(store_db, DAY_START, DAY_START + 86400, group_by)
+
+    assert distinct(["hour"]) == [({"hour": 9}, 5), ({"hour": 10}, 8)]
+    assert distinct([]) == [({}, 8)] # u0-u4 badged at both doors
+    assert event_store_service.count_distinct_users(
+        store_db, DAY_START, DAY_START + 86400, [], door_names=["Front Door"]
+    ) == [({}, 5)]
+    assert distinct(["day"]) == [({"day": date(2025, 3, 3)}, 8)]
+    assert distinct(["door"]) == [({"door_name": "Front Door"}, 5), ({"door_name": "Lobby"}, 8)]
+    incremental = distinct(["day", "hour", "door"])
+
+    event_store_service.rebuild_user_sketches(store_db)
+    assert distinct(["day", "hour", "door"]) == incremental
+
+    monkeypatch.setattr(event_store_service, "_USER_SKETCH_SCAN_CHUNK", 1)
+    assert distinct([]) == [({}, 8)]
+    assert distinct(["day", "hour", "door"]) == incremental
+
+
+def test_query_events_filters_and_pages(store_db: Session):
+    """
+    Stored events are returned newest first, filtered by user and paged by cursor.
+    """
+    event_store_service.store_events(store_db, [
+        _event(f"e{i}", DAY_START - i * 60, user_id="u1" if i % 2 else "u2") for i in range(1, 6)
+    ])
+    params = VerkadaEventQueryParams(user_id="u1", page_size=2)
+
+    first_page, next_token, _ = event_store_service.query_events(store_db, params)
+    second_page, last_token, _ = event_store_service.query_events(
+        store_db, params.model_copy(update={"page_token": next_token})
+    )
+
+    assert [e.event_id for e in first_page] == ["e1", "e3"]
+    assert [e.event_id for e in second_page] == ["e5"]
+    assert last_token is None
+
+
+def _walk(db: Session, params: VerkadaEventQueryParams) -> list:
+    """Follows next cursors from the first page; returns the event ids of each page."""
+    pages = []
+    events, next_token, _ = event_store_service.query_events(db, params)
+    pages.append([e.event_id for e in events])
+    while next_token:
+        events, next_token, _ = event_store_service.query_events(db, params.model_copy(update={"page_token": next_token}))
+        pages.append([e.event_id for e in events])
+    return pages
+
+
+def _walk_token(db: Session, params: VerkadaEventQueryParams, pages: int) -> str:
+    """Returns the next cursor after following `pages` forward pages."""
+    token = None
+    for _ in range(pages):
+        _, token, _ = event_store_service.query_events(db, params.model_copy(update={"page_token": token}))
+    return token
+
+
+def test_keyset_pages_forward_and_backward(store_db: Session):
+    """
+    Cursors walk forward through all pages without gaps or duplicates (including
+    events sharing a timestamp), and prev cursors walk back to the first page.
+    """
+    event_store_service.store_events(store_db, [
+        _event(f"e{i}", DAY_START + (i // 2) * 60) for i in range(7) # Pairs share a timestamp
+    ])
+    params = VerkadaEventQueryParams(page_size=3)
+
+    forward_pages = _walk(store_db, params)
+    assert forward_pages == [["e6", "e5", "e4"], ["e3", "e2", "e1"], ["e0"]]
+
+    last_page, next_token, prev_token = event_store_service.query_events(
+        store_db, params.model_copy(update={"page_token": _walk_token(store_db, params, pages=2)})
+    )
+    assert [e.event_id for e in last_page] == ["e0"] and next_token is None
+    middle, _, _ = event_store_service.query_events(store_db, params.model_copy(update={"page_token": prev_token}))
+    assert [e.event_id for e in middle] == ["e3", "e2", "e1"]
+
+    ascending = _walk(store_db, params.model_copy(update={"order": "asc", "door_name": "Front Door"}))
+    assert ascending == [["e0", "e1", "e2"], ["e3", "e4", "e5"], ["e6"]]
+
+
+def test_keyset_cursor_validation(store_db: Session):
+    event_store_service.store_events(store_db, [_event("e1", DAY_START), _event("e2", DAY_START + 1)])
+    _, next_token, prev_token = event_store_service.query_events(store_db, VerkadaEventQueryParams(page_size=1))
+    assert prev_token is None
+
+    with pytest.raises(ValueError):
+        event_store_service.query_events(store_db, VerkadaEventQueryParams(page_token="not-a-cursor"))
+    with pytest.raises(ValueError):
+        event_store_service.query_events(store_db, VerkadaEventQueryParams(page_token=next_token, order="asc"))
+
+
+def test_event_id_index_suppresses_duplicates(store_db: Session):
+    """
+    With the event_id index enabled, unchanged re-deliveries are dropped before
+    any query, changed ones are still upserted, and ids stored behind the
+    index's back (e.g. by another process) are not counted as new twice.
+    """
+    event_store_service.store_events(store_db, [_event("old", DAY_START)])
+    index = event_store_service.enable_event_id_index(store_db, capacity=1000, error_rate=0.01, recent_size=2)
+    try:
+        assert index.bloom.contains_many(["old"]).all() and list(index.recent) == ["old"]
+
+        assert event_store_service.store_events(store_db, [_event("e1", DAY_START + 60), _event("old", DAY_START)]) == 1
+        assert event_store_service.store_events(store_db, [_event("e1", DAY_START + 60)]) == 0
+        assert event_store_service.store_events(store_db, [_event("e1", DAY_START + 60, door_name="Lobby")]) == 1
+        assert store_db.query(db_models.AccessEvent).filter_by(event_id="e1").one().door_name == "Lobby"
+
+        # Stored without going through store_events: unknown to the index.
+        store_db.add(db_models.AccessEvent(
+            event_id="e2", event_type="door_opened", timestamp=DAY_START + 120, door_name="Front Door", user_id="u1",
+        ))
+        store_db.commit()
+        event_store_service.store_events(store_db, [_event("e2", DAY_START + 120), _event("e3", DAY_START + 180)])
+
+        assert store_db.query(db_models.AccessEvent).count() == 4
+        assert _rollup_counts(store_db) == {
+            (DAY_START, "Front Door", "door_opened"): 2,
+            (DAY_START, "Lobby", "door_opened"): 1,
+        }
+        assert list(index.recent) == ["e2", "e3"]
+    finally:
+        event_store_service.disable_event_id_index()
+
+
+def test_historical_events_only_reach_historical_listeners(store_db: Session):
+    """
+    Backfilled events are passed to listeners such as the archive, not to the live feed.
+    """
+    live, archive = [], []
+    event_store_service.add_ingest_listener(live.extend)
+    event_store_service.add_ingest_listener(archive.extend, historical=True)
+    try:
+        event_store_service.store_events(store_db, [_event("old", DAY_START)], historical=True)
+        event_store_service.store_events(store_db, [_event("new", DAY_START + 60)])
+    finally:
+        event_store_service.remove_ingest_listener(live.extend)
+        event_store_service.remove_ingest_listener(archive.extend)
+
+    assert [row["event_id"] for row in live] == ["new"]
+    assert [row["event_id"] for row in archive] == ["old", "new"]
+
+
+def test_changed_event_moves_between_rollups_sketches_and_names(store_db: Session):
+    """
+    Re-ingesting a stored event with another time, door and user moves its
+    counts instead of leaving them under the old values.
+    """
+    event_store_service.store_events(store_db, [
+        _event("e1", DAY_START + 9 * 3600, user_id="u1"),
+        _event("e2", DAY_START + 9 * 3600 + 60, user_id="u2"),
+    ])
+    moved = _event("e1", DAY_START + 86400 + 17 * 3600, door_name="Lobby", user_id="u3")
+    moved.user_name = "Grace"
+    assert event_store_service.store_events(store_db, [moved]) == 1
+
+    assert _rollup_counts(store_db) == {
+        (DAY_START + 9 * 3600, "Front Door", "door_opened"): 1,
+        (DAY_START + 86400 + 17 * 3600, "Lobby", "door_opened"): 1,
+    }
+    assert _user_rollup_counts(store_db) == {
+        (DAY_START + 9 * 3600, "Front Door", "u2", "door_opened"): 1,
+        (DAY_START + 86400 + 17 * 3600, "Lobby", "u3", "door_opened"): 1,
+    }
+    first_day = event_store_service.merge_top_k_sketches(store_db, "user", DAY_START, DAY_START + 86400)
+    second_day = event_store_service.merge_top_k_sketches(store_db, "door", DAY_START + 86400, DAY_START + 2 * 86400)
+    assert [item for item, _, _ in first_day.top(10)] == ["u2"]
+    assert [item for item, _, _ in second_day.top(10)] == ["Lobby"]
+    distinct_users = event_store_service.count_distinct_users(
+        store_db, DAY_START, DAY_START + 2 * 86400, group_by=["door"]
+    )
+    assert {group["door_name"]: count for group, count in distinct_users} == {"Front Door": 1, "Lobby": 1}
+
+    names = {(row.kind, row.name, row.entity_id): row.event_count for row in store_db.query(db_models.AccessEventName)}
+    assert names == {("door", "Front Door", ""): 1, ("door", "Lobby", ""): 1, ("user", "Grace", "u3"): 1}
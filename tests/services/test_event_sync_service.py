@@ -0,0 +1,105 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.app.core.verkada_client.authenticator import VerkadaAuthenticator
+from backend.app.core.verkada_client.client import VerkadaApiClient
+from backend.app.db import models as db_models
+from backend.app.services import event_store_service, event_sync_service
+
+
+def _event(event_id: str, timestamp: int, user_id: str = "u1") -> dict:
+    return {
+        "eventId": event_id,
+        "eventType": "door_opened",
+        "timestamp": datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(),
+        "userId": user_id,
+        "userName": f"User {user_id}",
+        "doorName": "Front Door",
+    }
+
+
+def _client(events: list, requested_ranges: list) -> VerkadaApiClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/token":
+            return httpx.Response(200, json={"token": "tok"})
+        start, end = int(request.url.params["start_time"]), int(request.url.params["end_time"])
+        requested_ranges.append((start, end))
+        page = [e for e in events if start <= datetime.fromisoformat(e["timestamp"]).timestamp() < end]
+        return httpx.Response(200, json={"events": page, "nextPageToken": None})
+
+    return VerkadaApiClient(
+        authenticator=VerkadaAuthenticator(api_key="key"),
+        transport=httpx.MockTransport(handler),
+    )
+
+
+def test_sync_is_incremental_and_idempotent(async_store_sessionmaker: async_sessionmaker):
+    """
+    The second sync starts where the first pass ended (minus the overlap) and re-fetched events are upserted, not duplicated.
+    """
+    now = int(datetime.now(timezone.utc).timestamp())
+    events = [_event("e1", now - 3600), _event("e2", now - 1800)]
+    requested_ranges: list = []
+    client = _client(events, requested_ranges)
+
+    async def run():
+        async with async_store_sessionmaker() as db:
+            stored = await event_sync_service.sync_access_events(
+                db, client, initial_lookback=timedelta(days=1), overlap=timedelta(seconds=60)
+            )
+            assert stored == 2
+
+            events.append(_event("e3", now - 10))
+            await event_sync_service.sync_access_events(
+                db, client, initial_lookback=timedelta(days=1), overlap=timedelta(seconds=60)
+            )
+
+            assert requested_ranges[1][0] == requested_ranges[0][1] - 60 # Previous pass end minus overlap
+            assert await db.scalar(select(func.count()).select_from(db_models.AccessEvent)) == 3
+            assert await db.run_sync(event_store_service.get_latest_event_timestamp) == now - 10
+
+    asyncio.run(run())
+
+
+def test_failed_sync_does_not_advance_high_water_mark(async_store_sessionmaker: async_sessionmaker):
+    """
+    When a pass fails after storing a newest-first page, the next pass starts
+    from the previous checkpoint instead of skipping the older, unfetched events.
+    """
+    now = int(datetime.now(timezone.utc).timestamp())
+    newest_first = [_event("e3", now - 60), _event("e2", now - 1800), _event("e1", now - 3600)]
+    fail_second_page = {"enabled": True}
+    requested_starts: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/token":
+            return httpx.Response(200, json={"token": "tok"})
+        requested_starts.append(int(request.url.params["start_time"]))
+        if "page_token" not in request.url.params:
+            return httpx.Response(200, json={"events": newest_first[:1], "nextPageToken": "2"})
+        if fail_second_page["enabled"]:
+            return httpx.Response(500, json={"message": "upstream error"})
+        return httpx.Response(200, json={"events": newest_first[1:], "nextPageToken": None})
+
+    client = VerkadaApiClient(authenticator=VerkadaAuthenticator(api_key="key"), transport=httpx.MockTransport(handler))
+
+    async def run():
+        async with async_store_sessionmaker() as db:
+            try:
+                await event_sync_service.sync_access_events(db, client, initial_lookback=timedelta(days=1))
+                assert False, "expected HTTPStatusError"
+            except httpx.HTTPStatusError:
+                pass
+            assert await db.run_sync(event_store_service.get_sync_checkpoint, "access_events") is None
+
+            fail_second_page["enabled"] = False
+            await event_sync_service.sync_access_events(db, client, initial_lookback=timedelta(days=1))
+            assert await db.scalar(select(func.count()).select_from(db_models.AccessEvent)) == 3
+            assert await db.run_sync(event_store_service.get_sync_checkpoint, "access_events") >= now
+
+    asyncio.run(run())
+    assert abs(requested_starts[-2] - requested_starts[0]) <= 1 # Retried from the same point (now - lookback)
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+
+from backend.app.core.verkada_client.authenticator import VerkadaAuthenticator
+from backend.app.core.verkada_client.client import VerkadaApiClient
+from backend.app.services import live_feed_service
+from backend.app.services.live_feed_service import LiveEventBroker, LiveFeedFullError, parse_filters
+
+NOW = int(datetime(2025, 3, 3, 12, tzinfo=timezone.utc).timestamp())
+
+
+def _row(event_id: str, door_name: str = "Front Door", timestamp: int = NOW) -> dict:
+    return {"event_id": event_id, "event_type": "door_opened", "timestamp": timestamp, "user_id": "u1",
+            "user_name": "Ada", "door_name": door_name, "device_id": None, "site_id": None}
+
+
+def test_publish_fans_out_to_matching_subscribers():
+    async def run():
+        broker = LiveEventBroker(max_subscribers=10, queue_size=10)
+        everything = broker.subscribe()
+        lobby_only = broker.subscribe(parse_filters(door_name="Lobby, Side Door"))
+
+        broker.publish([_row("e1"), _row("e2", door_name="Lobby")])
+
+        assert [row["event_id"] for row in await everything.get(timeout=1)] == ["e1", "e2"]
+        assert [row["event_id"] for row in await lobby_only.get(timeout=1)] == ["e2"]
+
+    asyncio.run(run())
+
+
+def test_slow_subscriber_is_dropped_without_affecting_others():
+    """
+    A subscriber whose queue is full is disconnected and its backlog discarded;
+    the others keep receiving events.
+    """
+    async def run():
+        broker = LiveEventBroker(max_subscribers=10, queue_size=3)
+        slow, fast = broker.subscribe(), broker.subscribe()
+
+        broker.publish([_row("e1"), _row("e2")])
+        assert len(await fast.get(timeout=1)) == 2
+        broker.publish([_row("e3"), _row("e4")])
+
+        assert slow.dropped and broker.subscriber_count == 1
+        assert await slow.get(timeout=1) is None
+        assert [row["event_id"] for row in await fast.get(timeout=1)] == ["e3", "e4"]
+
+    asyncio.run(run())
+
+
+def test_stream_subscribes_when_started_and_unsubscribes_when_dropped():
+    async def run():
+        broker = LiveEventBroker(max_subscribers=10, queue_size=1)
+        stream = live_feed_service.stream_subscription(broker, parse_filters(door_name="Lobby"), 1)
+        assert broker.subscriber_count == 0
+
+        assert "connected" in await stream.__anext__()
+        assert broker.subscriber_count == 1
+        broker.publish([_row("e1", door_name="Lobby")])
+        broker.publish([_row("e2", door_name="Lobby")])
+
+        chunks = [chunk async for chunk in stream]
+        assert chunks[-1].startswith("event: dropped")
+        assert broker.subscriber_count == 0
+
+    asyncio.run(run())
+
+
+def test_subscriber_limit_and_unsubscribe():
+    async def run():
+        broker = LiveEventBroker(max_subscribers=1, queue_size=10)
+        subscription = broker.subscribe()
+        try:
+            broker.subscribe()
+            assert False, "expected LiveFeedFullError"
+        except LiveFeedFullError:
+            pass
+        broker.unsubscribe(subscription)
+        broker.subscribe()
+
+    asyncio.run(run())
+
+
+def test_poll_fetches_once_for_all_subscribers_and_skips_seen_events():
+    """
+    One upstream fetch serves every subscriber, and events re-read in the
+    overlap window are not published twice.
+    """
+    events = [
+        {"eventId": "e1", "eventType": "door_opened", "timestamp": datetime.fromtimestamp(NOW - 20, tz=timezone.utc).isoformat()},
+    ]
+    upstream_calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/token":
+            return httpx.Response(200, json={"token": "tok"})
+        upstream_calls.append(request)
+        return httpx.Response(200, json={"events": list(events), "nextPageToken": None})
+
+    client = VerkadaApiClient(authenticator=VerkadaAuthenticator(api_key="key"), transport=httpx.MockTransport(handler))
+
+    async def run():
+        broker = LiveEventBroker(max_subscribers=100, queue_size=10)
+        subscriptions = [broker.subscribe() for _ in range(50)]
+        seen: dict = {}
+        start = datetime.fromtimestamp(NOW - 60, tz=timezone.utc)
+
+        assert await live_feed_service.poll_new_events(client, broker, start, start + timedelta(seconds=60), seen) == 1
+        events.append({"eventId": "e2", "eventType": "door_opened",
+                       "timestamp": datetime.fromtimestamp(NOW - 5, tz=timezone.utc).isoformat()})
+        assert await live_feed_service.poll_new_events(client, broker, start, start + timedelta(seconds=60), seen) == 1
+
+        assert len(upstream_calls) == 2
+        for subscription in subscriptions:
+            assert [row["event_id"] for row in await subscription.get(timeout=1)] == ["e1", "e2"]
+        await client.aclose()
+
+    asyncio.run(run())
+
+
+def test_format_sse_uses_event_id_and_iso_timestamp():
+    message = live_feed_service.format_sse([_row("e1")])
+    assert message.startswith("id: e1\nevent: access_event\ndata: ")
+    assert '"timestamp": "2025-03-03T12:00:00+00:00"' in message and message.endswith("\n\n")
@@ -0,0 +1,67 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from backend.app.models.verkada_event import VerkadaEvent
+from backend.app.services import event_store_service, name_search_service
+
+DAY_START = int(datetime(2025, 3, 3, tzinfo=timezone.utc).timestamp())
+
+
+def _event(event_id: str, user_name: str, user_id: str, door_name: str = "Front Door", offset: int = 0) -> VerkadaEvent:
+    return VerkadaEvent(
+        event_id=event_id,
+        event_type="door_opened",
+        timestamp=datetime.fromtimestamp(DAY_START + offset, tz=timezone.utc),
+        user_name=user_name,
+        user_id=user_id,
+        door_name=door_name,
+        device_id=f"dev-{door_name}",
+    )
+
+
+def _names(matches: list) -> list:
+    return [match.name for match in matches]
+
+
+def test_names_are_indexed_on_ingest_and_searched_by_prefix_then_substring(store_db: Session):
+    """
+    Prefix matches rank before substring matches, busier names first; short
+    queries only match prefixes; re-ingested events are not counted twice.
+    """
+    events = [
+        _event("e1", "Annabel Lee", "u1"),
+        _event("e2", "Annabel Lee", "u1", offset=60),
+        _event("e3", "Joanna Smith", "u2", door_name="Annex Lobby"),
+        _event("e4", "Ann Jones", "u3"),
+        _event("e5", "Bob Stone", "u4"),
+    ]
+    event_store_service.store_events(store_db, events[:2])
+    event_store_service.store_events(store_db, events)
+
+    assert _names(name_search_service.search_names(store_db, "ann", kind="user")) == ["Annabel Lee", "Ann Jones", "Joanna Smith"]
+    assert _names(name_search_service.search_names(store_db, "ANN")) == ["Annabel Lee", "Ann Jones", "Annex Lobby", "Joanna Smith"]
+    assert _names(name_search_service.search_names(store_db, "an", kind="user")) == ["Annabel Lee", "Ann Jones"]
+    assert _names(name_search_service.search_names(store_db, "ton")) == ["Bob Stone"]
+    assert _names(name_search_service.search_names(store_db, "ann", kind="user", limit=1)) == ["Annabel Lee"]
+    assert name_search_service.search_names(store_db, '"; drop', kind="user") == []
+
+    annabel = name_search_service.search_names(store_db, "annabel")[0]
+    assert (annabel.entity_id, annabel.event_count, annabel.last_seen) == ("u1", 2, DAY_START + 60)
+
+
+def test_resolve_names_and_rebuild(store_db: Session):
+    event_store_service.store_events(store_db, [
+        _event("e1", "Ada Lovelace", "u1"),
+        _event("e2", "Ada Lovelace", "u1"),
+        _event("e3", "Ada Lovelace", "u9"), # Same name, another person
+        _event("e4", "Grace Hopper", "u2"),
+    ])
+    expected = {"ada lovelace": ["u1", "u9"], "Grace Hopper": ["u2"], "Nobody": []}
+
+    assert name_search_service.resolve_names(store_db, "user", ["ada lovelace", "Grace Hopper", "Nobody"]) == expected
+    assert name_search_service.resolve_names(store_db, "door", ["front door"]) == {"front door": ["dev-Front Door"]}
+
+    name_search_service.rebuild_name_index(store_db)
+    assert name_search_service.resolve_names(store_db, "user", ["ada lovelace", "Grace Hopper", "Nobody"]) == expected
+    assert _names(name_search_service.search_names(store_db, "hop")) == ["Grace Hopper"]
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.app.db import models as db_models
+from backend.app.models.user import UserCreate
+from backend.app.services import user_service
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    user_service.principal_cache.clear()
+    yield
+    user_service.principal_cache.clear()
+
+
+def _count_queries(session_factory: async_sessionmaker) -> list:
+    statements = []
+    engine = session_factory.kw["bind"].sync_engine
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_get_principal_is_served_from_cache(async_store_sessionmaker: async_sessionmaker):
+    """
+    After the first lookup, principals come from the cache without a query,
+    as detached copies without the password hash.
+    """
+    async def run():
+        async with async_store_sessionmaker() as db:
+            db.add(db_models.User(username="alice", hashed_password="hash"))
+            await db.commit()
+        statements = _count_queries(async_store_sessionmaker)
+
+        async with async_store_sessionmaker() as db:
+            first = await user_service.get_principal(db, "alice")
+            second = await user_service.get_principal(db, "alice")
+
+            assert len(statements) == 1
+            assert second is first
+            assert first.username == "alice" and first.hashed_password is None
+            assert await user_service.get_principal(db, "nobody") is None
+            assert await user_service.get_principal(db, "nobody") is None
+            assert len(statements) == 3 # Unknown users are not cached
+
+    asyncio.run(run())
+
+
+def test_principal_is_invalidated_when_user_changes(async_store_sessionmaker: async_sessionmaker):
+    async def run():
+        async with async_store_sessionmaker() as db:
+            user = await user_service.create_user(
+                db, UserCreate(username="bob", password="password123"), hashed_password="hash"
+            )
+            assert (await user_service.get_principal(db, "bob")).id == user.id
+
+            user.username = "robert"
+            await db.commit()
+            assert await user_service.get_principal(db, "bob") is None
+            assert (await user_service.get_principal(db, "robert")).id == user.id
+
+            await db.delete(user)
+            await db.commit()
+            assert await user_service.get_principal(db, "robert") is None
+
+    asyncio.run(run())
@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.app.db import models as db_models
+from backend.app.services import webhook_service
+from backend.app.services.webhook_service import InvalidSignatureError, WebhookEventQueue, WebhookQueueFullError
+
+NOW = 1740000000
+
+
+def _event(event_id: str) -> dict:
+    return {"event_id": event_id, "event_type": "door_opened", "timestamp": NOW, "door_name": "Front Door"}
+
+
+def test_verify_signature_rejects_wrong_and_stale_signatures():
+    body = json.dumps({"data": _event("e1")}).encode()
+    header = webhook_service.sign("secret", NOW, body)
+
+    webhook_service.verify_signature("secret", header, body, tolerance_seconds=300, now=NOW + 10)
+    for secret, signed_body, now in (("other", body, NOW), ("secret", body + b" ", NOW), ("secret", body, NOW + 301)):
+        with pytest.raises(InvalidSignatureError):
+            webhook_service.verify_signature(secret, header, signed_body, tolerance_seconds=300, now=now)
+    for bad_header in (None, "", "not-a-timestamp|abc"):
+        with pytest.raises(InvalidSignatureError):
+            webhook_service.verify_signature("secret", bad_header, body, tolerance_seconds=300, now=NOW)
+
+
+def test_parse_notification_accepts_envelopes_and_skips_bad_events():
+    assert [e.event_id for e in webhook_service.parse_notification({"data": _event("e1")})] == ["e1"]
+    assert [e.event_id for e in webhook_service.parse_notification([_event("e1"), {"event_id": "broken"}])] == ["e1"]
+    with pytest.raises(ValueError):
+        webhook_service.parse_notification({"data": "nothing"})
+
+
+def test_writer_batches_by_size_and_time_and_flushes_on_cancel(async_store_sessionmaker: async_sessionmaker):
+    async def run():
+        queue = WebhookEventQueue(maxsize=5, flush_rows=2, flush_seconds=0.05)
+        events = webhook_service.parse_notification([_event(f"e{i}") for i in range(3)])
+        queue.put(events)
+        with pytest.raises(WebhookQueueFullError):
+            queue.put(webhook_service.parse_notification([_event(f"x{i}") for i in range(3)]))
+
+        full_batch: list = []
+        await queue.fill_batch(full_batch) # Size-bound: returns at flush_rows without waiting
+        timed_batch: list = []
+        await asyncio.wait_for(queue.fill_batch(timed_batch), 1) # Time-bound: one event, then the deadline
+        assert [len(full_batch), len(timed_batch)] == [2, 1]
+
+        queue.put(events)
+        writer = asyncio.create_task(queue.run_writer(async_store_sessionmaker))
+        await asyncio.sleep(0.2)
+        queue.put(webhook_service.parse_notification([_event("e3")]))
+        writer.cancel()
+        await asyncio.gather(writer, return_exceptions=True)
+
+        assert queue.depth == 0
+        async with async_store_sessionmaker() as db:
+            assert await db.scalar(select(func.count(db_models.AccessEvent.id))) == 4
+
+    asyncio.run(run())